@@ -1,22 +1,22 @@
+from utils import startup_profiler
+
+startup_profiler.install()  # starts the cold-start clock; times imports with DICE_STARTUP_PROFILE=1
+
 from kivy.app import App
 from kivy.lang import Builder
-from kivy.uix.screenmanager import ScreenManager, FadeTransition, Screen
+from kivy.uix.screenmanager import ScreenManager, FadeTransition, NoTransition, Screen
 from kivy.animation import Animation
+from kivy.clock import Clock
 from kivy.properties import NumericProperty
-from screens.login_screen import LoginScreen
-from screens.register_screen import RegisterScreen
-from screens.settings_screen import SettingsScreen
-from screens.stage_screen import StageScreen
-from screens.dice_game_screen import DiceGameScreen
-from screens.forgot_password_screen import ForgotPasswordScreen
-from screens.reset_password_screen import ResetPasswordScreen
 from urllib.parse import urlparse, parse_qs
 
-# Optional: only if you later add a UserMatchScreen
-try:
-    from screens.user_match_screen import UserMatchScreen  # type: ignore
-except Exception:
-    UserMatchScreen = None  # graceful fallback if the screen doesn't exist
+from screens.looping_animations import looping_animations
+from utils import app_lifecycle, render_quality
+from utils.lazy_import import lazy
+
+# both pull in requests (retry_policy / net_telemetry); resolved after the first frame
+profile_outbox = lazy('utils.profile_outbox')
+bootstrap = lazy('utils.bootstrap')
 
 # Optional: read locally stored token/user if your utils.storage exists
 try:
@@ -29,34 +29,91 @@ class WelcomeScreen(Screen):
     pass
 
 
+CALIBRATE_DELAY = 3.0  # seconds after the deferred screens are built
+
+# (screen name, module, class) built after the first frame; their imports pull in
+# requests, websocket-client and the rest of the network stack
+DEFERRED_SCREENS = [
+    ('login', 'screens.login_screen', 'LoginScreen'),
+    ('register', 'screens.register_screen', 'RegisterScreen'),
+    ('forgot_password', 'screens.forgot_password_screen', 'ForgotPasswordScreen'),
+    ('reset_password', 'screens.reset_password_screen', 'ResetPasswordScreen'),
+    ('settings', 'screens.settings_screen', 'SettingsScreen'),
+    ('stage', 'screens.stage_screen', 'StageScreen'),
+    ('dicegame', 'screens.dice_game_screen', 'DiceGameScreen'),
+    ('usermatch', 'screens.user_match_screen', 'UserMatchScreen'),
+]
+
+
 class DiceApp(App):
     # default game variables
     user_token: str | None = None
     user_id: int | None = None
     selected_stake: int | None = None
     selected_mode = NumericProperty(2)  # Default 2-player mode
+    _outbox_ev = None
 
     def build(self):
         Builder.load_file('kv/screens.kv')
-        self.sm = ScreenManager(transition=FadeTransition())
+        # benchmark the device once; the tier adapts to measured frame times afterwards
+        render_quality.init(self.user_data_dir)
+        self.sm = ScreenManager(transition=self._make_transition())
         self.sm.app = self  # Allow access to app from screens
+        # repeating animations pause whenever their screen isn't the current one
+        looping_animations.attach(self.sm)
 
         self.sm.add_widget(WelcomeScreen(name='welcome'))
-        self.sm.add_widget(LoginScreen(name='login'))
-        self.sm.add_widget(RegisterScreen(name='register'))
-        self.sm.add_widget(ForgotPasswordScreen(name='forgot_password'))
-        self.sm.add_widget(ResetPasswordScreen(name='reset_password'))
-        self.sm.add_widget(SettingsScreen(name='settings'))
-        self.sm.add_widget(StageScreen(name='stage'))
-        self.sm.add_widget(DiceGameScreen(name='dicegame'))
-
-        # Optional user match screen
-        if UserMatchScreen is not None:
-            self.sm.add_widget(UserMatchScreen(name='usermatch'))
-
         self.sm.current = 'welcome'
+        startup_profiler.mark('build')
+
+        # everything else is imported and built once the welcome screen is on glass
+        startup_profiler.watch_first_frame(on_done=lambda report: self._after_first_frame())
         return self.sm
 
+    def _after_first_frame(self):
+        # next tick, so the flip that ended the first frame isn't stretched by the imports
+        Clock.schedule_once(lambda dt: self._build_deferred_screens(), 0)
+        Clock.schedule_once(lambda dt: self._start_network_services(), 0)
+
+    def _build_deferred_screens(self):
+        self.ensure_screens()
+        # the tier started from the saved one; the ceiling is measured once the screen
+        # builds are done and the UI has gone quiet, so they aren't timed into it
+        Clock.schedule_once(lambda dt: render_quality.calibrate_async(), CALIBRATE_DELAY)
+
+    def _start_network_services(self):
+        # profile edits queued while offline live next to the app's data
+        profile_outbox.set_directory(self.user_data_dir)
+        bootstrap.set_cache_dir(self.user_data_dir)
+        self._start_outbox_timer()
+
+    @staticmethod
+    def _make_transition():
+        return FadeTransition() if render_quality.setting('transition') == 'fade' else NoTransition()
+
+    def _on_quality_changed(self, tier):
+        if self.sm.transition.is_active:
+            # swapping mid-transition would drop the outgoing screen; retry next frame
+            Clock.schedule_once(lambda dt: self._on_quality_changed(tier), 0)
+            return
+        self.sm.transition = self._make_transition()
+
+    def ensure_screens(self):
+        """Import and add any deferred screens that don't exist yet (idempotent)."""
+        import importlib
+
+        for name, module, cls_name in DEFERRED_SCREENS:
+            if self.sm.has_screen(name):
+                continue
+            try:
+                screen_cls = getattr(importlib.import_module(module), cls_name)
+            except Exception as e:
+                # optional screens (e.g. usermatch) may be missing from a build
+                print(f"[WARN] Screen {name} unavailable: {e}")
+                continue
+            self.sm.add_widget(screen_cls(name=name))
+        startup_profiler.mark('screens_ready')
+
     def on_start(self):
         # Load previously saved user data if available
         if storage:
@@ -68,17 +125,53 @@ class DiceApp(App):
             if isinstance(uid, int):
                 self.user_id = uid
 
+        app_lifecycle.register('app', self._on_app_pause, self._on_app_resume)
+        render_quality.add_listener(self._on_quality_changed)
+        render_quality.start_monitor()
+
         # Launch background animation
         self.animate_stars(self.sm.get_screen('welcome'))
 
+    # ---------- pause / resume ----------
+    def on_pause(self):
+        # screens drop sockets, polls, heartbeats and timers; returning True keeps the process alive
+        app_lifecycle.pause()
+        return True
+
+    def on_resume(self):
+        app_lifecycle.resume()
+
+    def _start_outbox_timer(self):
+        if self._outbox_ev is None:
+            self._outbox_ev = Clock.schedule_interval(lambda dt: profile_outbox.flush_async(verify=False), 30)
+
+    def _on_app_pause(self):
+        if self._outbox_ev is not None:
+            self._outbox_ev.cancel()
+            self._outbox_ev = None
+        render_quality.stop_monitor()
+
+    def _on_app_resume(self, away):
+        self._start_outbox_timer()
+        render_quality.start_monitor()
+        profile_outbox.flush_async(verify=False)
+
     def animate_stars(self, screen):
         try:
-            anim1 = Animation(y=screen.ids.star1.y + 20, duration=2) + Animation(y=screen.ids.star1.y, duration=2)
-            anim2 = Animation(y=screen.ids.star2.y + 15, duration=3) + Animation(y=screen.ids.star2.y, duration=3)
-            anim1.repeat = True
-            anim2.repeat = True
-            anim1.start(screen.ids.star1)
-            anim2.start(screen.ids.star2)
+            for key, rise, duration in (('star1', 20, 2), ('star2', 15, 3)):
+                star = screen.ids[key]
+                # resting height; a paused bounce is reset here before it restarts
+                base = star._base_y = getattr(star, '_base_y', star.y)
+
+                def bounce(base=base, rise=rise, duration=duration):
+                    anim = Animation(y=base + rise, duration=duration) + Animation(y=base, duration=duration)
+                    anim.repeat = True
+                    return anim
+
+                looping_animations.start(
+                    screen.name, key, star, bounce,
+                    reset=lambda w, base=base: setattr(w, 'y', base),
+                )
         except Exception as e:
             print(f"[Animation Error] {e}")
 
@@ -110,7 +203,8 @@ class DiceApp(App):
             if hasattr(stage_screen, "_current_player_name"):
                 local_name = stage_screen._current_player_name()
 
-        if self.sm.has_screen("usermatch") and UserMatchScreen is not None:
+        self.ensure_screens()
+        if self.sm.has_screen("usermatch"):
             match_screen = self.sm.get_screen("usermatch")
             match_screen.start_matchmaking(local_player_name=local_name, amount=stake, mode=players)
             self.sm.current = "usermatch"
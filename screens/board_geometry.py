@@ -0,0 +1,96 @@
+from kivy.core.window import Window
+from kivy.metrics import dp
+
+
+class BoardGeometry:
+    """
+    Cached coin-layer geometry for the dice board.
+
+    Box centers, coin sizes and clamped coin targets are computed once per
+    layout and then served as plain dict lookups. Call `invalidate()` when the
+    window, board or coin layer changes size; the next lookup rebuilds.
+    """
+
+    STACK_OFFSETS = {0: (-dp(8), 0), 1: (dp(8), 0)}
+
+    def __init__(self, screen, num_boxes: int):
+        self._screen = screen
+        self._num_boxes = num_boxes
+        self._dirty = True
+        self._bounds = (0.0, 0.0)
+        self._centers = {}
+        self._box_heights = {}
+        self._portraits = {}
+        self._targets = {}
+
+    def invalidate(self, *_):
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def _rebuild(self):
+        screen = self._screen
+        layer = screen._root_float()
+        self._bounds = (layer.width or Window.width, layer.height or Window.height)
+        self._centers.clear()
+        self._box_heights.clear()
+        self._portraits.clear()
+        self._targets.clear()
+        for pos in range(self._num_boxes + 1):
+            box = screen.ids.get(f"box_{pos}")
+            if not box:
+                continue
+            self._centers[pos] = screen._map_center_to_parent(layer, box)
+            self._box_heights[pos] = getattr(box, "height", dp(50))
+        for player_idx in range(3):
+            pic = screen.ids.get(f"p{player_idx + 1}_pic")
+            if pic:
+                self._portraits[player_idx] = screen._map_center_to_parent(layer, pic)
+        self._dirty = False
+
+    def box_center(self, pos: int):
+        if self._dirty:
+            self._rebuild()
+        return self._centers.get(pos)
+
+    def portrait_center(self, player_idx: int):
+        if self._dirty:
+            self._rebuild()
+        return self._portraits.get(player_idx)
+
+    def coin_size(self, pos: int, num_players: int) -> float:
+        if self._dirty:
+            self._rebuild()
+        h = self._box_heights.get(pos, dp(50))
+        size_px = max(dp(34), min(dp(56), h * 0.9))
+        if num_players == 3:
+            size_px = min(size_px, dp(40))
+        return size_px
+
+    def clamp(self, pos, size):
+        if self._dirty:
+            self._rebuild()
+        width, height = self._bounds
+        half_w = size[0] / 2.0
+        half_h = size[1] / 2.0
+        x = min(max(pos[0], half_w), max(width - half_w, half_w))
+        y = min(max(pos[1], half_h), max(height - half_h, half_h))
+        return x, y
+
+    def coin_target(self, pos: int, coin_idx: int, num_players: int, stacked: bool):
+        """Clamped center for a coin resting on box `pos`; `stacked` when its sibling shares the box."""
+        if self._dirty:
+            self._rebuild()
+        key = (pos, coin_idx, num_players, stacked)
+        target = self._targets.get(key)
+        if target is None:
+            center = self._centers.get(pos)
+            if center is None:
+                return None
+            off_x, off_y = (0, 0) if stacked else self.STACK_OFFSETS.get(coin_idx, (0, 0))
+            size_px = self.coin_size(pos, num_players)
+            target = self.clamp((center[0] + off_x, center[1] + off_y), (size_px, size_px))
+            self._targets[key] = target
+        return target
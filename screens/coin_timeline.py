@@ -0,0 +1,115 @@
+import time
+
+from kivy.animation import Animation
+from kivy.metrics import dp
+
+from utils import render_quality
+
+
+class CoinTimeline:
+    """
+    Precomputed keyframe animations for coin hops.
+
+    A multi-box path is built up front as a single Animation sequence
+    (ascent + landing per hop), so there is no per-step Clock chaining.
+    Starting a new path on a coin interrupts the running one from the coin's
+    current position, and `remaining()` tells turn timers how long motion
+    will still take.
+
+    The render quality tier decides how rich a hop is: an arc (ascent +
+    landing) or a single straight slide, and on long paths only every few
+    boxes is visited so the whole walk stays within `max_hops` keyframe hops.
+    """
+
+    def __init__(self):
+        # coin -> (animation, end_time, final_target)
+        self._tracks = {}
+
+    def play_path(
+            self,
+            coin,
+            targets,
+            *,
+            jump_height: float = dp(26),
+            hop_duration: float = 0.22,
+            max_duration: float | None = None,
+            on_complete=None,
+    ) -> float:
+        """Animate `coin` through every (x, y) in `targets`; returns the total duration."""
+        targets = [t for t in targets or [] if t]
+        if not coin or not targets:
+            return 0.0
+
+        self.stop(coin)
+
+        max_hops = render_quality.setting("max_hops")
+        if max_hops and len(targets) > max_hops:
+            total = hop_duration * len(targets)
+            stride = len(targets) / float(max_hops)
+            targets = [targets[min(len(targets) - 1, int(round((i + 1) * stride)) - 1)] for i in range(max_hops)]
+            hop_duration = total / max_hops  # keep the walk's overall pace
+        arc = render_quality.setting("hop_keyframes") >= 2
+
+        hops = len(targets)
+        if max_duration is not None and hop_duration * hops > max_duration:
+            hop_duration = max(0.05, max_duration / hops)
+            jump_height = jump_height * 0.6
+
+        seq = None
+        cur_x, cur_y = coin.center
+        for target_x, target_y in targets:
+            if arc:
+                mid_x = (cur_x + target_x) / 2.0
+                apex_y = max(cur_y, target_y) + jump_height
+                ascent = Animation(center=(mid_x, apex_y), d=hop_duration * 0.45, t="out_cubic")
+                landing = Animation(center=(target_x, target_y), d=hop_duration * 0.55, t="in_quad")
+                hop = ascent + landing
+            else:
+                hop = Animation(center=(target_x, target_y), d=hop_duration, t="out_quad")
+            seq = hop if seq is None else seq + hop
+            cur_x, cur_y = target_x, target_y
+
+        total = hop_duration * hops
+        end_time = time.monotonic() + total
+        self._tracks[coin] = (seq, end_time, targets[-1])
+
+        def _done(anim, widget):
+            track = self._tracks.get(widget)
+            if track and track[0] is anim:
+                self._tracks.pop(widget, None)
+            if on_complete:
+                on_complete()
+
+        seq.bind(on_complete=_done)
+        seq.start(coin)
+        return total
+
+    def stop(self, coin):
+        """Cancel any running path on `coin`, leaving it where it is."""
+        track = self._tracks.pop(coin, None)
+        if track:
+            track[0].cancel(coin)
+        Animation.cancel_all(coin, "center")
+
+    def finish(self, coin):
+        """Cancel the running path and snap `coin` to its final target."""
+        track = self._tracks.get(coin)
+        self.stop(coin)
+        if track:
+            coin.center = track[2]
+
+    def cancel_all(self):
+        for coin in list(self._tracks):
+            self.stop(coin)
+
+    def is_moving(self, coin=None) -> bool:
+        return self.remaining(coin) > 0
+
+    def remaining(self, coin=None) -> float:
+        """Seconds until `coin` (or every tracked coin) comes to rest."""
+        now = time.monotonic()
+        if coin is not None:
+            track = self._tracks.get(coin)
+            return max(0.0, track[1] - now) if track else 0.0
+        ends = [track[1] for track in self._tracks.values()]
+        return max(0.0, max(ends) - now) if ends else 0.0
@@ -1,7 +1,4 @@
-import os
-import json
 import random
-import requests
 import threading
 import time
 from functools import partial
@@ -28,12 +25,38 @@ try:
 except Exception:
     storage = None
 
-try:
-    import websocket  # type: ignore
+from screens.board_geometry import BoardGeometry
+from screens import dice_sprites
+from screens.looping_animations import looping_animations
+from screens.screen_clock import ScreenClock
+from screens.coin_timeline import CoinTimeline
+from utils.board_state import (
+    COIN_HOME,
+    COINS_PER_PLAYER,
+    MAX_PLAYERS,
+    NO_POSITION,
+    BoardState,
+    board_diff,
+    pack_positions,
+    state_signature,
+)
+from utils.match_replay import (
+    EVENT_PASS,
+    EVENT_ROLL,
+    EVENT_SERVER,
+    EVENT_SETUP,
+    SPEED_REALTIME,
+    MatchRecorder,
+    ReplayPlayer,
+    load_replay,
+    replay_headless,
+)
+from utils import app_lifecycle, pending_ops, profile_outbox, render_quality
+from utils.connection_health import ConnectionHealth
+from utils.retry_policy import http_get
+from utils.wire_codec import decode_response, match_headers
 
-    WEBSOCKET_OK = True
-except Exception:
-    WEBSOCKET_OK = False
+from screens.match_session import WEBSOCKET_OK, MatchSession
 
 
 # ------------------------
@@ -42,10 +65,19 @@ except Exception:
 class PolygonDice(ButtonBehavior, RelativeLayout):
     rotation_angle = NumericProperty(0)
     scale_value = NumericProperty(1.0)
+    spin_frame = NumericProperty(0)  # position in the sprite sheet while a sheet spin runs
+
+    SPIN_SECONDS = 0.6  # full spin of animate_spin()
+    MIN_SPECULATIVE_SPIN = 0.35  # a speculative roll never looks shorter than this
+    SHEET_TURNS = 2  # sheet loops played by animate_spin()
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._anim = None
+        self._speculative_since = None
+        self._face = 1
+        self._landing = None  # (face, monotonic time it shows) of the last server spin
+        self._frames = []  # sprite-sheet regions; empty means the Rotate/Scale spin is used
         self._dice_image = Image(
             source="assets/dice/dice1.png",
             size_hint=(1, 1),
@@ -62,6 +94,12 @@ class PolygonDice(ButtonBehavior, RelativeLayout):
         self.bind(pos=self._update_transform, size=self._update_transform, center=self._update_transform)
         self.bind(rotation_angle=lambda *_: self._sync_rotation())
         self.bind(scale_value=lambda *_: self._apply_scale())
+        self.bind(spin_frame=self._show_frame)
+        Clock.schedule_once(self._preload_textures, 0)
+
+    def _preload_textures(self, *_):
+        dice_sprites.preload()
+        self._frames = dice_sprites.spin_frames()
 
     def _update_transform(self, *_):
         if hasattr(self, "_rot"):
@@ -73,47 +111,139 @@ class PolygonDice(ButtonBehavior, RelativeLayout):
         if hasattr(self, "_scale"):
             self._scale.x = self._scale.y = float(self.scale_value)
 
-    def animate_spin(self, result: int, instant: bool = False):
-        """Animate dice spin, then set the final face image."""
+    def _set_face(self, result: int):
+        """Show a face from the texture cache (decoded once, never re-read from disk)."""
+        tex = dice_sprites.face_texture(result)
+        if tex is not None:
+            self._face = result
+            self._dice_image.texture = tex
+
+    def _show_frame(self, *_):
+        # only while a sheet spin runs, so resetting spin_frame never flashes a frame
+        if self._anim is not None and self._frames:
+            self._dice_image.texture = self._frames[int(self.spin_frame) % len(self._frames)]
+
+    def _spin_anim(self, turns: float, d: float, t: str):
+        """One property animation for `turns` full turns: sheet frames when packaged, else rotation."""
+        if self._frames:
+            self.spin_frame = 0
+            return Animation(spin_frame=turns * len(self._frames) - 0.01, d=d, t=t)
+        return Animation(rotation_angle=360 * turns, d=d, t=t)
+
+    def animate_spin(self, result: int, instant: bool = False) -> float:
+        """Animate dice spin, then set the final face image; returns when the face lands."""
         self.stop_spin()
 
         if instant:
-            img_path = os.path.join("assets", "dice", f"dice{result}.png")
-            if os.path.exists(img_path):
-                self._dice_image.source = img_path
-                self._dice_image.reload()
+            self._set_face(result)
             self.rotation_angle = 0
-            return
+            self._landing = (result, time.monotonic())
+            return 0.0
 
-        spin_seq = (
-                Animation(rotation_angle=360, d=0.28, t="out_cubic")  # clockwise
-                + Animation(rotation_angle=0, d=0.32, t="out_cubic")  # anticlockwise back to rest
-        )
+        if self._frames:
+            spin_seq = self._spin_anim(self.SHEET_TURNS, self.SPIN_SECONDS, "out_cubic")
+        else:
+            spin_seq = (
+                    Animation(rotation_angle=360, d=0.28, t="out_cubic")  # clockwise
+                    + Animation(rotation_angle=0, d=0.32, t="out_cubic")  # anticlockwise back to rest
+            )
 
-        zoom = (
+        self._anim = spin_seq
+        zoom = self._spin_zoom(render_quality.setting("spin_zoom_steps"))
+        if zoom is not None:
+            zoom.start(self)
+        spin_seq.start(self)
+
+        def set_final_face(*_):
+            self.stop_spin()
+            self._set_face(result)
+            self.rotation_angle = 0
+
+        spin_seq.bind(on_complete=set_final_face)
+        self._landing = (result, time.monotonic() + self.SPIN_SECONDS)
+        return self.SPIN_SECONDS
+
+    @staticmethod
+    def _spin_zoom(steps: int):
+        """Scale keyframes for a roll: 3 = overshoot and settle, 1 = one bump, 0 = none."""
+        if steps <= 0:
+            return None
+        if steps < 3:
+            return Animation(scale_value=1.15, d=0.25, t="out_quad") + Animation(scale_value=1.0, d=0.25, t="in_quad")
+        return (
                 Animation(scale_value=1.25, d=0.2, t="out_back")
                 + Animation(scale_value=0.95, d=0.15, t="in_out_quad")
                 + Animation(scale_value=1.0, d=0.15, t="out_quad")
         )
 
-        self._anim = spin_seq
-        zoom.start(self)
-        spin_seq.start(self)
+    def start_speculative_spin(self, rtt: float | None = None):
+        """
+        Start spinning at tap time, before the server has picked a face.
+        Slower links get a calmer spin so the wait reads as one continuous roll.
+        """
+        self.stop_spin()
+        period = min(0.6, max(0.25, 0.25 + (rtt or 0.0) * 0.5))
+        prop = "spin_frame" if self._frames else "rotation_angle"
+        loop = self._spin_anim(1, period, "linear") + Animation(d=0, **{prop: 0})
+        loop.repeat = True
+        self._anim = loop
+        self._speculative_since = time.monotonic()
+        self._landing = None
+        if render_quality.setting("spin_zoom_steps"):
+            Animation(scale_value=1.2, d=0.15, t="out_back").start(self)
+        loop.start(self)
+
+    @property
+    def spinning_speculatively(self) -> bool:
+        return self._speculative_since is not None
+
+    def landing_in(self, result: int) -> float | None:
+        """Seconds until the current spin shows `result` (0 once shown); None when it isn't landing on it."""
+        if self._speculative_since is not None or not self._landing or self._landing[0] != result:
+            return None
+        return max(0.0, self._landing[1] - time.monotonic())
 
-        def set_final_face(*_):
-            img_path = os.path.join("assets", "dice", f"dice{result}.png")
-            if os.path.exists(img_path):
-                self._dice_image.source = img_path
-                self._dice_image.reload()
+    def settle(self, result: int) -> float:
+        """Land a speculative spin on the server's face; returns seconds until it is shown."""
+        if self._speculative_since is None:
+            return self.animate_spin(result)
+        elapsed = time.monotonic() - self._speculative_since
+        self.stop_spin()
+        duration = max(0.12, self.MIN_SPECULATIVE_SPIN - elapsed)
+        if self._frames:
+            # finish the current loop of the sheet from wherever it is
+            n = len(self._frames)
+            landing = Animation(spin_frame=(int(self.spin_frame // n) + 1) * n - 0.01, d=duration, t="out_cubic")
+        else:
+            landing = Animation(rotation_angle=360, d=duration, t="out_cubic")
 
-            self.stop_spin()
+        def land(*_):
+            self._anim = None
+            self._set_face(result)
             self.rotation_angle = 0
 
-        spin_seq.bind(on_complete=set_final_face)
+        landing.bind(on_complete=land)
+        self._anim = landing
+        self._landing = (result, time.monotonic() + duration)
+        Animation(scale_value=1.0, d=duration, t="out_quad").start(self)
+        landing.start(self)
+        return duration
+
+    def abort_spin(self):
+        """Roll a speculative spin back to rest, keeping the previous face."""
+        if self._speculative_since is None:
+            return
+        self.stop_spin()
+        self._landing = None
+        self._set_face(self._face)
+        Animation.cancel_all(self, "scale_value")
+        Animation(rotation_angle=0, scale_value=1.0, d=0.15, t="out_quad").start(self)
 
     def stop_spin(self):
+        # whatever replaces a speculative spin owns the landing now
+        self._speculative_since = None
         if self._anim:
-            self._anim.stop(self)
+            self._anim.cancel(self)
             self._anim = None
 
     def _sync_rotation(self, *_):
@@ -165,6 +295,10 @@ COIN_TEXTURES = (
 FINAL_BOX_INDEX = 8
 COINS_TO_WIN = 2
 
+# coin timeline tuning
+COMPRESSED_PATH_SECONDS = 0.45
+COIN_SETTLE_PAD = 0.1
+
 
 class ChatBubble(Label):
     """Floating chat bubble that auto-sizes and paints its own rounded background."""
@@ -241,14 +375,18 @@ class DiceGameScreen(Screen):
     _current_player = NumericProperty(0)
     _game_active = BooleanProperty(False)
     _num_players = NumericProperty(2)
+    connection_latency_ms = NumericProperty(0)  # smoothed RTT published by the heartbeat
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # Support 2 coins per player: [player][coin_index]
-        self._positions = [[-1, -1], [-1, -1], [-1, -1]]
+        # Support 2 coins per player: positions/spawn/finished/forfeits live in one packed state
+        self._board = BoardState()
         self._coins = [[None, None], [None, None], [None, None]]
-        self._spawned_on_board = [[False, False], [False, False], [False, False]]
-        self._coins_finished = [0, 0, 0]
+        self._coin_widgets_key = None  # (layer id, num players) the coin widgets were built for
+        self._coin_timeline = CoinTimeline()
+        self._geometry = BoardGeometry(self, FINAL_BOX_INDEX)
+        self._clock = ScreenClock("dicegame")  # every timer/animation below is cancelled on leave
+        self._relayout_trigger = self._clock.trigger(self._relayout_coins, 0)
         self._finished_markers = [[], [], []]
         self._winner_shown = False
         self._num_players = 2
@@ -257,9 +395,8 @@ class DiceGameScreen(Screen):
 
         # online sync
         self._online = False
-        self._ws = None
-        self._ws_thread = None
-        self._ws_stop = threading.Event()
+        self._session = None  # MatchSession feeding this screen
+        self._prefetched_session = None  # handed over by the lobby before entering
         self._poll_ev = None
         self.match_id = None
 
@@ -267,21 +404,33 @@ class DiceGameScreen(Screen):
         self._my_index = None
         self._roll_inflight = False
         self._last_roll_seen = None
-        self._last_state_sig = None  # (positions tuple, last_roll, turn)
+        self._last_state_sig = None  # packed int: positions | last_roll | turn
         self._last_roll_animated = None
-        self._forfeited_players = set()
         self._first_turn_synced = False
         self._auto_from_timer = False
         self._last_roll_time = 0
         self._server_turn = None
         self._heartbeat_evt = None
-        self._ping_failures = 0
+        self._health = ConnectionHealth()
         self._last_ping_time = 0
         self._ping_worker_active = False
+        self._ping_timeout_ev = None
+        self._ws_ping_sent = None  # monotonic send time of the outstanding websocket ping
+        self._ws_connected = False
+        self._probe_idx = 0
         self._connection_recover_ev = None
         self._chat_messages = []
         self._chat_bubble = None
         self._chat_bubble_ev = None
+        pending_ops.add_listener(pending_ops.OP_ROLL, self._on_roll_reconciled)
+        pending_ops.set_scope_check(pending_ops.OP_ROLL, self._roll_scope_valid)
+        self._state_seq = 0  # bumped on every new server state; a journaled roll is tied to one value
+        app_lifecycle.register("dicegame", self._on_app_pause, self._on_app_resume)
+        self._pulsing = {}  # looping_animations key -> overlay currently pulsing
+        self._paused_online = False
+        self._recorder = None  # MatchRecorder while a match is being logged
+        self._replay = None  # ReplayPlayer while re-driving a log
+        Clock.schedule_once(self._bind_geometry, 0)
 
     # ---------- helpers ----------
     def _root_float(self):
@@ -313,7 +462,7 @@ class DiceGameScreen(Screen):
                         self._add_on_top(c)
 
     def _coin_texture(self, idx: int) -> str:
-        return COIN_TEXTURES[idx % len(COIN_TEXTURES)]
+        return render_quality.asset(COIN_TEXTURES[idx % len(COIN_TEXTURES)])
 
     def _coin_portrait_offset(self, player_idx: int, coin_idx: int) -> tuple[float, float]:
         """Get offset for coin near player portrait. coin_idx: 0 or 1 for the two coins."""
@@ -362,10 +511,10 @@ class DiceGameScreen(Screen):
         if not self._can_control_coin(player_idx):
             self._clear_coin_selection()
             return
-        if player_idx >= len(self._positions) or coin_idx >= len(self._positions[player_idx]):
+        if player_idx >= MAX_PLAYERS or coin_idx >= COINS_PER_PLAYER:
             self._clear_coin_selection()
             return
-        if self._positions[player_idx][coin_idx] == FINAL_BOX_INDEX:
+        if self._board.position(player_idx, coin_idx) == FINAL_BOX_INDEX:
             self._clear_coin_selection()
 
     def _resolve_selected_coin_index(self, *, show_toast: bool = False):
@@ -403,24 +552,16 @@ class DiceGameScreen(Screen):
         return None
 
     def _has_unspawned_coin(self, player_idx: int) -> bool:
-        if player_idx >= len(self._spawned_on_board):
+        if player_idx >= MAX_PLAYERS:
             return False
-        return any(
-            (not self._spawned_on_board[player_idx][cidx])
-            for cidx in range(min(2, len(self._spawned_on_board[player_idx])))
-        )
+        return self._board.first_unspawned(player_idx) is not None
 
     def _movable_coins(self, player_idx: int) -> list[int]:
         movable = []
-        if player_idx >= len(self._spawned_on_board):
+        if player_idx >= MAX_PLAYERS:
             return movable
-        for cidx in range(2):
-            try:
-                spawned = self._spawned_on_board[player_idx][cidx]
-                pos = self._positions[player_idx][cidx]
-            except Exception:
-                continue
-            if spawned and isinstance(pos, (int, float)) and 0 <= int(pos) < FINAL_BOX_INDEX:
+        for cidx in range(COINS_PER_PLAYER):
+            if self._board.is_spawned(player_idx, cidx) and 0 <= self._board.position(player_idx, cidx) < FINAL_BOX_INDEX:
                 movable.append(cidx)
         return movable
 
@@ -431,12 +572,7 @@ class DiceGameScreen(Screen):
 
     def _auto_coin_for_roll(self, player_idx: int, roll: int) -> int | None:
         if roll == 1 and self._has_unspawned_coin(player_idx):
-            for cidx in range(2):
-                try:
-                    if not self._spawned_on_board[player_idx][cidx]:
-                        return cidx
-                except Exception:
-                    continue
+            return self._board.first_unspawned(player_idx)
         movable = self._movable_coins(player_idx)
         if len(movable) == 1:
             return movable[0]
@@ -466,16 +602,16 @@ class DiceGameScreen(Screen):
                 self._selected_coin = None
                 self._update_coin_selection_visuals()
                 self._apply_roll(pending_value, forced_coin_idx=coin_idx, player_idx=player_idx)
-                Clock.schedule_once(lambda dt: self._mark_roll_end(), 0.1)
+                self._clock.once(lambda dt: self._mark_roll_end(), 0.1)
                 return
 
         self._selected_coin = (player_idx, coin_idx)
         self._update_coin_selection_visuals()
 
     def _is_coin_selectable(self, player_idx: int, coin_idx: int, *, show_toast: bool = False) -> bool:
-        if player_idx >= len(self._positions) or coin_idx >= len(self._positions[player_idx]):
+        if player_idx >= MAX_PLAYERS or coin_idx >= COINS_PER_PLAYER:
             return False
-        pos = self._positions[player_idx][coin_idx]
+        pos = self._board.position(player_idx, coin_idx)
         if pos == FINAL_BOX_INDEX:
             if show_toast:
                 self._show_temp_popup("Coin already safe", duration=1.2)
@@ -492,13 +628,13 @@ class DiceGameScreen(Screen):
             pic = self.ids.get(f"p{player_idx + 1}_pic")
             if not coin or not pic:
                 return
-            layer = self._root_float()
-            cx, cy = self._map_center_to_parent(layer, pic)
+            cx, cy = self._geometry.portrait_center(player_idx) or self._map_center_to_parent(self._root_float(), pic)
             base = dp(24) if self._num_players == 2 else dp(21)
             coin.size = (base, base)
             off_x, off_y = self._coin_portrait_offset(player_idx, coin_idx)
             target = (cx + off_x, cy - dp(50) + off_y)
             safe_x, safe_y = self._clamp_to_bounds(target, coin.size)
+            self._coin_timeline.stop(coin)
             coin.center = (safe_x, safe_y)
             coin.opacity = 1
         else:
@@ -508,18 +644,18 @@ class DiceGameScreen(Screen):
 
     def _move_coin_home(self, player_idx: int, coin_idx: int):
         """Move specific coin back home (near portrait)."""
-        if player_idx >= len(self._spawned_on_board) or coin_idx >= len(self._spawned_on_board[player_idx]):
+        if player_idx >= MAX_PLAYERS or coin_idx >= COINS_PER_PLAYER:
             return
-        if self._spawned_on_board[player_idx][coin_idx]:
+        if self._board.is_spawned(player_idx, coin_idx):
             return
         self._position_coin_near_portrait(player_idx, coin_idx)
 
     def _refresh_coin_idle_positions(self):
         """Refresh positions of all idle coins (not spawned on board)."""
-        limit = min(self._num_players, len(self._spawned_on_board))
+        limit = min(self._num_players, MAX_PLAYERS)
         for player_idx in range(limit):
-            for coin_idx in range(2):  # 2 coins per player
-                if not self._spawned_on_board[player_idx][coin_idx]:
+            for coin_idx in range(COINS_PER_PLAYER):
+                if not self._board.is_spawned(player_idx, coin_idx):
                     self._position_coin_near_portrait(player_idx, coin_idx)
         self._update_coin_selection_visuals()
 
@@ -537,7 +673,7 @@ class DiceGameScreen(Screen):
         self._finished_markers = [[], [], []]
 
     def _add_finished_marker(self, player_idx: int):
-        if player_idx >= len(self._coins_finished):
+        if player_idx >= MAX_PLAYERS:
             return
         layer = self._root_float()
         box = self.ids.get(f"box_{FINAL_BOX_INDEX}")
@@ -545,7 +681,7 @@ class DiceGameScreen(Screen):
             return
         marker = Image(source=self._coin_texture(player_idx), size_hint=(None, None), opacity=1)
         marker.size = (dp(30), dp(30))
-        bx, by = self._map_center_to_parent(layer, box)
+        bx, by = self._geometry.box_center(FINAL_BOX_INDEX) or self._map_center_to_parent(layer, box)
         slot = len(self._finished_markers[player_idx]) if self._finished_markers else 0
         offsets = {
             0: (-dp(14), dp(10)),
@@ -563,10 +699,9 @@ class DiceGameScreen(Screen):
 
     def _ready_next_coin(self, player_idx: int, coin_idx: int):
         """Reset a coin after it reaches the final box, preparing for next coin."""
-        if player_idx >= len(self._positions) or coin_idx >= len(self._positions[player_idx]):
+        if player_idx >= MAX_PLAYERS or coin_idx >= COINS_PER_PLAYER:
             return
-        self._spawned_on_board[player_idx][coin_idx] = False
-        self._positions[player_idx][coin_idx] = -1
+        self._board.place(player_idx, coin_idx, NO_POSITION)
         self._move_coin_home(player_idx, coin_idx)
 
     def _map_center_to_parent(self, target_parent, widget):
@@ -594,7 +729,7 @@ class DiceGameScreen(Screen):
     def _set_dice_button_enabled(self, enabled: bool):
         btn = self.ids.get("dice_button")
         if not btn:
-            Clock.schedule_once(lambda dt: self._set_dice_button_enabled(enabled), 0.1)
+            self._clock.once(lambda dt: self._set_dice_button_enabled(enabled), 0.1)
             return
         try:
             btn.disabled = not enabled
@@ -654,8 +789,8 @@ class DiceGameScreen(Screen):
             except Exception as e:
                 print(f"[WARN] Failed loading storage: {e}")
 
-        Clock.schedule_once(lambda dt: self._apply_initial_portraits(), 0)
-        Clock.schedule_once(lambda dt: self._place_coins_near_portraits(), 0.05)
+        self._clock.once(lambda dt: self._apply_initial_portraits(), 0)
+        self._clock.once(lambda dt: self._place_coins_near_portraits(), 0.05)
         mid = storage.get_current_match() if storage else None
 
         # bot vs online
@@ -678,19 +813,132 @@ class DiceGameScreen(Screen):
             self._debug(f"[MODE] Online match detected (ID={mid})")
             self._game_active = True
             self._start_online_sync()
+        self._start_recording()
 
     def on_leave(self, *_):
+        self.stop_replay()
+        self._stop_recording()
         self._stop_online_sync()
         self._stop_backend_heartbeat()
+        # an unanswered roll belongs to this match only
+        pending_ops.discard(pending_ops.OP_ROLL)
+        self._coin_timeline.cancel_all()
+        # turn ends, bot rolls, popup closes and path steps from this match must not leak into the next
+        cancelled = self._clock.cancel_all()
+        looping_animations.stop_owner(self.name)
+        self._pulsing.clear()
+        self._debug(f"[CLOCK] cancelled {cancelled} pending callbacks on leave ({self._clock.stats()})")
+        self._roll_inflight = False
+        self._roll_locked = False
+        self._auto_from_timer = False
+        self._last_roll_time = 0
         self._clear_chat_messages()
         self._pending_roll = None
         self._clear_finished_markers()
-        self._coins_finished = [0, 0, 0]
+        self._board.clear_finished()
         self.chat_open = False
         self._hide_chat_bubble(instant=True)
         self._clear_coin_selection()
         self._pending_roll = None
 
+    # ---------- app pause / resume ----------
+    def _on_app_pause(self):
+        """Backgrounded: drop the socket, heartbeat and turn timer (nothing should tick while away)."""
+        if not (self.manager and self.manager.current == self.name):
+            return
+        self._cancel_turn_timer()
+        self._paused_online = self._online and bool(self.match_id)
+        if self._paused_online:
+            self._stop_online_sync()
+        self._debug("[LIFECYCLE] paused")
+
+    def _on_app_resume(self, away: float):
+        if not (self.manager and self.manager.current == self.name):
+            return
+        if self._paused_online and self._online and self.match_id:
+            # fresh socket + one /matches/check snapshot brings the board up to date
+            self._start_online_sync(fresh=True)
+        # a fresh 10s for whoever is on turn; a missed timer must not fire the moment we return
+        self._start_turn_timer()
+        self._paused_online = False
+        self._debug(f"[LIFECYCLE] resumed after {away:.1f}s")
+
+    # ---------- replay ----------
+    def _start_recording(self):
+        self._stop_recording()
+        if self._replay:
+            return
+        self._recorder = MatchRecorder.for_match(self.match_id)
+        if not self._recorder:
+            return
+        self._debug(f"[REPLAY] Recording match to {self._recorder.path}")
+        self._recorder.record(EVENT_SETUP, {
+            "online": self._online,
+            "match_id": self.match_id,
+            "num_players": self._num_players,
+            "names": [self.player1_name, self.player2_name, self.player3_name],
+            "stake": self.stage_amount,
+            "my_index": self._my_index,
+            "current_player": self._current_player,
+        })
+
+    def _stop_recording(self):
+        if self._recorder:
+            self._recorder.close()
+            self._recorder = None
+
+    def replay_match(self, source, speed: float | None = SPEED_REALTIME, headless: bool = False):
+        """
+        Re-drive this screen from a recording (path or loaded entries).
+        speed is 1.0, 10.0 or None for back-to-back. headless leaves the screen alone:
+        the log runs through a board-only HeadlessMatch and its timing stats are returned.
+        """
+        entries = load_replay(source) if isinstance(source, str) else list(source or [])
+        if headless:
+            return replay_headless(entries)
+
+        self.stop_replay()
+        self._stop_recording()
+        self._stop_online_sync()
+        self._stop_backend_heartbeat()
+        self._coin_timeline.cancel_all()
+
+        self._replay = ReplayPlayer(entries, self._dispatch_replay_entry, speed=speed, on_complete=self.stop_replay)
+        self._replay.start()
+        return None
+
+    def stop_replay(self):
+        player = self._replay
+        self._replay = None
+        if isinstance(player, ReplayPlayer):
+            player.stop()
+            self._debug("[REPLAY] Stopped.")
+
+    def _dispatch_replay_entry(self, kind: str, data):
+        if kind == EVENT_SETUP:
+            data = data or {}
+            names = list(data.get("names") or []) + [None, None, None]
+            self.player1_name = names[0] or "Player 1"
+            self.player2_name = names[1] or "Player 2"
+            self.player3_name = names[2] or ""
+            self.stage_amount = data.get("stake") or 0
+            self.match_id = data.get("match_id")
+            self._online = bool(data.get("online"))
+            self._my_index = data.get("my_index")
+            self._num_players = 3 if data.get("num_players") == 3 else 2
+            self._reset_game_state()
+            current = data.get("current_player")
+            if isinstance(current, int):
+                self._current_player = current
+                self._highlight_turn()
+        elif kind == EVENT_SERVER and isinstance(data, dict):
+            self._on_server_event(data)
+        elif kind == EVENT_ROLL and isinstance(data, dict):
+            self._apply_roll(int(data.get("roll") or 0), forced_coin_idx=data.get("coin"), player_idx=data.get("player"))
+        elif kind == EVENT_PASS:
+            self._current_player = (self._current_player + 1) % self._num_players
+            self._highlight_turn()
+
     # ---------- portraits ----------
     def _resolve_avatar_source(self, index: int, name: str, pid):
         bot_map_by_id = {
@@ -726,19 +974,14 @@ class DiceGameScreen(Screen):
     # ---------- state ----------
     def _reset_game_state(self):
         """Reset local positions and flags; used mainly for offline/bot games."""
-        self._positions = [[-1, -1], [-1, -1], [-1, -1]]
-        self._spawned_on_board = [[False, False], [False, False], [False, False]]
-        self._coins_finished = [0, 0, 0]
+        self._board.reset()
+        self._coin_widgets_key = None
         self._clear_finished_markers()
         self.dice_result = ""
         self._winner_shown = False
         self._game_active = True
         self._clear_chat_messages()
         self._clear_coin_selection()
-        if hasattr(self, "_forfeited_players"):
-            self._forfeited_players.clear()
-        else:
-            self._forfeited_players = set()
 
         # reset volatile flags for new sessions to avoid stale turn/lock state
         self._first_turn_synced = False
@@ -759,8 +1002,7 @@ class DiceGameScreen(Screen):
 
         self._refresh_coin_idle_positions()
 
-        forfeited = getattr(self, "_forfeited_players", set())
-        active_players = [i for i in range(self._num_players) if i not in forfeited]
+        active_players = self._board.active_players(self._num_players)
         if not active_players:
             self._debug("[RESET] All players forfeited — stopping game.")
             self._game_active = False
@@ -807,9 +1049,9 @@ class DiceGameScreen(Screen):
                     pass
             self._debug("[INIT] Forcing offline mode for bot game")
 
-        Clock.schedule_once(lambda dt: self._apply_initial_portraits(), 0)
-        Clock.schedule_once(lambda dt: self._place_coins_near_portraits(), 0.05)
-        Clock.schedule_once(lambda dt: self._refresh_coin_idle_positions(), 0.1)
+        self._clock.once(lambda dt: self._apply_initial_portraits(), 0)
+        self._clock.once(lambda dt: self._place_coins_near_portraits(), 0.05)
+        self._clock.once(lambda dt: self._refresh_coin_idle_positions(), 0.1)
         if self._online:
             self._start_online_sync()
         else:
@@ -882,23 +1124,38 @@ class DiceGameScreen(Screen):
         p2_overlay = self.ids.get("p2_overlay")
         p3_overlay = self.ids.get("p3_overlay")
 
-        def pulse(widget, active: bool):
+        def pulse_anim():
+            anim = (
+                    Animation(opacity=0.6, d=1.0, t="in_out_quad")
+                    + Animation(opacity=0.2, d=1.0, t="in_out_quad")
+            )
+            anim.repeat = True
+            return anim
+
+        pulses = render_quality.setting("pulses")
+
+        def pulse(key, widget, active: bool):
             if not widget or widget.parent is None:
                 return
-            Animation.cancel_all(widget, "opacity")
-            if active:
-                anim = (
-                        Animation(opacity=0.6, d=1.0, t="in_out_quad")
-                        + Animation(opacity=0.2, d=1.0, t="in_out_quad")
-                )
-                anim.repeat = True
-                anim.start(widget)
+            if active and not pulses:
+                # low tier: a steady highlight instead of a repeating fade
+                looping_animations.stop(self.name, key, reset_widget=False)
+                self._pulsing.pop(key, None)
+                Animation.cancel_all(widget, "opacity")
+                widget.opacity = 0.45
+            elif active:
+                if self._pulsing.get(key) is not widget:
+                    looping_animations.start(self.name, key, widget, pulse_anim)
+                    self._pulsing[key] = widget
             else:
+                looping_animations.stop(self.name, key, reset_widget=False)
+                self._pulsing.pop(key, None)
+                Animation.cancel_all(widget, "opacity")
                 widget.opacity = 0
 
-        pulse(p1_overlay, self._current_player == 0)
-        pulse(p2_overlay, self._current_player == 1)
-        pulse(p3_overlay, self._current_player == 2 and bool(self.player3_name))
+        pulse("p1_pulse", p1_overlay, self._current_player == 0)
+        pulse("p2_pulse", p2_overlay, self._current_player == 1)
+        pulse("p3_pulse", p3_overlay, self._current_player == 2 and bool(self.player3_name))
 
         if self._online:
             self._debug(f"[TURN][UI] Online turn highlight for player {self._current_player}")
@@ -908,12 +1165,12 @@ class DiceGameScreen(Screen):
         # offline
         if self._current_player != 0:
             self._debug(f"[BOT TURN] Player {self._current_player} auto-roll soon")
-            Clock.schedule_once(lambda dt: self._auto_roll_current(), 0.3)
+            self._clock.once(lambda dt: self._auto_roll_current(), 0.3)
 
     # ---------- dice ----------
     def roll_dice(self):
         """Entry point from UI (click) or timers."""
-        if not self._game_active:
+        if not self._game_active or self._replay:
             return
 
         if getattr(self, "_roll_inflight", False):
@@ -954,7 +1211,7 @@ class DiceGameScreen(Screen):
 
             if not has_valid_moves:
                 self._debug(f"[OFFLINE] No moves for roll {roll}")
-                Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 1.0)
+                self._clock.once(lambda dt: self._end_turn_and_highlight(), 1.0)
                 return
 
             # Has moves. Wait for user selection.
@@ -978,15 +1235,15 @@ class DiceGameScreen(Screen):
         if not getattr(self, "_first_turn_synced", False):
             self._first_turn_synced = True
             try:
-                resp = requests.get(
+                resp = http_get(
                     f"{self._backend()}/matches/check",
-                    headers={"Authorization": f"Bearer {self._token()}"},
+                    headers=match_headers(self._token()),
                     params={"match_id": self.match_id},
                     timeout=5,
                     verify=False,
                 )
                 if resp.status_code == 200:
-                    data = resp.json()
+                    data = decode_response(resp)
                     self._maybe_update_my_index_from_payload(data)
                     srv_turn = data.get("turn")
                     if srv_turn is not None:
@@ -999,64 +1256,59 @@ class DiceGameScreen(Screen):
                 self._show_temp_popup("Not your turn!", duration=1.8)
             return
 
-        # final verification with backend to avoid stale turn state
-        try:
-            resp = requests.get(
-                f"{self._backend()}/matches/check",
-                headers={"Authorization": f"Bearer {self._token()}"},
-                params={"match_id": self.match_id},
-                timeout=5,
-                verify=False,
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                self._maybe_update_my_index_from_payload(data, trusted=True)
-                srv_turn = data.get("turn")
-                if srv_turn is not None:
-                    self._current_player = int(srv_turn)
-                if self._current_player != self._my_index:
-                    self._debug("[ROLL] Aborted — backend reports different turn.")
-                    self._mark_roll_end()
-                    self._set_dice_button_enabled(False)
-                    if not getattr(self, "_auto_from_timer", False):
-                        self._show_temp_popup("Not your turn!", duration=1.5)
-                    return
-        except Exception as e:
-            self._debug(f"[ROLL][VERIFY][ERR] {e}")
-            # fallback to previous state; continue rolling
-
         source = "online_auto" if getattr(self, "_auto_from_timer", False) else "online_manual"
         self._mark_roll_start(source)
+        # spin right away; the server's face is settled in _animate_dice_and_apply_server
+        self._start_speculative_roll()
 
         coin_choice = selected_coin_idx
+        # a live socket keeps turn state fresh; otherwise double-check before posting
+        verify_turn = not self._ws_connected
+        gen = self._clock.generation  # results are dropped if the screen is left meanwhile
+        # a journaled roll is only re-sent for this match while no newer state has arrived
+        scope = (self.match_id, self._state_seq)
 
         def worker():
+            settled = False
             try:
+                if verify_turn and not self._verify_turn_before_roll(gen):
+                    return
                 body = {"match_id": self.match_id}
                 if coin_choice is not None:
                     body["coin_index"] = coin_choice
-                resp = requests.post(
+                # keyed roll: safe to retry within the deadline, and journaled if the outcome stays unknown;
+                # this roll supersedes any earlier one that never got an answer
+                pending_ops.discard(pending_ops.OP_ROLL)
+                op = pending_ops.begin(
+                    pending_ops.OP_ROLL,
+                    "POST",
                     f"{self._backend()}/matches/roll",
-                    headers={"Authorization": f"Bearer {self._token()}"},
-                    json=body,
-                    timeout=8,
-                    verify=False,
+                    body,
+                    match_headers(self._token()),
+                    scope=scope,
                 )
+                try:
+                    resp = pending_ops.send(op, timeout=4, deadline=9, verify=False)
+                except Exception as e:
+                    self._debug(f"[ROLL][PENDING] outcome unknown ({e}); will reconcile.")
+                    self._clock.once(lambda dt: self._sync_remote_turn("roll-unknown", trusted=True), 0, gen)
+                    return
                 if resp.status_code == 200:
-                    data = resp.json()
+                    settled = True
+                    data = decode_response(resp)
                     self._maybe_update_my_index_from_payload(data, trusted=True)
                     roll_val = int(data.get("roll") or 1)
-                    Clock.schedule_once(
-                        lambda dt: self._animate_dice_and_apply_server(data, roll_val), 0
+                    self._clock.once(
+                        lambda dt: self._animate_dice_and_apply_server(data, roll_val), 0, gen
                     )
 
                 elif resp.status_code == 409:
                     self._debug("[TURN] Server rejected roll — not your turn.")
                     if not getattr(self, "_auto_from_timer", False):
                         self._show_temp_popup("Not your turn!", duration=1.5)
-                    Clock.schedule_once(lambda dt: self._mark_roll_end(), 0)
-                    Clock.schedule_once(lambda dt: setattr(self, "_last_roll_time", 0), 0)
-                    Clock.schedule_once(lambda dt: self._sync_remote_turn("409"), 0)
+                    self._clock.once(lambda dt: self._mark_roll_end(), 0, gen)
+                    self._clock.once(lambda dt: setattr(self, "_last_roll_time", 0), 0, gen)
+                    self._clock.once(lambda dt: self._sync_remote_turn("409"), 0, gen)
                     return
 
                 elif resp.status_code == 400 and "Match not active" in resp.text:
@@ -1073,28 +1325,27 @@ class DiceGameScreen(Screen):
                 self._debug(f"[ROLL][ERR] {e}")
 
             finally:
-                Clock.schedule_once(lambda dt: self._mark_roll_end(), 0.1)
-                Clock.schedule_once(lambda dt: setattr(self, "_last_roll_time", 0), 0.1)
+                if not settled:
+                    self._clock.once(lambda dt: self._cancel_speculative_roll(), 0, gen)
+                self._clock.once(lambda dt: self._mark_roll_end(), 0.1, gen)
+                self._clock.once(lambda dt: setattr(self, "_last_roll_time", 0), 0.1, gen)
                 if getattr(self, "_auto_from_timer", False):
-                    Clock.schedule_once(lambda dt: setattr(self, "_auto_from_timer", False), 0)
+                    self._clock.once(lambda dt: setattr(self, "_auto_from_timer", False), 0, gen)
 
         threading.Thread(target=worker, daemon=True).start()
 
     # ---------- offline roll core ----------
     def _auto_choose_coin(self, player_idx: int) -> int | None:
-        if player_idx >= len(self._positions):
+        if player_idx >= MAX_PLAYERS:
             return None
         # Prefer coins that are not yet on the board so they can spawn on a 1
-        for cidx in range(2):
-            if player_idx < len(self._spawned_on_board) and not self._spawned_on_board[player_idx][cidx]:
-                return cidx
+        unspawned = self._board.first_unspawned(player_idx)
+        if unspawned is not None:
+            return unspawned
         # Otherwise pick the first coin that hasn't reached the final box
-        for cidx in range(2):
-            try:
-                if self._positions[player_idx][cidx] < FINAL_BOX_INDEX:
-                    return cidx
-            except Exception:
-                continue
+        for cidx in range(COINS_PER_PLAYER):
+            if self._board.position(player_idx, cidx) < FINAL_BOX_INDEX:
+                return cidx
         return None
 
     def _apply_roll(self, roll: int, *, forced_coin_idx: int | None = None, player_idx: int | None = None):
@@ -1114,110 +1365,111 @@ class DiceGameScreen(Screen):
         p = self._current_player if player_idx is None else player_idx
         if p is None:
             return
-        if self._coins_finished[p] >= COINS_TO_WIN:
+        if self._recorder:
+            self._recorder.record(EVENT_ROLL, {"roll": roll, "coin": forced_coin_idx, "player": p})
+        board = self._board
+        if board.finished(p) >= COINS_TO_WIN:
             self._debug(f"[OFFLINE] Player {p} already locked all coins.")
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.4)
+            self._clock.once(lambda dt: self._end_turn_and_highlight(), 0.4)
             return
 
         coin_idx = forced_coin_idx if forced_coin_idx is not None else self._auto_choose_coin(p)
         if coin_idx is None or coin_idx >= 2:
             self._debug(f"[OFFLINE] Player {p} has no movable coins.")
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.4)
+            self._clock.once(lambda dt: self._end_turn_and_highlight(), 0.4)
             return
 
-        if self._positions[p][coin_idx] == FINAL_BOX_INDEX:
+        if board.position(p, coin_idx) == FINAL_BOX_INDEX:
             self._debug(f"[OFFLINE] Player {p} coin {coin_idx} already safe.")
             if self._can_control_coin(p):
                 self._show_temp_popup("Coin already safe", duration=1.2)
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.4)
+            self._clock.once(lambda dt: self._end_turn_and_highlight(), 0.4)
             return
 
-        old = self._positions[p][coin_idx] if self._spawned_on_board[p][coin_idx] else -1
-        new_pos = old + roll if self._spawned_on_board[p][coin_idx] else -1
+        spawned = board.is_spawned(p, coin_idx)
+        old = board.position(p, coin_idx) if spawned else NO_POSITION
+        new_pos = old + roll if spawned else NO_POSITION
         BOARD_MAX = FINAL_BOX_INDEX
         DANGER_BOX = 3
 
         self._debug(f"[OFFLINE] Player {p} coin {coin_idx} rolled {roll} (from {old})")
 
         # --- Rule 1: Spawn only when rolling 1 ---
-        if not self._spawned_on_board[p][coin_idx]:
+        if not spawned:
             if roll == 1:
-                self._spawned_on_board[p][coin_idx] = True
-                self._positions[p][coin_idx] = 0
+                board.place(p, coin_idx, 0)
                 self._move_coin_to_box(p, coin_idx, 0)
                 self._debug(f"[SPAWN] Player {p} coin {coin_idx} enters at box 0")
             else:
                 self._debug(f"[SKIP] Player {p} coin {coin_idx} not spawned (roll={roll})")
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.5)
+            self._after_coin_motion(self._end_turn_and_highlight, minimum=0.4)
             return
 
         # --- Rule 2: Danger zone (box 3 → reset to 0) ---
         if new_pos == DANGER_BOX:
             self._debug(f"[DANGER] Player {p} coin {coin_idx} hit box 3 → reset to start")
-            self._positions[p][coin_idx] = DANGER_BOX
+            board.set_position(p, coin_idx, DANGER_BOX)
             self._move_coin_to_box(p, coin_idx, DANGER_BOX, stepwise=True, start_pos=old)
             self._game_active = False
 
             def do_reverse_reset(*_):
                 self._move_coin_to_box(p, coin_idx, 0, reverse=True)
-                self._positions[p][coin_idx] = 0
-                self._spawned_on_board[p][coin_idx] = True # Ensure it stays spawned
+                board.place(p, coin_idx, 0)  # Ensure it stays spawned
                 self._debug(f"[RESET] Player {p} coin {coin_idx} safely returned to start")
                 self._game_active = True
-                self._end_turn_and_highlight()
+                self._after_coin_motion(self._end_turn_and_highlight)
 
-            Clock.schedule_once(do_reverse_reset, 0.8)
+            self._after_coin_motion(do_reverse_reset)
             return
 
         # --- Rule 3: Win condition (==7) ---
         if new_pos == BOARD_MAX:
-            self._positions[p][coin_idx] = BOARD_MAX
+            board.set_position(p, coin_idx, BOARD_MAX)
             self._move_coin_to_box(p, coin_idx, BOARD_MAX)
-            self._coins_finished[p] += 1
+            progress = board.add_finished(p)
             # self._add_finished_marker(p)
-            progress = self._coins_finished[p]
             self._debug(f"[PROGRESS] Player {p} locked coin {progress}/{COINS_TO_WIN}")
 
-            if self._coins_finished[p] >= COINS_TO_WIN:
+            if progress >= COINS_TO_WIN:
                 self._declare_winner(p)
                 return
             # Keep the finished coin on box_8 (safe). Next rolls can be used to
             # spawn/move the remaining coin(s).
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.9)
+            self._after_coin_motion(self._end_turn_and_highlight, minimum=0.4)
             return
 
         # --- Rule 4: Overshoot (>FINAL_BOX) → stay on current box ---
         if new_pos > BOARD_MAX:
             self._debug(f"[OVERSHOOT] Player {p} coin {coin_idx} rolled {roll} → stays at {old}")
-            self._positions[p][coin_idx] = old
+            board.set_position(p, coin_idx, old)
             self._move_coin_to_box(p, coin_idx, old)
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.5)
+            self._after_coin_motion(self._end_turn_and_highlight, minimum=0.4)
             return
 
         # --- Rule 5: Normal move ---
-        self._positions[p][coin_idx] = new_pos
-        self._move_coin_to_box(p, coin_idx, new_pos, stepwise=True, start_pos=old)
+        board.set_position(p, coin_idx, new_pos)
+        path_time = self._move_coin_to_box(p, coin_idx, new_pos, stepwise=True, start_pos=old)
         self._debug(f"[MOVE] Player {p} coin {coin_idx} moved to box {new_pos}")
 
         # --- Rule 6: Capture — if land on opponent, send them to 0 ---
         # Final box is a safe zone: do not capture coins sitting there.
         if new_pos == FINAL_BOX_INDEX:
-            Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.6)
+            self._after_coin_motion(self._end_turn_and_highlight, minimum=0.4)
             return
         for idx in range(self._num_players):
             if idx == p:
                 continue
             # Check all coins of opponent
-            for cidx in range(2):
-                if self._spawned_on_board[idx][cidx] and self._positions[idx][cidx] == new_pos:
+            for cidx in range(COINS_PER_PLAYER):
+                if board.is_spawned(idx, cidx) and board.position(idx, cidx) == new_pos:
                     self._debug(
                         f"[CAPTURE] Player {p} coin {coin_idx} captures player {idx} coin {cidx} at box {new_pos} → player {idx} coin {cidx} back to 0")
                     # Capture means reset to home (unspawned) so they must roll 1 to re-enter
-                    self._positions[idx][cidx] = -1
-                    self._spawned_on_board[idx][cidx] = False
-                    self._move_coin_home(idx, cidx)
+                    board.place(idx, cidx, NO_POSITION)
+                    # send the captured coin home once the attacker has landed on it
+                    self._clock.once(lambda dt, i=idx, c=cidx: self._move_coin_home(i, c), path_time)
 
-        Clock.schedule_once(lambda dt: self._end_turn_and_highlight(), 0.6)
+        self._after_coin_motion(self._end_turn_and_highlight, minimum=0.4)
 
     def _end_turn_and_highlight(self):
         """Advance strictly +1 turn in offline mode."""
@@ -1237,7 +1489,7 @@ class DiceGameScreen(Screen):
             self._highlight_turn()
             self._start_turn_timer()
 
-        Clock.schedule_once(finish_turn, 0.3)
+        self._clock.once(finish_turn, 0.3)
 
     # ---------- victory ----------
     def _declare_winner(self, winner_idx: int):
@@ -1268,7 +1520,7 @@ class DiceGameScreen(Screen):
                 pass
             self._reset_after_popup()
 
-        Clock.schedule_once(close_popup_and_reset, 2.5)
+        self._clock.once(close_popup_and_reset, 2.5)
 
     def _reset_after_popup(self, *_):
         self._stop_online_sync()
@@ -1284,7 +1536,7 @@ class DiceGameScreen(Screen):
             self._debug("[FORFEIT] Click ignored (lock active).")
             return
         self._forfeit_lock = True
-        Clock.schedule_once(lambda dt: setattr(self, "_forfeit_lock", False), 3.0)
+        self._clock.once(lambda dt: setattr(self, "_forfeit_lock", False), 3.0)
 
         self._debug("[FORFEIT] Give Up pressed.")
         backend, token, match_id = self._backend(), self._token(), self.match_id
@@ -1292,45 +1544,46 @@ class DiceGameScreen(Screen):
 
         if not (backend and token and match_id):
             self._show_forfeit_popup("You gave up! Opponent wins.")
-            Clock.schedule_once(lambda dt: self._reset_after_popup(), 2.5)
+            self._clock.once(lambda dt: self._reset_after_popup(), 2.5)
             return
 
         def worker():
             try:
                 self._debug(f"[FORFEIT] Sending request to backend for match {match_id}")
-                resp = requests.post(
+                op = pending_ops.begin(
+                    pending_ops.OP_FORFEIT,
+                    "POST",
                     f"{backend}/matches/forfeit",
-                    headers={"Authorization": f"Bearer {token}"},
-                    json={"match_id": match_id},
-                    timeout=10,
-                    verify=False,
+                    {"match_id": match_id},
+                    match_headers(token),
                 )
-                data = resp.json() if resp.status_code == 200 else {}
+                resp = pending_ops.send(op, timeout=5, deadline=10, verify=False)
+                data = decode_response(resp) if resp.status_code == 200 else {}
 
                 if resp.status_code == 400 and "already finished" in resp.text.lower():
                     self._debug("[FORFEIT] Match already finished — skipping.")
-                    Clock.schedule_once(lambda dt: self._reset_after_popup(), 1.5)
+                    self._clock.once(lambda dt: self._reset_after_popup(), 1.5)
                     return
 
                 if data.get("continuing"):
-                    Clock.schedule_once(
+                    self._clock.once(
                         lambda dt: self._show_forfeit_popup("You gave up! Others continue playing."), 0
                     )
-                    Clock.schedule_once(lambda dt: self._reset_after_popup(), 2.5)
+                    self._clock.once(lambda dt: self._reset_after_popup(), 2.5)
                     return
 
                 winner = data.get("winner_name", "Opponent")
-                Clock.schedule_once(
+                self._clock.once(
                     lambda dt: self._show_forfeit_popup(f"You gave up! {winner} wins."), 0
                 )
-                Clock.schedule_once(lambda dt: self._reset_after_popup(), 2.5)
+                self._clock.once(lambda dt: self._reset_after_popup(), 2.5)
 
             except Exception as e:
                 self._debug(f"[FORFEIT][ERR] {e}")
-                Clock.schedule_once(
+                self._clock.once(
                     lambda dt: self._show_forfeit_popup("You gave up! Opponent wins."), 0
                 )
-                Clock.schedule_once(lambda dt: self._reset_after_popup(), 2.5)
+                self._clock.once(lambda dt: self._reset_after_popup(), 2.5)
 
         threading.Thread(target=worker, daemon=True).start()
 
@@ -1354,13 +1607,13 @@ class DiceGameScreen(Screen):
                 pass
             self._reset_after_popup()
 
-        Clock.schedule_once(close_popup_and_reset, 2.5)
+        self._clock.once(close_popup_and_reset, 2.5)
 
     # ---------- toast ----------
     def _show_temp_popup(self, msg: str, duration: float = 2.0):
         # ensure popup interactions always run on the main/UI thread
         if threading.current_thread() is not threading.main_thread():
-            Clock.schedule_once(lambda dt: self._show_temp_popup(msg, duration), 0)
+            self._clock.once(lambda dt: self._show_temp_popup(msg, duration), 0)
             return
 
         try:
@@ -1399,7 +1652,7 @@ class DiceGameScreen(Screen):
                     pass
                 self._toast_ev = None
 
-            self._toast_ev = Clock.schedule_once(_close, max(1.5, float(duration)))
+            self._toast_ev = self._clock.once(_close, max(1.5, float(duration)))
 
         except Exception as e:
             self._debug(f"[TOAST][ERR] {e}")
@@ -1419,7 +1672,7 @@ class DiceGameScreen(Screen):
             field.text = ""
         scroll = self.ids.get("chat_scroll")
         if scroll:
-            Clock.schedule_once(lambda dt: setattr(scroll, "scroll_y", 0))
+            self._clock.once(lambda dt: setattr(scroll, "scroll_y", 0))
 
     def toggle_chat_dropdown(self):
         self.chat_open = not self.chat_open
@@ -1462,14 +1715,14 @@ class DiceGameScreen(Screen):
         safe_x, safe_y = self._clamp_overlay_center(parent, target, bubble.size)
         bubble.center = (safe_x, safe_y + dp(26))
         Animation.cancel_all(bubble)
-        Animation(center=(safe_x, safe_y), opacity=1, d=0.22, t="out_back").start(bubble)
+        self._clock.animate(Animation(center=(safe_x, safe_y), opacity=1, d=0.22, t="out_back"), bubble)
 
         if self._chat_bubble_ev:
             try:
                 self._chat_bubble_ev.cancel()
             except Exception:
                 pass
-        self._chat_bubble_ev = Clock.schedule_once(lambda dt: self._hide_chat_bubble(), 4)
+        self._chat_bubble_ev = self._clock.once(lambda dt: self._hide_chat_bubble(), 4)
 
     def _hide_chat_bubble(self, instant: bool = False):
         bubble = getattr(self, "_chat_bubble", None)
@@ -1492,7 +1745,7 @@ class DiceGameScreen(Screen):
         Animation.cancel_all(bubble)
         anim = Animation(opacity=0, d=0.3, t="in_quad")
         anim.bind(on_complete=lambda *_: _finish())
-        anim.start(bubble)
+        self._clock.animate(anim, bubble)
 
     def _append_chat_message(self, text: str):
         entry = f"You: {text}"
@@ -1505,13 +1758,69 @@ class DiceGameScreen(Screen):
         self.chat_log = []
 
     def _animate_dice_and_apply_server(self, data, roll):
-        if "dice_button" in self.ids:
-            self.ids.dice_button.animate_spin(roll)
-        Clock.schedule_once(lambda dt: self._on_server_event(data), 0.8)
+        """Settle the (possibly already spinning) dice and apply the server state as the face lands."""
+        dice = self.ids.get("dice_button")
+        delay = 0.8
+        if dice:
+            if dice.spinning_speculatively:
+                delay = dice.settle(roll)
+            else:
+                # a socket broadcast may have spun it onto this face already
+                landing = dice.landing_in(roll)
+                delay = dice.animate_spin(roll) if landing is None else landing
+        self._clock.once(lambda dt: self._on_server_event(data, dice_shown=True), delay)
+
+    def _verify_turn_before_roll(self, gen: int | None = None) -> bool:
+        """Worker-thread turn check against /matches/check; False aborts the roll."""
+        try:
+            resp = http_get(
+                f"{self._backend()}/matches/check",
+                headers=match_headers(self._token()),
+                params={"match_id": self.match_id},
+                timeout=5,
+                verify=False,
+            )
+            if resp.status_code != 200:
+                return True
+            data = decode_response(resp)
+        except Exception as e:
+            self._debug(f"[ROLL][VERIFY][ERR] {e}")
+            # fallback to previous state; continue rolling
+            return True
+        self._maybe_update_my_index_from_payload(data, trusted=True)
+        srv_turn = data.get("turn")
+        if srv_turn is None or int(srv_turn) == self._my_index:
+            return True
+
+        self._debug("[ROLL] Aborted — backend reports different turn.")
+
+        def abort(*_):
+            self._current_player = int(srv_turn)
+            self._mark_roll_end()
+            self._set_dice_button_enabled(False)
+            if not getattr(self, "_auto_from_timer", False):
+                self._show_temp_popup("Not your turn!", duration=1.5)
+
+        self._clock.once(abort, 0, gen)
+        return False
+
+    def _start_speculative_roll(self):
+        dice = self.ids.get("dice_button")
+        if dice:
+            dice.start_speculative_spin(self._health.srtt)
+
+    def _cancel_speculative_roll(self):
+        dice = self.ids.get("dice_button")
+        if dice:
+            dice.abort_spin()
 
     # ---------- coins ----------
-    def _ensure_coin_widgets(self):
+    def _ensure_coin_widgets(self, force: bool = False):
+        """Create, bind and parent coin widgets once per match (or when the player count changes)."""
         layer = self._root_float()
+        key = (id(layer), self._num_players)
+        if not force and self._coin_widgets_key == key:
+            return
 
         def bind_coin(widget, player_idx, coin_idx):
             if not widget:
@@ -1546,60 +1855,65 @@ class DiceGameScreen(Screen):
 
         self._bring_coins_to_front()
         self._update_coin_selection_visuals()
+        self._coin_widgets_key = key
 
     def _place_coins_near_portraits(self):
         """Place all coins near their player portraits. Both coins should be visible initially."""
         self._ensure_coin_widgets()
-        for player_idx in range(self._num_players):
-            for coin_idx in range(2):  # 2 coins per player
-                if player_idx < len(self._spawned_on_board) and coin_idx < len(self._spawned_on_board[player_idx]):
-                    # Only position coins that haven't been spawned on the board
-                    if not self._spawned_on_board[player_idx][coin_idx]:
-                        # Ensure position is -1 (not on board)
-                        if player_idx < len(self._positions) and coin_idx < len(self._positions[player_idx]):
-                            self._positions[player_idx][coin_idx] = -1
-                        self._position_coin_near_portrait(player_idx, coin_idx)
+        for player_idx in range(min(self._num_players, MAX_PLAYERS)):
+            for coin_idx in range(COINS_PER_PLAYER):
+                # Only position coins that haven't been spawned on the board
+                if not self._board.is_spawned(player_idx, coin_idx):
+                    # Ensure position is -1 (not on board)
+                    self._board.set_position(player_idx, coin_idx, NO_POSITION)
+                    self._position_coin_near_portrait(player_idx, coin_idx)
         self._update_coin_selection_visuals()
 
     def _clamp_to_bounds(self, pos, size):
-        layer = self._root_float()
-        width = layer.width if layer.width else Window.width
-        height = layer.height if layer.height else Window.height
-        half_w = size[0] / 2.0
-        half_h = size[1] / 2.0
-        x = min(max(pos[0], half_w), max(width - half_w, half_w))
-        y = min(max(pos[1], half_h), max(height - half_h, half_h))
-        return x, y
+        return self._geometry.clamp(pos, size)
 
-    def _jump_coin_to(self, coin, target_xy, *, jump_height=dp(28), duration=0.5):
-        """Animate a playful jump arc towards the target center."""
+    def _jump_coin_to(self, coin, target_xy, *, jump_height=dp(28), duration=0.5) -> float:
+        """Animate a playful jump arc towards the target center; returns its duration."""
         if not coin or not target_xy:
+            return 0.0
+        return self._coin_timeline.play_path(coin, [target_xy], jump_height=jump_height, hop_duration=duration)
+
+    def _box_target(self, player_idx: int, coin_idx: int, pos: int, size=None) -> tuple[float, float] | None:
+        """Clamped layer-space center for a coin resting on box `pos` (cached per layout)."""
+        stacked = player_idx < MAX_PLAYERS and self._board.other_coin_at(player_idx, coin_idx, pos)
+        return self._geometry.coin_target(pos, coin_idx, self._num_players, stacked)
+
+    def _bind_geometry(self, *_):
+        """Invalidate cached board geometry whenever the window, board or coin layer is resized."""
+        invalidate = self._on_geometry_changed
+        Window.bind(size=invalidate)
+        for wid in ("board", "coin_layer"):
+            widget = self.ids.get(wid)
+            if widget:
+                widget.bind(pos=invalidate, size=invalidate)
+        for pos in range(FINAL_BOX_INDEX + 1):
+            box = self.ids.get(f"box_{pos}")
+            if box:
+                box.bind(pos=invalidate, size=invalidate)
+
+    def _on_geometry_changed(self, *_):
+        self._geometry.invalidate()
+        self._relayout_trigger()
+
+    def _relayout_coins(self, *_):
+        """Snap resting coins (and finish running paths) onto the freshly measured layout."""
+        if not self._coin_widgets_key:
             return
-
-        current_x, current_y = coin.center
-        target_x, target_y = target_xy
-        mid_x = (current_x + target_x) / 2.0
-        apex_y = max(current_y, target_y) + jump_height
-
-        Animation.cancel_all(coin, "center")
-        ascent = Animation(center=(mid_x, apex_y), d=duration * 0.45, t="out_cubic")
-        landing = Animation(center=(target_x, target_y), d=duration * 0.55, t="in_quad")
-        (ascent + landing).start(coin)
-
-    def _stack_offset_for(self, player_idx: int, coin_idx: int, pos: int) -> tuple[float, float]:
-        offsets = {
-            0: (-dp(8), 0),
-            1: (dp(8), 0),
-        }
-        if player_idx >= len(self._positions):
-            return offsets.get(coin_idx, (0, 0))
-        other_idx = 1 - coin_idx
-        other_pos = None
-        if other_idx < len(self._positions[player_idx]):
-            other_pos = self._positions[player_idx][other_idx]
-        if other_pos == pos and pos >= 0:
-            return (0, 0)
-        return offsets.get(coin_idx, (0, 0))
+        for player_idx in range(min(self._num_players, MAX_PLAYERS)):
+            for coin_idx in range(COINS_PER_PLAYER):
+                coin = self._coins[player_idx][coin_idx]
+                if not coin or coin.parent is None:
+                    continue
+                pos = self._board.position(player_idx, coin_idx)
+                if pos >= 0:
+                    self._move_coin_to_box_direct(player_idx, coin_idx, pos, animate=False)
+                else:
+                    self._position_coin_near_portrait(player_idx, coin_idx)
 
     def _move_coin_to_box(
             self,
@@ -1611,45 +1925,36 @@ class DiceGameScreen(Screen):
             start_pos=None,
             *,
             animate: bool = True,
-    ):
+    ) -> float:
+        """Move a coin to box `pos`; returns how long the resulting animation runs."""
         box = self.ids.get(f"box_{pos}")
         if player_idx >= len(self._coins) or coin_idx >= len(self._coins[player_idx]):
-            return
+            return 0.0
         coin = self._coins[player_idx][coin_idx]
         if not box or not coin or coin.parent is None:
-            return
-
-        Animation.cancel_all(coin)
+            return 0.0
 
-        h = getattr(box, "height", dp(50))
-        size_px = max(dp(34), min(dp(56), h * 0.9))
-        if self._num_players == 3:
-            size_px = min(size_px, dp(40))
+        size_px = self._geometry.coin_size(pos, self._num_players)
         coin.size = (size_px, size_px)
 
-        layer = self._root_float()
-        stack_x, stack_y = self._stack_offset_for(player_idx, coin_idx, pos)
-
         if reverse:
-            start_anchor = self.ids.get("box_0")
-            if start_anchor:
-                tx, ty = self._map_center_to_parent(layer, start_anchor)
-                self._jump_coin_to(coin, (tx, ty), jump_height=dp(48), duration=0.6)
-                self._positions[player_idx][coin_idx] = 0
+            start_center = self._geometry.box_center(0)
+            if start_center:
+                tx, ty = start_center
+                self._board.set_position(player_idx, coin_idx, 0)
                 self._debug(f"[REVERSE] Player {player_idx} coin {coin_idx} reset to start box.")
-            else:
-                self._debug("[WARN] box_0 missing; reverse skipped.")
-            return
+                return self._jump_coin_to(coin, (tx, ty), jump_height=dp(48), duration=0.6)
+            self._debug("[WARN] box_0 missing; reverse skipped.")
+            return 0.0
         if stepwise:
             if start_pos is None:
-                start_pos = self._positions[player_idx][coin_idx]
+                start_pos = self._board.position(player_idx, coin_idx)
             if isinstance(start_pos, int) and isinstance(pos, int) and start_pos != pos:
                 direction = 1 if pos > start_pos else -1
                 path = list(range(start_pos + direction, pos + direction, direction))
-                self._animate_coin_path(player_idx, coin_idx, path, jump_height=dp(26), duration=0.22)
-                return
+                return self._animate_coin_path(player_idx, coin_idx, path, jump_height=dp(26), duration=0.22)
 
-        self._move_coin_to_box_direct(player_idx, coin_idx, pos, animate=animate)
+        return self._move_coin_to_box_direct(player_idx, coin_idx, pos, animate=animate)
 
     def _move_coin_to_box_direct(
             self,
@@ -1660,116 +1965,163 @@ class DiceGameScreen(Screen):
             duration=0.55,
             *,
             animate: bool = True,
-    ):
+    ) -> float:
         box = self.ids.get(f"box_{pos}")
         if player_idx >= len(self._coins) or coin_idx >= len(self._coins[player_idx]):
-            return
+            return 0.0
         coin = self._coins[player_idx][coin_idx]
         if not box or not coin or coin.parent is None:
-            return
-
-        Animation.cancel_all(coin)
+            return 0.0
 
-        h = getattr(box, "height", dp(50))
-        size_px = max(dp(34), min(dp(56), h * 0.9))
-        if self._num_players == 3:
-            size_px = min(size_px, dp(40))
-        stack_x, stack_y = self._stack_offset_for(player_idx, coin_idx, pos)
+        size_px = self._geometry.coin_size(pos, self._num_players)
         coin.size = (size_px, size_px)
-
-        layer = self._root_float()
-        tx, ty = self._map_center_to_parent(layer, box)
-        target = (tx + stack_x, ty + stack_y)
-        safe_x, safe_y = self._clamp_to_bounds(target, coin.size)
-        if animate:
-            self._jump_coin_to(coin, (safe_x, safe_y), jump_height=jump_height, duration=duration)
-        else:
-            coin.center = (safe_x, safe_y)
-        self._positions[player_idx][coin_idx] = pos
+        self._board.set_position(player_idx, coin_idx, pos)
+        target = self._box_target(player_idx, coin_idx, pos, coin.size)
         self._debug(f"[MOVE] Player {player_idx} coin {coin_idx} now at {pos}")
+        if animate:
+            return self._jump_coin_to(coin, target, jump_height=jump_height, duration=duration)
+        self._coin_timeline.stop(coin)
+        coin.center = target
+        return 0.0
 
-    def _animate_coin_path(self, player_idx: int, coin_idx: int, path, jump_height=dp(26), duration=0.22):
+    def _animate_coin_path(self, player_idx: int, coin_idx: int, path, jump_height=dp(26), duration=0.22) -> float:
+        """Play the whole multi-box path as one keyframe sequence; returns its duration."""
         if not path:
-            return
-
-        steps = list(path)
-
-        def _step(*_):
-            if not steps:
-                return
-            next_box = steps.pop(0)
-            self._move_coin_to_box_direct(player_idx, coin_idx, next_box, jump_height=jump_height, duration=duration)
-            if steps:
-                Clock.schedule_once(_step, duration * 1.05)
+            return 0.0
+        coin = self._coins[player_idx][coin_idx]
+        if not coin:
+            return 0.0
+
+        # the board holds the final box right away; intermediate boxes are only keyframes
+        final_pos = path[-1]
+        self._board.set_position(player_idx, coin_idx, final_pos)
+        targets = [self._box_target(player_idx, coin_idx, box_idx, coin.size) for box_idx in path]
+
+        # a coin still travelling means the server is ahead of us: compress the new path
+        max_duration = COMPRESSED_PATH_SECONDS if self._coin_timeline.is_moving(coin) else None
+        return self._coin_timeline.play_path(
+            coin,
+            targets,
+            jump_height=jump_height,
+            hop_duration=duration,
+            max_duration=max_duration,
+        )
 
-        _step()
+    def _after_coin_motion(self, callback, minimum: float = 0.0):
+        """Schedule `callback` once all coin animations have landed (but not before `minimum` seconds)."""
+        delay = max(minimum, self._coin_timeline.remaining() + COIN_SETTLE_PAD)
+        return self._clock.once(lambda dt: callback(), delay)
 
     def _apply_positions_to_board(self, positions, reverse=False):
-        """Apply positions from backend. positions can be flat list or nested list."""
+        """
+        Apply positions from backend without animation.
+        positions can be a flat list, a nested list or already-packed position bits.
+        """
+        if isinstance(positions, int):
+            bits = positions
+            has_third = bool(self.player3_name)
+        else:
+            bits = pack_positions(positions)
+            has_third = len(positions) >= 3 and bool(self.player3_name)
+        self._num_players = 3 if has_third else 2
         self._ensure_coin_widgets()
-        self._num_players = 3 if (len(positions) >= 3 and self.player3_name) else 2
 
-        # Handle both flat and nested position formats
-        for player_idx in range(self._num_players):
-            if player_idx < len(positions):
-                pos_val = positions[player_idx]
-                # If nested (list of 2 positions), use it directly
-                if isinstance(pos_val, (list, tuple)) and len(pos_val) >= 2:
-                    for coin_idx in range(2):
-                        self._positions[player_idx][coin_idx] = int(pos_val[coin_idx])
-                        if self._positions[player_idx][coin_idx] >= 0:
-                            self._spawned_on_board[player_idx][coin_idx] = True
-                            self._move_coin_to_box(
-                                player_idx, coin_idx, int(pos_val[coin_idx]), reverse=False, animate=False
-                            )
-                        else:
-                            self._spawned_on_board[player_idx][coin_idx] = False
-                            self._position_coin_near_portrait(player_idx, coin_idx)
-                else:
-                    # Flat format: single position per player (legacy)
-                    pos = int(pos_val) if pos_val is not None else -1
-                    self._positions[player_idx][0] = pos
-                    self._positions[player_idx][1] = -1
-                    if pos >= 0:
-                        self._spawned_on_board[player_idx][0] = True
-                        self._move_coin_to_box(player_idx, 0, pos, reverse=False, animate=False)
-                    else:
-                        self._spawned_on_board[player_idx][0] = False
-                        self._position_coin_near_portrait(player_idx, 0)
-                    self._spawned_on_board[player_idx][1] = False
-                    self._position_coin_near_portrait(player_idx, 1)
+        old_bits = self._board.bits
+        self._board.set_positions_bits(bits)
+        self._render_board_diff(old_bits, animate=False)
 
         self._validate_selected_coin()
         self._update_coin_selection_visuals()
 
+    def _render_board_diff(self, old_bits: int, *, actor_idx=None, roll_val=None, animate: bool = True):
+        """Move, spawn or send home only the coins that differ between old_bits and the current board."""
+        changes = board_diff(old_bits, self._board.bits)
+        if not changes:
+            return
+        changed = {(player_idx, coin_idx) for _, player_idx, coin_idx, _, _ in changes}
+
+        for kind, player_idx, coin_idx, old_p, new_p in changes:
+            if player_idx >= self._num_players:
+                continue
+
+            if kind == COIN_HOME:
+                self._position_coin_near_portrait(player_idx, coin_idx)
+                self._debug(f"[MOVE] Player {player_idx} coin {coin_idx}: {old_p} → home")
+            else:
+                stepwise = (
+                        animate
+                        and actor_idx is not None
+                        and actor_idx == player_idx
+                        and roll_val is not None
+                        and roll_val > 1
+                        and new_p > old_p >= 0
+                )
+                if stepwise:
+                    self._move_coin_to_box(player_idx, coin_idx, new_p, stepwise=True, start_pos=old_p)
+                else:
+                    self._move_coin_to_box(player_idx, coin_idx, new_p, animate=animate)
+                self._debug(f"[MOVE] Player {player_idx} coin {coin_idx}: {old_p} → {new_p}")
+
+            # the sibling coin's stack offset depends on whether both share a box
+            sibling = 1 - coin_idx
+            sibling_pos = self._board.position(player_idx, sibling)
+            if (player_idx, sibling) not in changed and sibling_pos >= 0 and sibling_pos in (old_p, new_p):
+                self._move_coin_to_box_direct(player_idx, sibling, sibling_pos, animate=animate)
+
     # ---------- ONLINE sync ----------
-    def _start_online_sync(self):
-        self._stop_online_sync()
+    def adopt_match_session(self, session):
+        """Take over a socket the lobby opened while the match was forming."""
+        if self._prefetched_session and self._prefetched_session is not session:
+            self._prefetched_session.close()
+        self._prefetched_session = session
+
+    def _start_online_sync(self, fresh: bool = False):
+        # keep a live socket for the same match (e.g. set_stage_and_players followed by on_pre_enter)
+        session = self._session
+        if fresh or not (session and session.alive and session.match_id == self.match_id):
+            session = None
+        if session is None:
+            prefetched, self._prefetched_session = self._prefetched_session, None
+            if not fresh and prefetched and prefetched.alive and prefetched.match_id == self.match_id:
+                session = prefetched
+            elif prefetched:
+                prefetched.close()
+        self._stop_online_sync(keep_session=session)
+
         self._resolve_my_index()
         self._last_roll_seen = None
         self._last_state_sig = None
+        self._state_seq += 1
         self._last_roll_animated = None
         self._first_turn_synced = False
+        snapshot = None
         if WEBSOCKET_OK:
-            self._ws_stop.clear()
-            self._ws_thread = threading.Thread(target=self._ws_worker, daemon=True)
-            self._ws_thread.start()
+            if session is None:
+                session = MatchSession(self._backend(), self._token(), self.match_id).start()
+            self._session = session
+            self._ws_connected = session.connected
+            snapshot = session.attach(
+                self._on_server_event,
+                on_connected=self._set_ws_connected,
+                on_pong=self._on_ws_pong,
+            )
+        else:
+            self._poll_ev = self._clock.interval(lambda dt: self._poll_state_once(), 0.9)
+        if snapshot:
+            # prefetched state: the board is correct on the first frame
+            self._debug("[SYNC] Applying prefetched match snapshot.")
+            self._maybe_update_my_index_from_payload(snapshot, trusted=True)
+            self._on_server_event(snapshot)
         else:
-            self._poll_ev = Clock.schedule_interval(lambda dt: self._poll_state_once(), 0.9)
-        # ensure we have the latest state immediately
-        self._sync_remote_turn("start-sync", trusted=True)
+            # ensure we have the latest state immediately
+            self._sync_remote_turn("start-sync", trusted=True)
         self._start_backend_heartbeat()
 
-    def _stop_online_sync(self):
-        if self._ws:
-            try:
-                self._ws.close()
-            except Exception:
-                pass
-        self._ws = None
-        if self._ws_thread:
-            self._ws_stop.set()
-            self._ws_thread = None
+    def _stop_online_sync(self, keep_session=None):
+        self._ws_connected = False
+        if self._session and self._session is not keep_session:
+            self._session.close()
+        self._session = None
         if self._poll_ev:
             try:
                 self._poll_ev.cancel()
@@ -1783,8 +2135,16 @@ class DiceGameScreen(Screen):
         if not self._online:
             return
         self._stop_backend_heartbeat()
-        self._heartbeat_evt = Clock.schedule_interval(lambda dt: self._backend_ping_tick(), 5)
-        Clock.schedule_once(lambda dt: self._backend_ping_tick(), 0)
+        self._health.reset()
+        self._schedule_heartbeat(0)
+
+    def _schedule_heartbeat(self, delay: float):
+        if self._heartbeat_evt:
+            try:
+                self._heartbeat_evt.cancel()
+            except Exception:
+                pass
+        self._heartbeat_evt = self._clock.once(self._backend_ping_tick, delay)
 
     def _stop_backend_heartbeat(self):
         if self._heartbeat_evt:
@@ -1793,6 +2153,13 @@ class DiceGameScreen(Screen):
             except Exception:
                 pass
             self._heartbeat_evt = None
+        if self._ping_timeout_ev:
+            try:
+                self._ping_timeout_ev.cancel()
+            except Exception:
+                pass
+            self._ping_timeout_ev = None
+        self._ws_ping_sent = None
         self._ping_worker_active = False
         self._cancel_pending_recovery()
 
@@ -1813,94 +2180,159 @@ class DiceGameScreen(Screen):
         ):
             return
         self._debug("[SYNC] Scheduling connection recovery after heartbeat failures.")
-        self._connection_recover_ev = Clock.schedule_once(self._perform_online_recovery, 0.6)
+        self._connection_recover_ev = self._clock.once(self._perform_online_recovery, 0.6)
 
     def _perform_online_recovery(self, *_):
         self._connection_recover_ev = None
         if not self._online or not self.match_id or not self._game_active:
             return
         self._debug("[SYNC] Restarting online sync after repeated heartbeat failures.")
-        self._start_online_sync()
+        self._start_online_sync(fresh=True)
 
     def _backend_ping_tick(self, *_):
-        if self._ping_worker_active or not self._online:
+        """Probe over the websocket when it is up; fall back to a single HTTP probe otherwise."""
+        self._heartbeat_evt = None
+        if not self._online:
+            return
+        if self._ws_connected and self._send_ws_ping():
+            return
+        self._http_probe()
+
+    def _send_ws_ping(self) -> bool:
+        if not self._session:
+            return False
+        try:
+            sent = self._session.ping()
+        except Exception as e:
+            self._debug(f"[PING][WS][ERR] {e}")
+            return False
+        if sent is None:
+            return False
+        self._ws_ping_sent = sent
+        self._ping_timeout_ev = self._clock.once(self._on_ws_ping_timeout, self._health.probe_timeout())
+        return True
+
+    def _on_ws_pong(self, data):
+        try:
+            sent = float(data)
+        except (TypeError, ValueError):
+            return
+        if self._ws_ping_sent is None or abs(sent - self._ws_ping_sent) > 1e-3:
+            return
+        self._ws_ping_sent = None
+        if self._ping_timeout_ev:
+            self._ping_timeout_ev.cancel()
+            self._ping_timeout_ev = None
+        self._handle_ping_result(True, time.monotonic() - sent)
+
+    def _on_ws_ping_timeout(self, *_):
+        self._ping_timeout_ev = None
+        if self._ws_ping_sent is None:
             return
+        self._ws_ping_sent = None
+        self._debug("[PING][WS] pong timeout")
+        self._handle_ping_result(False)
+
+    def _set_ws_connected(self, connected: bool):
+        self._ws_connected = connected
+        self._debug(f"[WS] {'connected' if connected else 'disconnected'}")
+        if connected:
+            pending_ops.reconcile_async(verify=False)
+
+    def _roll_scope_valid(self, scope) -> bool:
+        """A journaled roll may be re-sent only in its match and before any newer state arrived."""
+        return (
+                self._online
+                and self._game_active
+                and self.manager is not None
+                and self.manager.current == self.name
+                and scope == (self.match_id, self._state_seq)
+        )
+
+    def _on_roll_reconciled(self, op, resp):
+        """A journaled roll got its answer after reconnect (runs on the reconcile thread)."""
+        if (op.body or {}).get("match_id") != self.match_id or resp.status_code != 200:
+            self._clock.once(lambda dt: self._sync_remote_turn("roll-reconciled", trusted=True), 0)
+            return
+        try:
+            data = decode_response(resp)
+        except Exception as e:
+            self._debug(f"[ROLL][PENDING][ERR] {e}")
+            return
+        self._debug(f"[ROLL][PENDING] reconciled roll {data.get('roll')}")
+        # duplicate state is filtered by the state signature in _on_server_event
+        self._clock.once(lambda dt: self._on_server_event(data), 0)
+
+    def _http_probe(self):
         backend = self._backend()
-        if not backend:
+        if self._ping_worker_active or not backend:
+            self._schedule_heartbeat(self._health.next_interval())
             return
         self._ping_worker_active = True
+        # alternate endpoints after a failure instead of probing both serially
+        endpoint = f"{backend}/health" if self._probe_idx % 2 == 0 else f"{backend}/matches/ping"
+        timeout = self._health.probe_timeout()
+        headers = {"Authorization": f"Bearer {self._token()}"} if self._token() else {}
 
         def worker():
             success = False
-            headers = {"Authorization": f"Bearer {self._token()}"} if self._token() else {}
-            endpoints = [f"{backend}/health", f"{backend}/matches/ping"]
-            for endpoint in endpoints:
-                try:
-                    resp = requests.get(endpoint, headers=headers, timeout=5, verify=False)
-                    if resp.status_code < 500:
-                        success = True
-                        break
-                except Exception as e:
-                    self._debug(f"[PING][ERR] {endpoint}: {e}")
-            Clock.schedule_once(lambda dt: self._handle_ping_result(success), 0)
+            started = time.monotonic()
+            try:
+                resp = http_get(endpoint, headers=headers, timeout=timeout, verify=False)
+                success = resp.status_code < 500
+            except Exception as e:
+                self._debug(f"[PING][ERR] {endpoint}: {e}")
+            rtt = time.monotonic() - started
+            self._clock.once(lambda dt: self._handle_ping_result(success, rtt, http=True), 0)
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _handle_ping_result(self, success: bool):
-        self._ping_worker_active = False
+    def _handle_ping_result(self, success: bool, rtt: float | None = None, http: bool = False):
+        if http:
+            self._ping_worker_active = False
+        if not self._online:
+            return
+        health = self._health
+        badge = self.ids.get("connection_badge")
         if success:
-            self._ping_failures = 0
+            if health.failures:
+                pending_ops.reconcile_async(verify=False)
+                profile_outbox.flush_async(verify=False)
+            health.record_success(rtt or 0.0)
             self._last_ping_time = time.time()
             self._cancel_pending_recovery()
-            badge = self.ids.get("connection_badge")
+            self.connection_latency_ms = health.latency_ms or 0
             if badge:
-                badge.text = "Connected"
-                badge.color = (0.1, 0.8, 0.3, 0.95)
+                badge.text = f"Connected · {self.connection_latency_ms} ms"
+                badge.color = (0.1, 0.8, 0.3, 0.95) if health.loss < 0.2 else (1.0, 0.6, 0.2, 0.95)
+            self._schedule_heartbeat(health.next_interval())
             return
 
-        self._ping_failures += 1
-        badge = self.ids.get("connection_badge")
+        health.record_failure()
+        if http:
+            self._probe_idx += 1
         if badge:
             badge.text = "Reconnecting..."
-            badge.color = (1.0, 0.6, 0.2, 0.95) if self._ping_failures < 3 else (1.0, 0.2, 0.2, 0.95)
+            badge.color = (1.0, 0.6, 0.2, 0.95) if health.failures < 3 else (1.0, 0.2, 0.2, 0.95)
 
-        if self._ping_failures >= 3:
+        if health.failures >= 3:
             self._debug("[PING] consecutive failures → resync")
             self._sync_remote_turn("heartbeat-recover", trusted=True)
-        if self._ping_failures >= 5:
+        if health.failures >= 5:
             self._schedule_online_recovery()
-
-    def _ws_worker(self):
-        url = self._backend().replace("http", "ws") + f"/matches/ws/{self.match_id}"
-        headers = [f"Authorization: Bearer {self._token()}"] if self._token() else []
-
-        def on_message(ws, message):
-            try:
-                payload = json.loads(message)
-                Clock.schedule_once(lambda dt: self._on_server_event(payload), 0)
-            except Exception:
-                pass
-
-        self._ws = websocket.WebSocketApp(url, header=headers, on_message=on_message)
-        while not self._ws_stop.is_set():
-            try:
-                self._ws.run_forever(ping_interval=20, ping_timeout=10)
-            except Exception:
-                pass
-            if self._ws_stop.wait(2.0):
-                break
+        self._schedule_heartbeat(health.next_interval())
 
     def _poll_state_once(self):
         try:
-            resp = requests.get(
+            resp = http_get(
                 f"{self._backend()}/matches/check",
-                headers={"Authorization": f"Bearer {self._token()}"},
+                headers=match_headers(self._token()),
                 params={"match_id": self.match_id},
                 timeout=8,
                 verify=False,
             )
             if resp.status_code == 200:
-                self._on_server_event(resp.json())
+                self._on_server_event(decode_response(resp))
             elif resp.status_code == 404:
                 self._stop_online_sync()
         except Exception as e:
@@ -1912,27 +2344,30 @@ class DiceGameScreen(Screen):
             return
 
         self._debug(f"[SYNC][REFRESH] Triggered ({reason or 'unspecified'})")
+        gen = self._clock.generation
 
         def worker():
             try:
-                resp = requests.get(
+                resp = http_get(
                     f"{self._backend()}/matches/check",
-                    headers={"Authorization": f"Bearer {self._token()}"},
+                    headers=match_headers(self._token()),
                     params={"match_id": self.match_id},
                     timeout=6,
                     verify=False,
                 )
                 if resp.status_code == 200:
-                    data = resp.json()
+                    data = decode_response(resp)
                     self._maybe_update_my_index_from_payload(data, trusted=trusted)
-                    Clock.schedule_once(lambda dt: self._on_server_event(data), 0)
+                    self._clock.once(lambda dt: self._on_server_event(data), 0, gen)
             except Exception as e:
                 self._debug(f"[SYNC][REFRESH][ERR] {e}")
 
         threading.Thread(target=worker, daemon=True).start()
 
     # ---------- core server event handler ----------
-    def _on_server_event(self, payload: dict):
+    def _on_server_event(self, payload: dict, dice_shown: bool = False):
+        if self._recorder:
+            self._recorder.record(EVENT_SERVER, payload)
         try:
             self._maybe_update_my_index_from_payload(payload)
 
@@ -1950,7 +2385,7 @@ class DiceGameScreen(Screen):
                 # I AM WINNER
                 if winner is not None and my_idx is not None and int(winner) == int(my_idx):
                     self._debug("[SYNC] I am winner → declare popup")
-                    Clock.schedule_once(lambda dt: self._declare_winner(int(winner)), 0.5)
+                    self._clock.once(lambda dt: self._declare_winner(int(winner)), 0.5)
                     return
 
                 # I AM LOSER
@@ -1959,14 +2394,14 @@ class DiceGameScreen(Screen):
                     self._show_temp_popup("You Lost!", duration=1.5)
                     self._stop_online_sync()
                     if self.manager:
-                        Clock.schedule_once(lambda dt: setattr(self.manager, "current", "stage"), 1.6)
+                        self._clock.once(lambda dt: setattr(self.manager, "current", "stage"), 1.6)
                     return
 
                 # FALLBACK — my_idx IS NONE (critical fix)
                 self._debug("[SYNC] FINISHED but my_idx is None → fallback redirect")
                 self._stop_online_sync()
                 if self.manager:
-                    Clock.schedule_once(lambda dt: setattr(self.manager, "current", "stage"), 1.0)
+                    self._clock.once(lambda dt: setattr(self.manager, "current", "stage"), 1.0)
                 return
 
             # =====================================================================
@@ -1985,7 +2420,7 @@ class DiceGameScreen(Screen):
                         self._show_temp_popup("You Lost!", duration=1.5)
                         self._stop_online_sync()
                         if self.manager:
-                            Clock.schedule_once(
+                            self._clock.once(
                                 lambda dt: setattr(self.manager, "current", "stage"),
                                 1.6,
                             )
@@ -1996,7 +2431,7 @@ class DiceGameScreen(Screen):
             # 2. Extract common state
             # =====================================================================
             winner = payload.get("winner")
-            positions = payload.get("positions") or self._positions
+            positions = payload.get("positions")
             roll = payload.get("last_roll")
             actor = payload.get("actor")
             turn = payload.get("turn")
@@ -2007,20 +2442,23 @@ class DiceGameScreen(Screen):
                     pass
             spawn = payload.get("spawn", False)
             forfeit_actor = payload.get("forfeit_actor")
+            # Handle positions - can be flat or nested; packed into one int
+            new_bits = pack_positions(positions) if positions else self._board.positions_bits
 
             # =====================================================================
             # 3. Duplicate filter
             # =====================================================================
-            sig = (tuple(positions), int(roll or 0), int(turn or -1))
-            if getattr(self, "_last_state_sig", None) == sig:
+            sig = state_signature(new_bits, roll, turn)
+            if self._last_state_sig == sig:
                 self._debug("[SYNC] Duplicate state – ignored")
                 return
             self._last_state_sig = sig
+            self._state_seq += 1
 
             # =====================================================================
             # 4. Dice animation
             # =====================================================================
-            if roll and "dice_button" in self.ids:
+            if roll and not dice_shown and "dice_button" in self.ids:
                 try:
                     self.ids.dice_button.animate_spin(int(roll))
                 except:
@@ -2033,51 +2471,28 @@ class DiceGameScreen(Screen):
                 actor_idx = int(actor)
                 # Find first unspawned coin for this player
                 coin_idx = None
-                for cidx in range(2):
-                    if actor_idx < len(self._spawned_on_board) and cidx < len(self._spawned_on_board[actor_idx]):
-                        if not self._spawned_on_board[actor_idx][cidx]:
-                            coin_idx = cidx
-                            break
+                if 0 <= actor_idx < MAX_PLAYERS:
+                    coin_idx = self._board.first_unspawned(actor_idx)
                 if coin_idx is None:
                     coin_idx = 0  # Default to first coin
 
                 self._debug(f"[SPAWN] Player {actor_idx} coin {coin_idx} enters board at 0")
-                if actor_idx < len(self._spawned_on_board) and coin_idx < len(self._spawned_on_board[actor_idx]):
-                    self._spawned_on_board[actor_idx][coin_idx] = True
-                    self._positions[actor_idx][coin_idx] = 0
+                if 0 <= actor_idx < MAX_PLAYERS:
+                    self._board.place(actor_idx, coin_idx, 0)
                     self._move_coin_to_box(actor_idx, coin_idx, 0)
 
                 # Turn update
                 self._current_player = int(turn) if turn is not None else (actor_idx + 1) % self._num_players
                 self._debug(f"[TURN][SPAWN] → player {self._current_player}")
 
-                Clock.schedule_once(lambda dt: self._unlock_and_continue(), 0.6)
+                self._after_coin_motion(self._unlock_and_continue, minimum=0.3)
                 return
 
             # =====================================================================
             # 6. Move handling
             # =====================================================================
-            # Handle positions - can be flat or nested
-            old_positions = [list(p) for p in self._positions]  # Deep copy
-            parsed_positions = []
-            for val in positions:
-                if isinstance(val, (list, tuple)) and len(val) >= 2:
-                    # Nested format: [pos_coin0, pos_coin1]
-                    parsed_positions.append([int(val[0]) if val[0] is not None else -1,
-                                             int(val[1]) if val[1] is not None else -1])
-                else:
-                    # Flat format: single position (legacy)
-                    try:
-                        pos = int(val) if val is not None else -1
-                        parsed_positions.append([pos, -1])
-                    except Exception:
-                        parsed_positions.append([-1, -1])
-
-            # Ensure we have enough entries
-            while len(parsed_positions) < 3:
-                parsed_positions.append([-1, -1])
-
-            self._positions = parsed_positions[:3]  # Keep only first 3 players
+            old_bits = self._board.bits
+            self._board.set_positions_bits(new_bits)
             self._ensure_coin_widgets()
 
             try:
@@ -2089,55 +2504,14 @@ class DiceGameScreen(Screen):
             except Exception:
                 roll_val = None
 
-            # Update coin positions
-            for player_idx in range(min(self._num_players, len(parsed_positions))):
-                old_pos = old_positions[player_idx] if player_idx < len(old_positions) else [-1, -1]
-                new_pos = parsed_positions[player_idx]
-
-                for coin_idx in range(2):
-                    old_p = old_pos[coin_idx] if coin_idx < len(old_pos) else -1
-                    new_p = new_pos[coin_idx] if coin_idx < len(new_pos) else -1
-
-                    if old_p == new_p:
-                        continue
-
-                    # Update spawned status
-                    if new_p >= 0:
-                        if player_idx < len(self._spawned_on_board) and coin_idx < len(
-                                self._spawned_on_board[player_idx]):
-                            self._spawned_on_board[player_idx][coin_idx] = True
-                    else:
-                        if player_idx < len(self._spawned_on_board) and coin_idx < len(
-                                self._spawned_on_board[player_idx]):
-                            self._spawned_on_board[player_idx][coin_idx] = False
-                            self._position_coin_near_portrait(player_idx, coin_idx)
-
-                    if new_p < 0:
-                        continue
-
-                    stepwise = (
-                            actor_idx is not None
-                            and actor_idx == player_idx
-                            and roll_val is not None
-                            and roll_val > 1
-                            and isinstance(old_p, int)
-                            and isinstance(new_p, int)
-                            and new_p > old_p
-                    )
-                    if stepwise:
-                        self._move_coin_to_box(player_idx, coin_idx, new_p, stepwise=True, start_pos=old_p)
-                    else:
-                        self._move_coin_to_box(player_idx, coin_idx, new_p)
-                    self._debug(f"[MOVE] Player {player_idx} coin {coin_idx}: {old_p} → {new_p}")
+            # Animate only coins whose packed nibble changed
+            self._render_board_diff(old_bits, actor_idx=actor_idx, roll_val=roll_val)
 
             # =====================================================================
             # 7. FORFEIT HANDLING
             # =====================================================================
             if forfeit_actor is not None:
-                if not hasattr(self, "_forfeited_players"):
-                    self._forfeited_players = set()
-
-                self._forfeited_players.add(forfeit_actor)
+                self._board.set_forfeited(forfeit_actor)
 
                 # Hide UI
                 if f"p{forfeit_actor + 1}_pic" in self.ids:
@@ -2151,7 +2525,7 @@ class DiceGameScreen(Screen):
                 self._show_temp_popup(f"Player {forfeit_actor + 1} gave up!", duration=2)
 
                 # Active players
-                active = [i for i in range(self._num_players) if i not in self._forfeited_players]
+                active = self._board.active_players(self._num_players)
 
                 # 🔥🔥 If only ONE player remains → declare auto-win (frontend)
                 if len(active) == 1:
@@ -2161,7 +2535,7 @@ class DiceGameScreen(Screen):
                         self._debug("[FORFEIT] I am the last player → auto-win popup")
                         self._cancel_turn_timer()
                         self._stop_online_sync()
-                        Clock.schedule_once(lambda dt: self._declare_winner(my_idx), 0.6)
+                        self._clock.once(lambda dt: self._declare_winner(my_idx), 0.6)
                         return
 
                     # If I am not the last
@@ -2170,7 +2544,7 @@ class DiceGameScreen(Screen):
                     self._stop_online_sync()
                     self._show_temp_popup("You Lost!", duration=1.5)
                     if self.manager:
-                        Clock.schedule_once(lambda dt: setattr(self.manager, "current", "stage"), 1.6)
+                        self._clock.once(lambda dt: setattr(self.manager, "current", "stage"), 1.6)
                     return
 
                 # More than one active player → continue
@@ -2187,7 +2561,7 @@ class DiceGameScreen(Screen):
 
                 if my_idx is not None and int(winner) == int(my_idx):
                     self._cancel_turn_timer()
-                    Clock.schedule_once(lambda dt: self._declare_winner(int(winner)), 0.7)
+                    self._clock.once(lambda dt: self._declare_winner(int(winner)), 0.7)
                     return
 
                 if my_idx is not None and int(winner) != int(my_idx):
@@ -2196,7 +2570,7 @@ class DiceGameScreen(Screen):
                     self._show_temp_popup("You Lost!", duration=1.5)
                     self._stop_online_sync()
                     if self.manager:
-                        Clock.schedule_once(lambda dt: setattr(self.manager, "current", "stage"), 1.6)
+                        self._clock.once(lambda dt: setattr(self.manager, "current", "stage"), 1.6)
                     return
 
                 self._game_active = False
@@ -2206,8 +2580,7 @@ class DiceGameScreen(Screen):
             # =====================================================================
             # 9. BACKEND TURN ROTATION
             # =====================================================================
-            forfeited = getattr(self, "_forfeited_players", set())
-            active = [i for i in range(self._num_players) if i not in forfeited]
+            active = self._board.active_players(self._num_players)
 
             # Backend turn always preferred
             if turn is not None:
@@ -2237,13 +2610,12 @@ class DiceGameScreen(Screen):
         """Backend-verified 10s idle → auto-roll (online), or offline 10s auto-roll for player 0."""
         self._cancel_turn_timer()
 
-        if not self._game_active:
+        if not self._game_active or self._replay:
             self._debug("[TIMER] Game inactive — timer not started.")
             return
 
-        forfeited = getattr(self, "_forfeited_players", set())
-        if getattr(self, "_forfeited_players", None) and self._current_player in forfeited:
-            active = [i for i in range(self._num_players) if i not in forfeited]
+        if self._board.is_forfeited(self._current_player):
+            active = self._board.active_players(self._num_players)
             if not active:
                 self._debug("[TIMER] No active players left — stopping game.")
                 self._game_active = False
@@ -2263,7 +2635,7 @@ class DiceGameScreen(Screen):
 
         if should_start:
             self._debug(f"[TIMER] Starting 10s turn timer for player {self._current_player}")
-            self._turn_timer = Clock.schedule_once(lambda dt: self._auto_pass_turn(), 10)
+            self._turn_timer = self._clock.once(lambda dt: self._auto_pass_turn(), 10)
         elif self._online:
             self._debug("[TIMER] Online - not my turn, waiting for opponent.")
         else:
@@ -2282,7 +2654,7 @@ class DiceGameScreen(Screen):
             self._turn_timer = None
 
     def _auto_roll_current(self):
-        if self._online or not self._game_active:
+        if self._online or not self._game_active or self._replay:
             return
 
         if getattr(self, "_bot_rolling", False):
@@ -2313,7 +2685,7 @@ class DiceGameScreen(Screen):
             forced_coin = self._auto_coin_for_roll(current, roll)
             if forced_coin is None:
                 forced_coin = self._auto_choose_coin(current)
-            Clock.schedule_once(
+            self._clock.once(
                 lambda dt, idx=forced_coin, who=current: self._apply_roll(roll, forced_coin_idx=idx, player_idx=who),
                 0.75,
             )
@@ -2323,15 +2695,17 @@ class DiceGameScreen(Screen):
                 if self._game_active:
                     self._debug(f"[BOT TURN] Player {current} finished roll.")
 
-            Clock.schedule_once(lambda dt: _clear_flag_and_check(), 1.0)
+            self._clock.once(lambda dt: _clear_flag_and_check(), 1.0)
 
-        Clock.schedule_once(do_roll, delay)
+        self._clock.once(do_roll, delay)
 
     def _auto_pass_turn(self):
         if not self._game_active:
             return
 
         self._debug(f"[AUTO-TURN] 10s inactivity → passing turn from player {self._current_player}")
+        if self._recorder:
+            self._recorder.record(EVENT_PASS, {"player": self._current_player})
         self._current_player = (self._current_player + 1) % self._num_players
         self._highlight_turn()
         self._start_turn_timer()
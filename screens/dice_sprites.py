@@ -0,0 +1,56 @@
+import os
+
+from kivy.core.image import Image as CoreImage
+
+from utils import render_quality
+
+FACE_PATH = "assets/dice/dice{}.png"
+# optional pre-rendered spin: one horizontal strip of square frames, a full turn
+# that ends on an upright die (the real face is swapped in on landing)
+SPIN_SHEET_PATH = "assets/dice/dice_spin.png"
+
+_faces = {}  # resolved path -> Texture (or None when the file is missing)
+_spin = {}  # resolved path -> [TextureRegion, ...] (empty when there is no sheet)
+
+
+def _load(path: str):
+    if not os.path.exists(path):
+        return None
+    try:
+        return CoreImage(path).texture
+    except Exception as e:
+        print(f"[DICE][WARN] Could not load {path}: {e}")
+        return None
+
+
+def face_texture(face: int):
+    """Texture for `face` (1-6), decoded from disk once per tier-resolved path."""
+    path = render_quality.asset(FACE_PATH.format(face))
+    if path not in _faces:
+        _faces[path] = _load(path)
+    return _faces[path]
+
+
+def spin_frames():
+    """
+    Frames of the spin sheet as regions of one texture, or [] when no sheet is
+    packaged. Showing a frame only changes the rectangle's texture coordinates;
+    the pixels are uploaded to the GPU once.
+    """
+    path = render_quality.asset(SPIN_SHEET_PATH)
+    if path not in _spin:
+        frames = []
+        sheet = _load(path)
+        if sheet is not None and sheet.height > 0:
+            size = sheet.height
+            count = max(1, sheet.width // size)
+            frames = [sheet.get_region(i * size, 0, size, size) for i in range(count)]
+        _spin[path] = frames
+    return _spin[path]
+
+
+def preload():
+    """Decode every face (and the sheet) up front so the first roll doesn't touch the disk."""
+    for face in range(1, 7):
+        face_texture(face)
+    return len(spin_frames())
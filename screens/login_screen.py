@@ -9,11 +9,10 @@ from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import Screen
 
-from utils import storage
+from utils import bootstrap, storage
 from utils.otp_utils import (
     InvalidCredentialsError,
     LegacyOtpUnavailable,
-    get_profile,
     request_login_otp,
     verify_login_with_otp,
 )
@@ -154,14 +153,6 @@ class LoginScreen(Screen):
                 token = data.get("access_token") or data.get("token")
                 user = data.get("user")
 
-                if token and not user:
-                    try:
-                        prof = get_profile(token)
-                        if isinstance(prof, dict):
-                            user = prof.get("user") or prof
-                    except Exception:
-                        pass
-
                 if not token:
                     _popup("Error", "Invalid OTP.")
                     return
@@ -170,6 +161,21 @@ class LoginScreen(Screen):
                 if isinstance(user, dict):
                     storage.set_user(user)
 
+                # profile, stakes and avatar start now; the stage joins the running
+                # prefetch, so there is nothing to wait for here
+                warm = bootstrap.prefetch(storage.get_backend_url(), token)
+
+                def keep(fut):
+                    if fut.cancelled() or fut.exception() is not None:
+                        return
+                    result = fut.result()
+                    if isinstance(result.get("user"), dict):
+                        storage.set_user(result["user"])
+                    if isinstance(result.get("stakes"), list):
+                        storage.set_stakes_cache(result["stakes"])
+
+                warm.add_done_callback(keep)
+
                 def after(*_):
                     if self.manager:
                         self.manager.current = "stage"
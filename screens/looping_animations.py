@@ -0,0 +1,97 @@
+from utils import app_lifecycle
+
+
+class LoopingAnimations:
+    """
+    Long-running (repeating) animations, grouped by the screen that owns them.
+
+    Kivy keeps a repeating Animation ticking after its screen is gone, so each
+    one is registered here with a factory. The registry watches the
+    ScreenManager: when an owner screen stops being current its animations are
+    cancelled (and `reset` puts the widget back at rest). When the screen
+    returns they are rebuilt from the factory. Everything also stops while the
+    app is paused. `stats()` reports how many are registered and running per
+    screen.
+    """
+
+    def __init__(self):
+        self._entries = {}  # owner -> {key: [widget, factory, reset, running_anim]}
+        self._manager = None
+
+    def attach(self, manager):
+        self._manager = manager
+        manager.bind(current=self._on_current)
+        app_lifecycle.register("animations", self.pause_all, lambda away: self._on_current())
+
+    def _visible(self, owner: str) -> bool:
+        return (
+                self._manager is not None
+                and self._manager.current == owner
+                and not app_lifecycle.is_paused()
+        )
+
+    # ---------- registration ----------
+    def start(self, owner: str, key: str, widget, factory, reset=None):
+        """Register (or replace) `key`; it runs now only if `owner` is the current screen."""
+        self.stop(owner, key, reset_widget=False)
+        entry = [widget, factory, reset, None]
+        self._entries.setdefault(owner, {})[key] = entry
+        if self._visible(owner):
+            self._run(entry)
+
+    def stop(self, owner: str, key: str, reset_widget: bool = True):
+        entry = self._entries.get(owner, {}).pop(key, None)
+        if entry:
+            self._halt(entry, reset_widget)
+
+    def stop_owner(self, owner: str):
+        for key in list(self._entries.get(owner, {})):
+            self.stop(owner, key)
+
+    # ---------- visibility ----------
+    def _run(self, entry):
+        widget, factory, _, anim = entry
+        if anim is None:
+            anim = factory()
+            anim.start(widget)
+            entry[3] = anim
+
+    @staticmethod
+    def _halt(entry, reset_widget: bool = True):
+        widget, _, reset, anim = entry
+        if anim is not None:
+            anim.cancel(widget)
+            entry[3] = None
+        if reset_widget and reset:
+            reset(widget)
+
+    def _on_current(self, *_):
+        for owner, entries in self._entries.items():
+            visible = self._visible(owner)
+            for entry in entries.values():
+                if visible:
+                    self._run(entry)
+                else:
+                    self._halt(entry)
+
+    def pause_all(self):
+        for entries in self._entries.values():
+            for entry in entries.values():
+                self._halt(entry)
+
+    # ---------- diagnostics ----------
+    def active_count(self) -> int:
+        return sum(1 for entries in self._entries.values() for e in entries.values() if e[3] is not None)
+
+    def stats(self) -> dict:
+        return {
+            owner: {
+                "registered": len(entries),
+                "running": sum(1 for e in entries.values() if e[3] is not None),
+            }
+            for owner, entries in self._entries.items()
+        }
+
+
+# one registry for the app; DiceApp.build() attaches it to the ScreenManager
+looping_animations = LoopingAnimations()
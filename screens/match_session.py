@@ -0,0 +1,169 @@
+import threading
+import time
+
+from kivy.clock import Clock
+
+from utils.lazy_import import available, lazy
+from utils.wire_codec import decode_message, ws_subprotocols
+
+# websocket-client is imported by the first session's socket thread, not at app start
+WEBSOCKET_OK = available("websocket")
+websocket = lazy("websocket")
+
+IDLE_PING_S = 20.0  # keepalive while no heartbeat consumer is attached (lobby wait)
+
+
+class MatchSession:
+    """
+    Live websocket for one match, independent of any screen.
+
+    The lobby opens it as soon as a match id exists, so the socket is already
+    connected (and the latest snapshot buffered) by the time the board is
+    shown. Until a consumer attaches, incoming state only replaces `snapshot`
+    and the session pings on its own every IDLE_PING_S, so idle proxies keep
+    the socket open. Afterwards every message is forwarded on the Kivy thread
+    and the consumer's heartbeat does the pinging.
+    """
+
+    def __init__(self, backend: str, token: str | None, match_id):
+        self.match_id = match_id
+        self.snapshot = None
+        self.connected = False
+        self._url = backend.replace("http", "ws") + f"/matches/ws/{match_id}"
+        self._headers = [f"Authorization: Bearer {token}"] if token else []
+        self._ws = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._ws_lock = threading.Lock()  # guards _ws between close() and the socket thread
+        self._on_event = None
+        self._on_connected = None
+        self._on_pong = None
+        self._subprotocols = ws_subprotocols()  # dropped after a refused handshake
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def start(self) -> "MatchSession":
+        if WEBSOCKET_OK and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+            threading.Thread(target=self._keepalive, args=(self._thread,), daemon=True).start()
+        return self
+
+    def close(self):
+        self.detach()
+        with self._ws_lock:
+            self._stop.set()
+            ws, self._ws = self._ws, None
+        self.connected = False
+        if ws:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        self._thread = None
+
+    def attach(self, on_event, on_connected=None, on_pong=None):
+        """Route messages to a consumer; returns the buffered snapshot (or None)."""
+        self._on_event = on_event
+        self._on_connected = on_connected
+        self._on_pong = on_pong
+        return self.snapshot
+
+    def detach(self):
+        self._on_event = None
+        self._on_connected = None
+        self._on_pong = None
+
+    def set_snapshot(self, payload):
+        """Remember the newest full state (e.g. from a lobby /matches/check poll)."""
+        if isinstance(payload, dict):
+            self.snapshot = payload
+
+    def ping(self) -> float | None:
+        """Send a timestamped ping; returns the send time, or None if the socket is not usable."""
+        sock = getattr(self._ws, "sock", None)
+        if not sock or not self.connected:
+            return None
+        sent = time.monotonic()
+        # the pong echoes this payload back, which gives the RTT
+        sock.ping(f"{sent:.6f}")
+        return sent
+
+    # ---------- socket thread ----------
+    def _keepalive(self, owner):
+        # ends with close(), or when a restart has replaced the socket thread it belongs to
+        while not self._stop.wait(IDLE_PING_S) and self._thread is owner:
+            if self._on_pong is not None:
+                continue  # the attached screen's heartbeat pings
+            try:
+                self.ping()
+            except Exception:
+                pass
+
+    def _dispatch(self, payload):
+        self.set_snapshot(payload)
+        if self._on_event:
+            self._on_event(payload)
+
+    def _set_connected(self, connected: bool):
+        self.connected = connected
+        if self._on_connected:
+            self._on_connected(connected)
+
+    def _worker(self):
+        def on_message(ws, message):
+            try:
+                subprotocol = None
+                if isinstance(message, (bytes, bytearray)) and getattr(ws, "sock", None):
+                    subprotocol = ws.sock.getsubprotocol()
+                payload = decode_message(message, subprotocol)
+                Clock.schedule_once(lambda dt: self._dispatch(payload), 0)
+            except Exception:
+                pass
+
+        def on_open(ws):
+            if self._stop.is_set():
+                # close() ran while run_forever() was still connecting
+                ws.close()
+                return
+            Clock.schedule_once(lambda dt: self._set_connected(True), 0)
+
+        def on_close(ws, *_):
+            Clock.schedule_once(lambda dt: self._set_connected(False), 0)
+
+        def on_error(ws, err):
+            if self._subprotocols and "subprotocol" in str(err).lower():
+                # the backend doesn't negotiate formats; reconnect with a plain JSON socket
+                self._subprotocols = None
+            on_close(ws)
+
+        def on_pong(ws, data):
+            Clock.schedule_once(lambda dt: self._on_pong and self._on_pong(data), 0)
+
+        while not self._stop.is_set():
+            kwargs = {"subprotocols": self._subprotocols} if self._subprotocols else {}
+            with self._ws_lock:
+                # close() may already have run; it can't see a socket created after it
+                if self._stop.is_set():
+                    break
+                ws_app = websocket.WebSocketApp(
+                    self._url,
+                    header=self._headers,
+                    on_message=on_message,
+                    on_open=on_open,
+                    on_close=on_close,
+                    on_error=on_error,
+                    on_pong=on_pong,
+                    **kwargs,
+                )
+                self._ws = ws_app
+            try:
+                # keepalive pings come from _keepalive(), then the game screen's heartbeat
+                ws_app.run_forever()
+            except Exception:
+                pass
+            if self._stop.wait(2.0):
+                break
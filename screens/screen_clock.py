@@ -0,0 +1,125 @@
+import threading
+
+from kivy.clock import Clock
+
+
+class ScreenClock:
+    """
+    Clock events and animations owned by one screen.
+
+    Everything a screen schedules goes through here, so `cancel_all()` in
+    on_leave stops it in one go and nothing from the last match fires into the
+    next one. Each cancel bumps `generation`. A worker thread captures the
+    generation before it starts and passes it back with `once(...,
+    generation=gen)`, so results that arrive after the screen was left are
+    dropped instead of scheduled.
+
+    Clock.schedule_once is thread-safe and so is this wrapper.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.generation = 0
+        self.scheduled = 0  # lifetime counters for diagnostics
+        self.cancelled = 0
+        self._events = set()
+        self._triggers = []
+        self._anims = {}  # animation -> widget
+        self._lock = threading.Lock()
+
+    # ---------- scheduling ----------
+    def once(self, callback, timeout: float = 0, generation: int | None = None):
+        """Clock.schedule_once, dropped if `generation` is stale or the screen leaves first."""
+        with self._lock:
+            gen = self.generation
+            if generation is not None and generation != gen:
+                return None
+
+            def fire(dt):
+                with self._lock:
+                    self._events.discard(ev)
+                if gen == self.generation:
+                    callback(dt)
+
+            ev = Clock.schedule_once(fire, timeout)
+            self._events.add(ev)
+            self.scheduled += 1
+            return ev
+
+    def interval(self, callback, period: float):
+        """Clock.schedule_interval that stops on the next `cancel_all()`."""
+        gen = self.generation
+
+        def tick(dt):
+            if gen != self.generation:
+                return False
+            return callback(dt)
+
+        ev = Clock.schedule_interval(tick, period)
+        with self._lock:
+            self._events.add(ev)
+            self.scheduled += 1
+        return ev
+
+    def trigger(self, callback, timeout: float = 0):
+        """Clock.create_trigger; a pending call is cancelled on leave but the trigger stays usable."""
+        ev = Clock.create_trigger(callback, timeout)
+        self._triggers.append(ev)
+        return ev
+
+    def animate(self, anim, widget):
+        """Start `anim` on `widget` and stop it on the next `cancel_all()` unless it finished."""
+
+        def done(*_):
+            self._anims.pop(anim, None)
+
+        anim.bind(on_complete=done)
+        self._anims[anim] = widget
+        anim.start(widget)
+        self.scheduled += 1
+        return anim
+
+    def cancel(self, ev):
+        if ev is None:
+            return
+        try:
+            ev.cancel()
+        except Exception:
+            pass
+        with self._lock:
+            self._events.discard(ev)
+
+    def cancel_all(self) -> int:
+        """Cancel every pending event and running animation; returns how many were live."""
+        with self._lock:
+            self.generation += 1
+            events = list(self._events)
+            self._events = set()
+        live = 0
+        for ev in events + self._triggers:
+            if getattr(ev, "is_triggered", False):
+                live += 1
+            ev.cancel()
+        anims = list(self._anims.items())
+        self._anims.clear()
+        for anim, widget in anims:
+            anim.cancel(widget)
+        live += len(anims)
+        self.cancelled += live
+        return live
+
+    # ---------- diagnostics ----------
+    def live(self) -> int:
+        with self._lock:
+            events = list(self._events)
+        events += self._triggers
+        return sum(1 for ev in events if getattr(ev, "is_triggered", False)) + len(self._anims)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "generation": self.generation,
+            "live": self.live(),
+            "scheduled": self.scheduled,
+            "cancelled": self.cancelled,
+        }
@@ -1,19 +1,16 @@
 from kivy.uix.screenmanager import Screen
-from kivy.core.audio import SoundLoader
 from kivy.properties import BooleanProperty, StringProperty
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.uix.boxlayout import BoxLayout
 from kivy.clock import Clock
-from kivy.uix.filechooser import FileChooserIconView
+from kivy.uix.scrollview import ScrollView
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
-from kivy.core.clipboard import Clipboard
 from kivy.metrics import dp
 from kivy.core.window import Window
 from kivy.app import App
-import requests
 import os
 from urllib.parse import urlencode
 from collections import OrderedDict
@@ -24,10 +21,21 @@ try:
 except Exception:
     storage = None
 
+from utils import app_lifecycle, net_telemetry, profile_outbox
+from utils.lazy_import import lazy
+from utils.otp_utils import api_headers, read_json
+from utils.retry_policy import http_get, http_post
+
+# audio providers, the file chooser and the clipboard backend load on first use
+SoundLoader = lazy("kivy.core.audio", "SoundLoader")
+FileChooserIconView = lazy("kivy.uix.filechooser", "FileChooserIconView")
+Clipboard = lazy("kivy.core.clipboard", "Clipboard")
+
 
 class SettingsScreen(WalletActionsMixin, Screen):
     music_playing = BooleanProperty(False)
     profile_image = StringProperty("assets/default.png")  # bound to KV
+    sync_status = StringProperty("")  # profile outbox state, bound to KV
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -36,6 +44,9 @@ class SettingsScreen(WalletActionsMixin, Screen):
         self._otp_payload = None
         self._cached_phone = ""
         self._phone_refresh_inflight = False
+        profile_outbox.add_listener(self._on_outbox_answer)
+        profile_outbox.add_status_listener(self._on_outbox_status)
+        app_lifecycle.register("settings", self._on_app_pause, self._on_app_resume)
 
     def on_pre_enter(self):
         if not hasattr(self, "sound"):
@@ -46,6 +57,10 @@ class SettingsScreen(WalletActionsMixin, Screen):
         # refresh wallet balance
         self.refresh_wallet_balance()
 
+        # retry any profile edits queued while offline
+        self.sync_status = profile_outbox.status_text()
+        profile_outbox.flush_async(verify=False)
+
         # preload profile picture from cached storage
         cached_user = storage.get_user() if storage else None
         if cached_user and cached_user.get("profile_image"):
@@ -61,7 +76,7 @@ class SettingsScreen(WalletActionsMixin, Screen):
 
         def worker():
             try:
-                resp = requests.get(
+                resp = http_get(
                     f"{backend}/users/me",
                     headers={"Authorization": f"Bearer {token}"},
                     timeout=10,
@@ -88,6 +103,15 @@ class SettingsScreen(WalletActionsMixin, Screen):
             self.sound.play()
             self.music_playing = True
 
+    def _on_app_pause(self):
+        # background music keeps playing otherwise
+        if self.music_playing and getattr(self, "sound", None):
+            self.sound.stop()
+
+    def _on_app_resume(self, away: float):
+        if self.music_playing and getattr(self, "sound", None):
+            self.sound.play()
+
     # ------------------ Invites ------------------
     def open_invite_dialog(self):
         token, backend = self._require_auth()
@@ -107,14 +131,15 @@ class SettingsScreen(WalletActionsMixin, Screen):
 
         def worker():
             try:
-                resp = requests.get(
+                resp = http_get(
                     f"{backend}/game/stakes",
-                    headers={"Authorization": f"Bearer {token}"},
+                    headers=api_headers(token),
                     timeout=10,
                     verify=False,
+                    stream=True,
                 )
                 resp.raise_for_status()
-                stakes = resp.json() or []
+                stakes = read_json(resp) or []
                 if storage and hasattr(storage, "set_stakes_cache"):
                     try:
                         storage.set_stakes_cache(stakes)
@@ -299,7 +324,7 @@ class SettingsScreen(WalletActionsMixin, Screen):
                             raise Exception("Missing token or backend")
 
                         with open(file_path, "rb") as f:
-                            resp = requests.post(
+                            resp = http_post(
                                 f"{backend}/users/upload-profile-image",
                                 headers={"Authorization": f"Bearer {token}"},
                                 files={"file": (os.path.basename(file_path), f, "image/jpeg")},
@@ -404,7 +429,7 @@ class SettingsScreen(WalletActionsMixin, Screen):
             fetched_phone = ""
             error_msg = ""
             try:
-                resp = requests.get(
+                resp = http_get(
                     f"{backend}/users/me",
                     headers={"Authorization": f"Bearer {token}"},
                     timeout=10,
@@ -501,7 +526,7 @@ class SettingsScreen(WalletActionsMixin, Screen):
         def worker():
             try:
                 headers = {"Authorization": f"Bearer {token}"} if token else {}
-                resp = requests.post(
+                resp = http_post(
                     f"{backend}/auth/send-otp",
                     json={"phone": phone},
                     headers=headers,
@@ -525,7 +550,7 @@ class SettingsScreen(WalletActionsMixin, Screen):
         self._run_async(worker)
 
     def _verify_payment_otp(self, phone, otp_code, backend):
-        resp = requests.post(
+        resp = http_post(
             f"{backend}/auth/verify-otp",
             json={"phone": phone, "otp": otp_code},
             timeout=10,
@@ -536,35 +561,46 @@ class SettingsScreen(WalletActionsMixin, Screen):
         return resp.json()
 
     def _submit_settings(self, payload, token, backend):
-        def worker():
+        # queue first so the edit survives a dead network; the outbox merges repeats
+        profile_outbox.enqueue("PATCH", f"{backend}/users/me", payload)
+
+        def after_flush():
+            if profile_outbox.pending():
+                Clock.schedule_once(lambda dt: self.show_popup("Offline", "Saved offline", "Will sync when online"), 0)
+
+        # joins a flush that is already running instead of sending the same edit twice
+        profile_outbox.flush_async(on_done=after_flush, token=token, verify=False)
+
+    def _on_outbox_answer(self, entry, resp):
+        """Outbox listener (flush thread): a queued profile edit got a definite answer."""
+        if not entry["url"].endswith("/users/me"):
+            return
+        if 200 <= resp.status_code < 300:
             try:
-                resp = requests.patch(
-                    f"{backend}/users/me",
-                    headers={"Authorization": f"Bearer {token}"},
-                    json=payload,
-                    timeout=10,
-                    verify=False,
-                )
-                if resp.status_code == 200:
-                    user = resp.json()
-                    if storage:
-                        storage.set_user(user)
-                    Clock.schedule_once(lambda dt: self._apply_user_inputs(user), 0)
-                    Clock.schedule_once(lambda dt: self.show_popup("Success", "Save done"), 0)
-                    Clock.schedule_once(lambda dt: self.refresh_wallet_balance(), 0)
-                else:
-                    Clock.schedule_once(
-                        lambda dt, msg=resp.text or "Unknown error": self.show_popup("Error", "Save fail", msg),
-                        0,
-                    )
-            except Exception as e:
-                Clock.schedule_once(lambda dt, msg=str(e): self.show_popup("Error", "Save fail", msg), 0)
+                user = resp.json()
+            except Exception:
+                user = None
+            if isinstance(user, dict) and storage:
+                storage.set_user(user)
+            Clock.schedule_once(lambda dt: self._apply_user_inputs(user), 0)
+            Clock.schedule_once(lambda dt: self.show_popup("Success", "Save done"), 0)
+            Clock.schedule_once(lambda dt: self.refresh_wallet_balance(), 0)
+        else:
+            Clock.schedule_once(
+                lambda dt, msg=resp.text or "Unknown error": self.show_popup("Error", "Save fail", msg),
+                0,
+            )
 
-        self._run_async(worker)
+    def _on_outbox_status(self, _status):
+        Clock.schedule_once(lambda dt: setattr(self, "sync_status", profile_outbox.status_text()), 0)
 
     def _apply_user_inputs(self, user):
         if not user:
             return
+        # unsynced edits win over the server copy until the outbox delivers them
+        queued = profile_outbox.pending_fields()
+        if queued:
+            user = dict(user, **queued)
         self._original_upi = user.get("upi_id") or ""
         self._original_paypal = user.get("paypal_id") or ""
         phone_value = self._extract_phone(user)
@@ -630,6 +666,45 @@ class SettingsScreen(WalletActionsMixin, Screen):
                 return str(value).strip()
         return ""
 
+    def show_network_stats(self):
+        """Debug view of per-endpoint latency percentiles, retries and errors, with JSON export."""
+        lines = net_telemetry.format_lines() or ["No requests recorded yet."]
+        body = Label(text="\n\n".join(lines), halign="left", valign="top", size_hint_y=None, font_size="12sp")
+        body.bind(width=lambda inst, w: setattr(inst, "text_size", (w, None)))
+        body.bind(texture_size=lambda inst, size: setattr(inst, "height", size[1]))
+        scroll = ScrollView(size_hint=(1, 1))
+        scroll.add_widget(body)
+
+        buttons = BoxLayout(size_hint_y=None, height=dp(44), spacing=dp(8))
+        export_btn = Button(text="Export JSON", background_color=(0.2, 0.6, 1, 1), color=(1, 1, 1, 1))
+        reset_btn = Button(text="Reset", background_color=(0.9, 0.6, 0.1, 1), color=(1, 1, 1, 1))
+        close_btn = Button(text="Close", background_color=(0.6, 0.2, 0.2, 1), color=(1, 1, 1, 1))
+        for btn in (export_btn, reset_btn, close_btn):
+            buttons.add_widget(btn)
+
+        layout = BoxLayout(orientation="vertical", spacing=dp(10), padding=dp(12))
+        layout.add_widget(scroll)
+        layout.add_widget(buttons)
+        popup = Popup(title="Network Stats", content=layout, size_hint=(0.92, 0.8))
+
+        def export(_):
+            try:
+                app = App.get_running_app()
+                path = os.path.join(app.user_data_dir, "net_telemetry.json") if app else None
+                Clipboard.copy(net_telemetry.export_json(path))
+                self.show_popup("Network", "Stats exported", path or "Copied to clipboard", duration=2.0)
+            except Exception as err:
+                self.show_popup("Network", "Export failed", str(err))
+
+        def reset(_):
+            net_telemetry.reset()
+            popup.dismiss()
+
+        export_btn.bind(on_release=export)
+        reset_btn.bind(on_release=reset)
+        close_btn.bind(on_release=lambda *_: popup.dismiss())
+        popup.open()
+
     def show_popup(self, title: str, message: str, detail: str | None = None, duration: float = 2.5):
         """Responsive popup that auto-closes with concise text."""
         primary = self._simple_words(message)
@@ -1,6 +1,4 @@
-import requests
 import threading
-import webbrowser
 
 from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
@@ -17,6 +15,13 @@ try:
 except Exception:
     storage = None
 
+from utils import pending_ops
+from utils.lazy_import import lazy
+from utils.otp_utils import api_headers, error_message, iter_json_items
+from utils.retry_policy import http_get, http_post
+
+webbrowser = lazy("webbrowser")
+
 
 class WalletActionsMixin:
     """Reusable wallet-related actions to keep the settings screen lean."""
@@ -52,14 +57,19 @@ class WalletActionsMixin:
                 return
 
             def worker():
+                op = pending_ops.begin(
+                    pending_ops.OP_RECHARGE,
+                    "POST",
+                    f"{backend}/wallet/recharge/create-link",
+                    {"amount": amount},
+                    {"Authorization": f"Bearer {token}"},
+                )
                 try:
-                    resp = requests.post(
-                        f"{backend}/wallet/recharge/create-link",
-                        headers={"Authorization": f"Bearer {token}"},
-                        json={"amount": amount},
-                        timeout=15,
-                        verify=False,
-                    )
+                    try:
+                        resp = pending_ops.send(op, timeout=6, deadline=15, verify=False)
+                    finally:
+                        # a payment link is only useful right now; never re-send it later
+                        pending_ops.resolve(op.key)
                     data = resp.json()
                     url = data.get("short_url")
                     if not url:
@@ -119,14 +129,32 @@ class WalletActionsMixin:
                 return
 
             def worker():
-                try:
-                    resp = requests.post(
-                        f"{backend}/wallet/withdraw/request",
-                        headers={"Authorization": f"Bearer {token}"},
-                        json={"amount": amount, "upi_id": upi_id},
-                        timeout=10,
-                        verify=False,
+                op = pending_ops.begin(
+                    pending_ops.OP_WITHDRAW,
+                    "POST",
+                    f"{backend}/wallet/withdraw/request",
+                    {"amount": amount, "upi_id": upi_id},
+                    {"Authorization": f"Bearer {token}"},
+                )
+                def still_pending(reason):
+                    # outcome unknown: the keyed request stays journaled and is confirmed later
+                    print(f"[WITHDRAW][PENDING] {reason}")
+                    pending_ops.add_listener(pending_ops.OP_WITHDRAW, self._on_withdraw_reconciled)
+                    Clock.schedule_once(
+                        lambda dt: self.show_popup("Info", "Withdraw pending", "Will confirm when online"),
+                        0,
                     )
+
+                try:
+                    try:
+                        resp = pending_ops.send(op, timeout=5, deadline=12, verify=False)
+                    except Exception as err:
+                        still_pending(err)
+                        return
+                    if resp.status_code >= 500:
+                        # send() keeps 5xx journaled; the server may still have taken it
+                        still_pending(f"HTTP {resp.status_code}")
+                        return
                     if resp.status_code == 200:
                         Clock.schedule_once(lambda dt: self.show_popup("Success", "Withdraw sent", f"₹{amount} pending"), 0)
                         Clock.schedule_once(lambda dt: self.refresh_wallet_balance(), 0)
@@ -148,17 +176,17 @@ class WalletActionsMixin:
 
         def worker():
             try:
-                resp = requests.get(
+                resp = http_get(
                     f"{backend}/wallet/history",
-                    headers={"Authorization": f"Bearer {token}"},
+                    headers=api_headers(token),
                     params={"limit": 20},
                     timeout=10,
                     verify=False,
+                    stream=True,
                 )
                 if resp.status_code != 200:
-                    raise RuntimeError(resp.text)
-                data = resp.json()
-                txs = data if isinstance(data, list) else data.get("transactions", [])
+                    raise RuntimeError(error_message(resp))
+                txs = list(iter_json_items(resp, ("item", "transactions.item"), max_items=20))
                 if not txs:
                     Clock.schedule_once(lambda dt: self.show_popup("History", "No data"), 0)
                     return
@@ -233,7 +261,7 @@ class WalletActionsMixin:
 
     def _request_wallet_link_token(self, token: str, backend: str) -> str:
         """Ask backend for a bridge token that the portal can redeem."""
-        resp = requests.post(
+        resp = http_post(
             f"{backend}/auth/wallet-link",
             headers={"Authorization": f"Bearer {token}"},
             json={"channel": "app"},
@@ -269,38 +297,46 @@ class WalletActionsMixin:
         return urlunparse(rebuilt)
 
     @staticmethod
-    def _search_wallet_url(payload) -> str:
-        def scan(node, require_wallet: bool) -> str:
+    def _search_wallet_url(payload, max_nodes: int = 2000) -> str:
+        """
+        Single iterative pass: the first URL mentioning "wallet" wins, otherwise
+        the first URL seen. Visits at most `max_nodes` nodes.
+        """
+        fallback = ""
+        stack = [payload]
+        visited = 0
+        while stack and visited < max_nodes:
+            node = stack.pop()
+            visited += 1
             if isinstance(node, str):
                 val = node.strip()
                 if val.startswith("http"):
-                    if not require_wallet or "wallet" in val.lower():
+                    if "wallet" in val.lower():
                         return val
-                return ""
-            if isinstance(node, dict):
-                for value in node.values():
-                    result = scan(value, require_wallet)
-                    if result:
-                        return result
-                return ""
-            if isinstance(node, (list, tuple, set)):
-                for value in node:
-                    result = scan(value, require_wallet)
-                    if result:
-                        return result
-                return ""
-            return ""
-
-        return scan(payload, True) or scan(payload, False) or ""
+                    fallback = fallback or val
+            elif isinstance(node, dict):
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, (list, tuple)):
+                stack.extend(reversed(node))
+        return fallback
+
+    def _on_withdraw_reconciled(self, op, resp):
+        amount = (op.body or {}).get("amount")
+        if resp.status_code == 200:
+            Clock.schedule_once(lambda dt: self.show_popup("Success", "Withdraw sent", f"₹{amount} pending"), 0)
+        else:
+            Clock.schedule_once(lambda dt: self.show_popup("Error", "Withdraw fail", error_message(resp)), 0)
+        Clock.schedule_once(lambda dt: self.refresh_wallet_balance(), 0)
 
     def refresh_wallet_balance(self):
         token, backend = self._auth_pair()
+        pending_ops.reconcile_async(kinds=pending_ops.WALLET_KINDS, verify=False)
 
         def worker():
             balance_text = "Wallet: ₹0"
             if token and backend:
                 try:
-                    resp = requests.get(
+                    resp = http_get(
                         f"{backend}/users/me",
                         headers={"Authorization": f"Bearer {token}"},
                         timeout=10,
@@ -2,25 +2,43 @@ from kivy.app import App
 from kivy.metrics import dp
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
-from kivy.uix.label import Label
 from kivy.uix.screenmanager import Screen
 from kivy.clock import Clock
-from kivy.graphics import RoundedRectangle, Color
-from kivy.properties import StringProperty, BooleanProperty
+from kivy.properties import StringProperty, BooleanProperty, NumericProperty
 from kivy.core.window import Window
-import threading, requests
+from collections import OrderedDict
 
 try:
     from utils import storage
 except Exception:
     storage = None
 
+from screens.screen_clock import ScreenClock
+from utils import bootstrap, pending_ops, profile_outbox
+
+
+class StageButton(Button):
+    """One stake row; the kv rule draws its background and colours it from `selected`."""
+
+    selected = BooleanProperty(False)
+    stake_amount = NumericProperty(0)
+    stage_label = StringProperty("")
+
 
 class StageScreen(Screen):
     profile_image = StringProperty("assets/default.png")
     player_description = StringProperty("Describe yourself")
     is_logging_out = BooleanProperty(False)
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._clock = ScreenClock("stage")
+        self._stakes = []
+        self._stage_rows = OrderedDict()  # (players, amount, label) -> StageButton, kept across visits
+        self._stage_buttons = []
+        self._settings_btn = None
+        self._mode_bound = False
+
     def _scale(self, base: float) -> float:
         w, h = Window.size
         scale_factor = min(w / 1080, h / 2400)
@@ -42,7 +60,11 @@ class StageScreen(Screen):
         return "You"
 
     def on_pre_enter(self, *_):
-        self._fetch_wallet_from_backend()
+        if not self._mode_bound:
+            app = App.get_running_app()
+            if app is not None:
+                app.bind(selected_mode=self._on_mode_changed)
+                self._mode_bound = True
 
         me = self._current_player_name()
         name_lbl = self.ids.get("welcome_label")
@@ -57,179 +79,162 @@ class StageScreen(Screen):
         if pic:
             pic.source = self.profile_image
 
-        self._load_stakes_from_backend()
-
-        token = storage.get_token() if storage else None
-        backend = storage.get_backend_url() if storage else None
-        if token and backend:
-            def worker():
-                try:
-                    resp = requests.post(
-                        f"{backend}/matches/abandon",
-                        headers={"Authorization": f"Bearer {token}"},
-                        timeout=10,
-                        verify=False,
-                    )
-                    print(f"[INFO] Auto-abandon response: {resp.status_code} {resp.text}")
-                except Exception as e:
-                    print(f"[WARN] Auto-abandon failed: {e}")
-            threading.Thread(target=worker, daemon=True).start()
-
-    def _load_stakes_from_backend(self):
+        # show the last known list at once; the bootstrap below only patches what changed
+        stages_box = self.ids.get("stages_box")
+        cached = storage.get_stakes_cache() if storage else None
+        if stages_box and cached:
+            self._populate_stages(stages_box, cached)
+
+        self._start_bootstrap()
+        # settle forfeits and wallet requests whose outcome was unknown when the network dropped;
+        # rolls belong to a match turn and are only ever re-sent by the game screen
+        pending_ops.reconcile_async(kinds=pending_ops.STAGE_KINDS, verify=False)
+        profile_outbox.flush_async(verify=False)
+
+    def on_leave(self, *_):
+        # a late bootstrap result is re-fetched on the next entry anyway
+        self._clock.cancel_all()
+
+    def _start_bootstrap(self):
+        """Profile, stakes and auto-abandon in parallel; the results land in one UI batch."""
         token = storage.get_token() if storage else None
         backend = storage.get_backend_url() if storage else None
-        stages_box = self.ids.get("stages_box")
-        if not backend or not stages_box:
+        if not backend:
             return
+        gen = self._clock.generation
 
-        def clear_box():
-            keep_title = []
-            for child in list(stages_box.children):
-                if isinstance(child, Label) and child.text == "Select Game Stage":
-                    keep_title.append(child)
-            stages_box.clear_widgets()
-            for child in reversed(keep_title):
-                stages_box.add_widget(child)
+        def done(result):
+            self._clock.once(lambda dt: self._apply_bootstrap(result), 0, generation=gen)
 
-        def worker():
-            try:
-                resp = requests.get(
-                    f"{backend}/game/stakes",
-                    headers={"Authorization": f"Bearer {token}"} if token else {},
-                    timeout=10,
-                    verify=False,
-                )
-                if resp.status_code == 200:
-                    stakes = resp.json()
-                    Clock.schedule_once(
-                        lambda dt: self._populate_stages(stages_box, stakes), 0
-                    )
-            except Exception as e:
-                print(f"[ERR] Stakes fetch failed: {e}")
+        bootstrap.fetch_async(backend, token, done)
 
-        clear_box()
-        threading.Thread(target=worker, daemon=True).start()
+    def _apply_bootstrap(self, result):
+        for name, err in (result.get("errors") or {}).items():
+            print(f"[ERR] Bootstrap {name} failed: {err}")
 
-    def _populate_stages(self, stages_box, stakes):
-        self._stage_buttons = []
-        btn_width = self._scale(220)
-        btn_height = self._scale(50)
-        fnt = self._font(18)
+        user = result.get("user")
+        if isinstance(user, dict):
+            if storage:
+                storage.set_user(user)
+            name = (user.get("name") or "").strip() or user.get("phone") or "Player"
+            self._update_wallet_label(user.get("wallet_balance", 0))
+            self._update_name_label(name)
+            self._apply_description_payload(user)
+            self._show_avatar(result.get("avatar"), user.get("profile_image"))
+
+        stakes = result.get("stakes")
+        stages_box = self.ids.get("stages_box")
+        if stages_box and isinstance(stakes, list):
+            self._populate_stages(stages_box, stakes)
+        print(f"[INFO] Stage bootstrap in {result.get('elapsed_ms')} ms (composite={result.get('composite')})")
+
+    def _show_avatar(self, local, picture):
+        """Show the cached copy, or keep the current picture until the download lands."""
+        if local or not str(picture or "").startswith(("http://", "https://")):
+            self.profile_image = local or picture or "assets/default.png"
+            self._update_profile_pic(self.profile_image)
+            return
+        gen = self._clock.generation
 
-        app = App.get_running_app()
-        selected_mode = getattr(app, "selected_mode", 2)
+        def landed(path):
+            def apply(dt):
+                self.profile_image = path or picture
+                self._update_profile_pic(self.profile_image)
+
+            self._clock.once(apply, 0, generation=gen)
+
+        bootstrap.avatar_async(picture, landed)
+
+    def _stage_rows_for_mode(self, stakes, mode: int):
+        """[(key, label, amount)] for the stakes shown in `mode`, in backend order."""
+        rows = []
+        seen = set()
+        for stake in stakes or []:
+            try:
+                players = int(stake.get("players", 2))
+            except Exception:
+                players = 2
+            if players != int(mode):
+                continue
+            amount = stake.get("stake_amount", 0)
+            label = stake.get("label", f"₹{amount}")
+            key = (players, amount, label)
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append((key, label, amount))
+        return rows
 
+    def _populate_stages(self, stages_box, stakes):
+        """
+        Diff the stage buttons against `stakes`: unchanged rows are kept as-is,
+        missing ones are created and stale ones removed. Widgets and their
+        canvases are reused across visits and mode switches.
+        """
+        self._stakes = stakes or []
         if storage and hasattr(storage, "set_stakes_cache"):
             try:
                 storage.set_stakes_cache(stakes)
             except Exception:
                 pass
 
-        for stake in stakes:
-            players = int(stake.get("players", 2))
-            if players != int(selected_mode):
-                continue
-
-            label = stake.get("label", f"₹{stake.get('stake_amount', 0)}")
-            amount = stake.get("stake_amount", 0)
+        app = App.get_running_app()
+        rows = self._stage_rows_for_mode(self._stakes, getattr(app, "selected_mode", 2))
+        btn_size = (self._scale(220), self._scale(50))
+        fnt = self._font(18)
 
-            btn = Button(
-                text=label,
+        wanted = [key for key, _, _ in rows]
+        for key in [k for k in self._stage_rows if k not in wanted]:
+            btn = self._stage_rows.pop(key)
+            if btn.parent:
+                btn.parent.remove_widget(btn)
+
+        for key, label, amount in rows:
+            btn = self._stage_rows.get(key)
+            if btn is None:
+                btn = StageButton(text=label, stake_amount=amount, stage_label=label)
+                btn.bind(on_release=self._on_stage_pressed)
+                self._stage_rows[key] = btn
+            if tuple(btn.size) != btn_size:
+                btn.size = btn_size
+            if btn.font_size != fnt:
+                btn.font_size = fnt
+
+        if self._settings_btn is None:
+            self._settings_btn = Button(
+                text="Settings",
                 size_hint=(None, None),
-                size=(btn_width, btn_height),
-                font_size=fnt,
-                color=(1, 1, 1, 1),
                 background_normal="",
-                background_color=(0, 0, 0, 0),
+                background_color=(0.2, 0.2, 0.2, 1),
+                color=(1, 1, 1, 1),
                 pos_hint={"center_x": 0.5},
             )
-            with btn.canvas.before:
-                Color(1, 0.5, 0, 1)
-                btn._bg = RoundedRectangle(pos=btn.pos, size=btn.size, radius=[12])
-            btn.bind(pos=lambda inst, val: setattr(inst._bg, "pos", inst.pos))
-            btn.bind(size=lambda inst, val: setattr(inst._bg, "size", inst.size))
-
-            # Pass BOTH amount and label so we know if it's ROBOTS Army
-            btn.bind(
-                on_release=lambda inst, amt=amount, lbl=label: (
-                    self.select_stage(amt, lbl),
-                    self._highlight_selected(inst),
-                )
-            )
+            self._settings_btn.bind(on_release=lambda _: self.go_to_settings())
+        self._settings_btn.size = btn_size
+        self._settings_btn.font_size = fnt
 
-            stages_box.add_widget(btn)
-            self._stage_buttons.append(btn)
-
-        btn_settings = Button(
-            text="Settings",
-            size_hint=(None, None),
-            size=(btn_width, btn_height),
-            font_size=fnt,
-            background_normal="",
-            background_color=(0.2, 0.2, 0.2, 1),
-            color=(1, 1, 1, 1),
-            pos_hint={"center_x": 0.5},
-        )
-        btn_settings.bind(on_release=lambda _: self.go_to_settings())
-        stages_box.add_widget(btn_settings)
+        # re-parent only when the order actually changed (BoxLayout children are reversed)
+        ordered = [self._stage_rows[key] for key in wanted] + [self._settings_btn]
+        if list(reversed(stages_box.children)) != ordered:
+            stages_box.clear_widgets()
+            for widget in ordered:
+                stages_box.add_widget(widget)
+        self._stage_buttons = ordered[:-1]
 
-    def _highlight_selected(self, selected_btn):
-        for btn in self._stage_buttons:
-            btn.canvas.before.clear()
-            with btn.canvas.before:
-                if btn is selected_btn:
-                    Color(0.9, 0.3, 0, 1)
-                else:
-                    Color(1, 0.5, 0, 1)
-                btn._bg = RoundedRectangle(pos=btn.pos, size=btn.size, radius=[12])
-            btn.bind(pos=lambda inst, val: setattr(inst._bg, "pos", inst.pos))
-            btn.bind(size=lambda inst, val: setattr(inst._bg, "size", inst.size))
+    def _on_stage_pressed(self, btn):
+        # Pass BOTH amount and label so we know if it's ROBOTS Army
+        self.select_stage(btn.stake_amount, btn.stage_label)
+        self._highlight_selected(btn)
 
-    def _fetch_wallet_from_backend(self):
-        token = storage.get_token() if storage else None
-        backend = storage.get_backend_url() if storage else None
-        if not (token and backend):
-            return
+    def _on_mode_changed(self, *_):
+        stages_box = self.ids.get("stages_box")
+        if stages_box and self._stakes:
+            self._populate_stages(stages_box, self._stakes)
 
-        def worker():
-            try:
-                resp = requests.get(
-                    f"{backend}/users/me",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
-                    verify=False,
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    desc = self._extract_description(data)
-                    if desc and not data.get("description"):
-                        data["description"] = desc
-                    storage.set_user(data)
-                    balance = data.get("wallet_balance", 0)
-
-                    name = (data.get("name") or "").strip()
-                    if not name:
-                        name = data.get("phone") or "Player"
-
-                    pic_url = data.get("profile_image") or "assets/default.png"
-                    self.profile_image = pic_url
-                    Clock.schedule_once(
-                        lambda dt: self._update_wallet_label(balance), 0
-                    )
-                    Clock.schedule_once(lambda dt: self._update_name_label(name), 0)
-                    Clock.schedule_once(
-                        lambda dt: self._update_profile_pic(pic_url), 0
-                    )
-                    Clock.schedule_once(
-                        lambda dt, payload=data: self._apply_description_payload(payload),
-                        0,
-                    )
-                    if not desc:
-                        self._fetch_description_from_backend()
-            except Exception as e:
-                print(f"[ERR] Wallet fetch failed: {e}")
-
-        threading.Thread(target=worker, daemon=True).start()
+    def _highlight_selected(self, selected_btn):
+        # colour comes from StageButton.selected in kv; no canvas is rebuilt
+        for btn in self._stage_buttons:
+            btn.selected = btn is selected_btn
 
     def _update_wallet_label(self, balance: float):
         lbl = self.ids.get("wallet_label")
@@ -261,55 +266,13 @@ class StageScreen(Screen):
 
     @staticmethod
     def _extract_description(payload) -> str:
-        if not isinstance(payload, dict):
-            return ""
-        for key in ("description", "player_description", "profile_description", "bio", "about"):
-            val = payload.get(key)
-            if isinstance(val, str) and val.strip():
-                return val.strip()
-        return ""
+        return bootstrap.extract_description(payload)
 
     def _set_player_description(self, description: str | None):
         clean = (description or "").strip() if isinstance(description, str) else ""
         fallback = "Describe yourself"
         self.player_description = clean or fallback
 
-    def _fetch_description_from_backend(self):
-        token = storage.get_token() if storage else None
-        backend = storage.get_backend_url() if storage else None
-        if not (backend and token):
-            return
-
-        def worker():
-            headers = {"Authorization": f"Bearer {token}"} if token else {}
-            desc_text = ""
-            for path in ("/users/me/profile", "/users/me"):
-                try:
-                    resp = requests.get(
-                        f"{backend}{path}",
-                        headers=headers,
-                        timeout=10,
-                        verify=False,
-                    )
-                    if resp.status_code != 200:
-                        continue
-                    payload = resp.json()
-                    desc_text = self._extract_description(payload)
-                    if desc_text:
-                        if storage:
-                            cached = storage.get_user() or {}
-                            cached["description"] = desc_text
-                            storage.set_user(cached)
-                        Clock.schedule_once(
-                            lambda dt, txt=desc_text: self._set_player_description(txt),
-                            0,
-                        )
-                        return
-                except Exception as err:
-                    print(f"[WARN] Description fetch failed ({path}): {err}")
-
-        threading.Thread(target=worker, daemon=True).start()
-
     def select_stage(self, amount: int, label: str):
         app = App.get_running_app()
         mode = getattr(app, "selected_mode", 2)
@@ -371,6 +334,7 @@ class StageScreen(Screen):
         def perform_logout(_dt):
             if storage:
                 storage.clear_all()
+            bootstrap.invalidate()
 
             app = App.get_running_app()
             for attr in ("user_token", "user_id", "selected_stake"):
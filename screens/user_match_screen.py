@@ -1,5 +1,4 @@
 import threading
-import requests
 import random
 
 from kivy.uix.screenmanager import Screen
@@ -17,6 +16,26 @@ try:
 except Exception:
     storage = None
 
+from screens.match_session import WEBSOCKET_OK, MatchSession
+from screens.looping_animations import looping_animations
+from screens.screen_clock import ScreenClock
+from utils import app_lifecycle, render_quality
+from utils.retry_policy import http_get, http_post
+from utils.wire_codec import decode_response, match_headers
+
+
+SPIN_PERIOD = 0.5  # seconds per portrait turn
+SPIN_STEP = 1 / 30.0  # spinner update rate; half the frame rate is plenty for a blur of a portrait
+
+
+def _full_opacity(widget):
+    widget.opacity = 1
+
+
+def _zero_angles(screen):
+    screen.p2_angle = 0
+    screen.p3_angle = 0
+
 
 class UserMatchScreen(Screen):
     # ---------- helpers ----------
@@ -60,10 +79,8 @@ class UserMatchScreen(Screen):
 
     _stop_polling = False
     _poll_event = None
-    _rotate_event = None
     _p2_rotating = BooleanProperty(False)
     _p3_rotating = BooleanProperty(False)
-    _pulse_anims = []
     _bot_cache = None
     _last_poll_data = {}
     _popup_timer = None  # kept for safety but NOT USED anymore
@@ -71,21 +88,27 @@ class UserMatchScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._back_button = None
+        self._match_session = None  # socket opened while the match forms, handed to the game screen
+        self._clock = ScreenClock("usermatch")
+        self._spinner_key = ()  # angle properties the running spinner animates
+        self.bind(
+            _p2_rotating=self._update_spinner,
+            _p3_rotating=self._update_spinner,
+            selected_mode=self._update_spinner,
+        )
+        app_lifecycle.register("usermatch", self._on_app_pause, self._on_app_resume)
         Clock.schedule_once(self._ensure_back_button, 0)
 
     # -------------------------
     # Lifecycle
     # -------------------------
     def on_pre_enter(self, *_):
-        if not self._rotate_event:
-            self._rotate_event = Clock.schedule_interval(self._rotate_tick, 1 / 60.0)
-        Clock.schedule_once(lambda dt: self._apply_pulse_anims(), 0)
+        self._update_spinner()
+        self._clock.once(lambda dt: self._apply_pulse_anims(), 0)
         self._ensure_back_button()
 
     def on_leave(self, *_):
-        if self._rotate_event:
-            self._rotate_event.cancel()
-            self._rotate_event = None
+        self._stop_spinner()
         if self._poll_event:
             try:
                 self._poll_event.cancel()
@@ -94,21 +117,74 @@ class UserMatchScreen(Screen):
             self._poll_event = None
         self._stop_polling = True
         self._stop_pulse_anims()
+        self._close_match_session()
+        self._clock.cancel_all()
         self._p2_rotating = False
         self._p3_rotating = False
-        self.p2_angle = 0
-        self.p3_angle = 0
         self._bot_cache = None
 
+    # -------------------------
+    # App pause / resume
+    # -------------------------
+    def _on_app_pause(self):
+        """Backgrounded while searching: stop polling and the socket."""
+        if not (self.manager and self.manager.current == self.name):
+            return
+        if self._poll_event:
+            self._poll_event.cancel()
+            self._poll_event = None
+        # the spinner and label pulses are paused by the animation registry
+        self._close_match_session()
+
+    def _on_app_resume(self, away: float):
+        if not (self.manager and self.manager.current == self.name):
+            return
+        if self._stop_polling:
+            return
+        # one immediate check catches a match that became ready while we were away
+        self._clock.once(lambda dt: self._poll_match_ready(), 0)
+        self._poll_event = self._clock.interval(lambda dt: self._poll_match_ready(), 2)
+        token = storage.get_token() if storage else None
+        backend = storage.get_backend_url() if storage else None
+        match_id = storage.get_current_match() if storage else None
+        if token and backend and match_id:
+            self._open_match_session(backend, token, match_id)
+
     # -------------------------
     # Rotation driver
     # -------------------------
-    def _rotate_tick(self, dt):
-        delta_deg = 360 * dt * 2
+    def _update_spinner(self, *_):
+        """
+        One repeating Animation turns every searching portrait. The animation
+        registry runs it only while this screen is shown; it is rebuilt only
+        when the set of spinning portraits changes.
+        """
+        key = []
         if self._p2_rotating:
-            self.p2_angle = (self.p2_angle + delta_deg) % 360
+            key.append("p2_angle")
         if self.selected_mode == 3 and self._p3_rotating:
-            self.p3_angle = (self.p3_angle + delta_deg) % 360
+            key.append("p3_angle")
+        key = tuple(key)
+        if key == self._spinner_key:
+            return
+        self._stop_spinner()
+        if not key:
+            return
+
+        def spin():
+            # a full turn, then a zero-length snap back to 0 so `repeat` keeps spinning
+            anim = Animation(d=SPIN_PERIOD, step=SPIN_STEP, **{name: 360 for name in key})
+            anim += Animation(d=0, **{name: 0 for name in key})
+            anim.repeat = True
+            return anim
+
+        looping_animations.start(self.name, "spinner", self, spin, reset=_zero_angles)
+        self._spinner_key = key
+
+    def _stop_spinner(self):
+        looping_animations.stop(self.name, "spinner")
+        self._spinner_key = ()
+        _zero_angles(self)
 
     def _ensure_back_button(self, *_):
         if self._back_button:
@@ -134,6 +210,7 @@ class UserMatchScreen(Screen):
                 pass
             self._poll_event = None
         self._stop_pulse_anims()
+        self._close_match_session()
         self._p2_rotating = False
         self._p3_rotating = False
         if storage and hasattr(storage, "set_current_match"):
@@ -173,7 +250,7 @@ class UserMatchScreen(Screen):
         self.p2_angle = 0
         self.p3_angle = 0
 
-        Clock.schedule_once(lambda dt: self._apply_pulse_anims(), 0)
+        self._clock.once(lambda dt: self._apply_pulse_anims(), 0)
 
         token = storage.get_token() if storage else None
         backend = storage.get_backend_url() if storage else None
@@ -184,13 +261,13 @@ class UserMatchScreen(Screen):
         def worker():
             try:
                 payload = {"stake_amount": self.selected_amount, "num_players": self.selected_mode}
-                resp = requests.post(
+                resp = http_post(
                     f"{backend}/matches/create",
-                    headers={"Authorization": f"Bearer {token}"},
+                    headers=match_headers(token),
                     json=payload, timeout=10, verify=False,
                 )
                 if resp.status_code == 200:
-                    data = resp.json()
+                    data = decode_response(resp)
                     match_id = data.get("match_id")
                     if storage:
                         ids_payload = data.get("player_ids")
@@ -204,6 +281,8 @@ class UserMatchScreen(Screen):
                         storage.set_stake_amount(self.selected_amount)
                         storage.set_num_players(self.selected_mode)
                         storage.set_player_names(local_player_name, None, None)
+                    if match_id:
+                        self._clock.once(lambda dt: self._open_match_session(backend, token, match_id), 0)
                 else:
                     print(f"[ERR] Match create failed: {resp.status_code} {resp.text}")
             except Exception as e:
@@ -213,32 +292,43 @@ class UserMatchScreen(Screen):
 
         if self._poll_event:
             self._poll_event.cancel()
-        self._poll_event = Clock.schedule_interval(lambda dt: self._poll_match_ready(), 2)
+        self._poll_event = self._clock.interval(lambda dt: self._poll_match_ready(), 2)
+
+    def _open_match_session(self, backend, token, match_id):
+        """Connect the match socket while players are still joining."""
+        if self._stop_polling or not WEBSOCKET_OK:
+            return
+        if self._match_session and self._match_session.match_id == match_id:
+            return
+        self._close_match_session()
+        self._match_session = MatchSession(backend, token, match_id).start()
+
+    def _close_match_session(self):
+        if self._match_session:
+            self._match_session.close()
+            self._match_session = None
 
     # -------------------------
     # Pulse "Searching..."
     # -------------------------
     def _apply_pulse_anims(self):
         self._stop_pulse_anims()
+        if not render_quality.setting("pulses"):
+            return
+
+        def pulse():
+            anim = (Animation(opacity=0.35, duration=0.4) + Animation(opacity=1.0, duration=0.4))
+            anim.repeat = True
+            return anim
+
         for lbl_id in ("p2_name", "p3_name"):
             lbl = self.ids.get(lbl_id)
             if lbl and "Searching" in (lbl.text or ""):
-                anim = (Animation(opacity=0.35, duration=0.4) + Animation(opacity=1.0, duration=0.4))
-                anim.repeat = True
-                anim.start(lbl)
-                self._pulse_anims.append(anim)
+                looping_animations.start(self.name, lbl_id, lbl, pulse, reset=_full_opacity)
 
     def _stop_pulse_anims(self):
-        for anim in self._pulse_anims:
-            try:
-                anim.stop_all()
-            except Exception:
-                pass
-        self._pulse_anims.clear()
         for lbl_id in ("p2_name", "p3_name"):
-            lbl = self.ids.get(lbl_id)
-            if lbl:
-                lbl.opacity = 1
+            looping_animations.stop(self.name, lbl_id)
 
     # -------------------------
     # OFFLINE BOT MODE (ROBOTS Army)
@@ -251,6 +341,7 @@ class UserMatchScreen(Screen):
         ]
 
         print("[INFO] ROBOTS Army → offline bot mode")
+        self._close_match_session()
 
         self._stop_polling = True
         if self._poll_event:
@@ -321,6 +412,11 @@ class UserMatchScreen(Screen):
             turn = int(ids_or_turn) if ids_or_turn is not None else int(data.get("turn") or 0)
 
         game = self.manager.get_screen("dicegame")
+        session, self._match_session = self._match_session, None
+        if session and data.get("match_id") is not None and str(session.match_id) == str(data.get("match_id")):
+            game.adopt_match_session(session)
+        elif session:
+            session.close()
         if self.selected_mode == 2:
             game.set_stage_and_players(self.selected_amount, players[0], players[1], match_id=data.get("match_id"))
         else:
@@ -336,17 +432,17 @@ class UserMatchScreen(Screen):
                 my_idx = self._resolve_my_index_from_payload(data, trusted=True)
             storage.set_my_player_index(my_idx if my_idx is not None else 0)
 
-        Clock.schedule_once(lambda dt: game._place_coins_near_portraits(), 0.15)
+        game._clock.once(lambda dt: game._place_coins_near_portraits(), 0.15)
         self.manager.current = "dicegame"
 
         if hasattr(storage, "set_initial_turn"):
             storage.set_initial_turn(int(turn))
         if hasattr(game, "sync_initial_turn"):
-            Clock.schedule_once(lambda dt: game.sync_initial_turn(turn), 0.2)
+            game._clock.once(lambda dt: game.sync_initial_turn(turn), 0.2)
         if hasattr(game, "_screen_ready"):
             try:
                 setattr(game, "_screen_ready", False)
-                Clock.schedule_once(lambda dt: setattr(game, "_screen_ready", True), 0.3)
+                game._clock.once(lambda dt: setattr(game, "_screen_ready", True), 0.3)
             except Exception:
                 pass
 
@@ -362,15 +458,17 @@ class UserMatchScreen(Screen):
         if not (token and backend and match_id):
             return
         try:
-            resp = requests.get(
+            resp = http_get(
                 f"{backend}/matches/check",
-                headers={"Authorization": f"Bearer {token}"},
+                headers=match_headers(token),
                 params={"match_id": match_id},
                 timeout=10, verify=False,
             )
             if resp.status_code == 200:
-                data = resp.json()
+                data = decode_response(resp)
                 self._last_poll_data = data
+                if self._match_session and self._match_session.match_id == match_id:
+                    self._match_session.set_snapshot(data)
                 if storage:
                     ids_payload = data.get("player_ids")
                     if isinstance(ids_payload, (list, tuple)):
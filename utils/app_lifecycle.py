@@ -0,0 +1,59 @@
+"""
+App-wide pause/resume coordination.
+
+Screens and the app register a pair of callbacks here; DiceApp.on_pause and
+on_resume fan out to them. On pause every participant stops its sockets,
+polls, heartbeats, timers and looping animations, so a backgrounded app
+uses (almost) no CPU, battery or data. On resume participants restart in
+reverse order and take a single catch-up snapshot instead of replaying
+whatever piled up while the app was away.
+
+Callbacks run on the Kivy thread. `on_resume(away)` receives the number of
+seconds the app spent paused.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+_participants: "OrderedDict[str, tuple]" = OrderedDict()
+_paused_at: Optional[float] = None
+
+
+def register(name: str, on_pause: Callable[[], None], on_resume: Callable[[float], None]):
+    """Add (or replace) a participant; `name` keeps re-registration idempotent."""
+    _participants[name] = (on_pause, on_resume)
+
+
+def unregister(name: str):
+    _participants.pop(name, None)
+
+
+def is_paused() -> bool:
+    return _paused_at is not None
+
+
+def pause():
+    global _paused_at
+    if _paused_at is not None:
+        return
+    _paused_at = time.monotonic()
+    for name, (on_pause, _) in list(_participants.items()):
+        try:
+            on_pause()
+        except Exception as e:
+            print(f"[LIFECYCLE][ERR] pause {name}: {e}")
+
+
+def resume():
+    global _paused_at
+    if _paused_at is None:
+        return
+    away = time.monotonic() - _paused_at
+    _paused_at = None
+    print(f"[LIFECYCLE] resumed after {away:.1f}s")
+    for name, (_, on_resume) in reversed(list(_participants.items())):
+        try:
+            on_resume(away)
+        except Exception as e:
+            print(f"[LIFECYCLE][ERR] resume {name}: {e}")
@@ -0,0 +1,224 @@
+"""
+Compact board state for the dice game.
+
+Every coin position, spawn flag, finished counter and forfeit of a match is
+packed into one integer, so snapshots are copied, compared and diffed without
+allocating nested lists.
+
+Bit layout (low → high):
+  0-23   coin positions, 4 bits per coin, stored as position + 1 (0 = off board)
+  24-29  spawned flags, 1 bit per coin
+  30-35  finished coin counters, 2 bits per player
+  36-38  forfeit flags, 1 bit per player
+"""
+
+from typing import List, Optional, Tuple
+
+MAX_PLAYERS = 3
+COINS_PER_PLAYER = 2
+NO_POSITION = -1
+
+_COIN_SLOTS = MAX_PLAYERS * COINS_PER_PLAYER
+_POS_BITS = 4
+_POS_MASK = (1 << _POS_BITS) - 1
+POSITIONS_MASK = (1 << (_POS_BITS * _COIN_SLOTS)) - 1
+
+_SPAWN_SHIFT = _POS_BITS * _COIN_SLOTS
+_FINISHED_SHIFT = _SPAWN_SHIFT + _COIN_SLOTS
+_FINISHED_BITS = 2
+_FINISHED_MASK = (1 << _FINISHED_BITS) - 1
+_FORFEIT_SHIFT = _FINISHED_SHIFT + _FINISHED_BITS * MAX_PLAYERS
+
+# board diff kinds
+COIN_SPAWN = "spawn"
+COIN_MOVE = "move"
+COIN_HOME = "home"
+
+# signature layout: positions | roll (3 bits) | turn + 1 (2 bits)
+_SIG_ROLL_SHIFT = _SPAWN_SHIFT
+_SIG_TURN_SHIFT = _SIG_ROLL_SHIFT + 3
+
+
+def _slot(player_idx: int, coin_idx: int) -> int:
+    return player_idx * COINS_PER_PLAYER + coin_idx
+
+
+def _to_position(value) -> int:
+    try:
+        pos = int(value) if value is not None else NO_POSITION
+    except (TypeError, ValueError):
+        return NO_POSITION
+    if pos < NO_POSITION or pos >= _POS_MASK:
+        return NO_POSITION
+    return pos
+
+
+def pack_positions(positions) -> int:
+    """
+    Pack backend positions into the positions field.
+    Accepts nested ([[c0, c1], ...]) or legacy flat ([p0, p1, ...]) lists.
+    """
+    bits = 0
+    if not isinstance(positions, (list, tuple)):
+        return bits
+    for player_idx, val in enumerate(positions[:MAX_PLAYERS]):
+        if isinstance(val, (list, tuple)) and len(val) >= COINS_PER_PLAYER:
+            coins = val
+        else:
+            coins = (val, None)
+        for coin_idx in range(COINS_PER_PLAYER):
+            pos = _to_position(coins[coin_idx])
+            bits |= (pos + 1) << (_slot(player_idx, coin_idx) * _POS_BITS)
+    return bits
+
+
+def state_signature(positions_bits: int, roll, turn) -> int:
+    """Single-integer signature of (positions, last roll, turn) for duplicate filtering."""
+    try:
+        roll_val = int(roll or 0) & 0x7
+    except (TypeError, ValueError):
+        roll_val = 0
+    try:
+        turn_val = (int(turn) + 1) & 0x3 if turn is not None else 0
+    except (TypeError, ValueError):
+        turn_val = 0
+    return (positions_bits & POSITIONS_MASK) | (roll_val << _SIG_ROLL_SHIFT) | (turn_val << _SIG_TURN_SHIFT)
+
+
+def board_diff(old_bits: int, new_bits: int) -> List[Tuple[str, int, int, int, int]]:
+    """
+    Minimal set of coin changes between two packed boards.
+    Returns (kind, player, coin, old_pos, new_pos) with kind COIN_SPAWN, COIN_MOVE or COIN_HOME.
+    """
+    changes = []
+    diff = (new_bits ^ old_bits) & POSITIONS_MASK
+    slot = 0
+    while diff:
+        if diff & _POS_MASK:
+            player_idx, coin_idx = divmod(slot, COINS_PER_PLAYER)
+            shift = slot * _POS_BITS
+            old_pos = ((old_bits >> shift) & _POS_MASK) - 1
+            new_pos = ((new_bits >> shift) & _POS_MASK) - 1
+            if new_pos < 0:
+                kind = COIN_HOME
+            elif old_pos < 0:
+                kind = COIN_SPAWN
+            else:
+                kind = COIN_MOVE
+            changes.append((kind, player_idx, coin_idx, old_pos, new_pos))
+        diff >>= _POS_BITS
+        slot += 1
+    return changes
+
+
+class BoardState:
+    """Mutable board snapshot backed by a single packed integer."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BoardState) and other.bits == self.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"BoardState(positions={self.positions_list()}, bits={self.bits:#x})"
+
+    def copy(self) -> "BoardState":
+        return BoardState(self.bits)
+
+    def reset(self):
+        self.bits = 0
+
+    # ---- positions ----
+    @property
+    def positions_bits(self) -> int:
+        return self.bits & POSITIONS_MASK
+
+    def position(self, player_idx: int, coin_idx: int) -> int:
+        shift = _slot(player_idx, coin_idx) * _POS_BITS
+        return ((self.bits >> shift) & _POS_MASK) - 1
+
+    def set_position(self, player_idx: int, coin_idx: int, pos: int):
+        shift = _slot(player_idx, coin_idx) * _POS_BITS
+        value = _to_position(pos) + 1
+        self.bits = (self.bits & ~(_POS_MASK << shift)) | (value << shift)
+
+    def place(self, player_idx: int, coin_idx: int, pos: int):
+        """Set a coin's position and derive its spawned flag from it."""
+        self.set_position(player_idx, coin_idx, pos)
+        self.set_spawned(player_idx, coin_idx, pos >= 0)
+
+    def set_positions_bits(self, positions_bits: int):
+        """Replace all positions, syncing spawned flags to on-board coins."""
+        positions_bits &= POSITIONS_MASK
+        spawned = 0
+        for slot in range(_COIN_SLOTS):
+            if (positions_bits >> (slot * _POS_BITS)) & _POS_MASK:
+                spawned |= 1 << slot
+        keep = self.bits & ~(POSITIONS_MASK | (((1 << _COIN_SLOTS) - 1) << _SPAWN_SHIFT))
+        self.bits = keep | positions_bits | (spawned << _SPAWN_SHIFT)
+
+    def positions_list(self) -> List[List[int]]:
+        return [
+            [self.position(p, c) for c in range(COINS_PER_PLAYER)]
+            for p in range(MAX_PLAYERS)
+        ]
+
+    def other_coin_at(self, player_idx: int, coin_idx: int, pos: int) -> bool:
+        """True when the player's other coin shares `pos` on the board."""
+        if pos < 0:
+            return False
+        return self.position(player_idx, 1 - coin_idx) == pos
+
+    # ---- spawned flags ----
+    def is_spawned(self, player_idx: int, coin_idx: int) -> bool:
+        return bool(self.bits >> (_SPAWN_SHIFT + _slot(player_idx, coin_idx)) & 1)
+
+    def set_spawned(self, player_idx: int, coin_idx: int, spawned: bool):
+        bit = 1 << (_SPAWN_SHIFT + _slot(player_idx, coin_idx))
+        self.bits = (self.bits | bit) if spawned else (self.bits & ~bit)
+
+    def first_unspawned(self, player_idx: int) -> Optional[int]:
+        for coin_idx in range(COINS_PER_PLAYER):
+            if not self.is_spawned(player_idx, coin_idx):
+                return coin_idx
+        return None
+
+    # ---- finished counters ----
+    def finished(self, player_idx: int) -> int:
+        return (self.bits >> (_FINISHED_SHIFT + player_idx * _FINISHED_BITS)) & _FINISHED_MASK
+
+    def set_finished(self, player_idx: int, count: int):
+        shift = _FINISHED_SHIFT + player_idx * _FINISHED_BITS
+        count = max(0, min(int(count), _FINISHED_MASK))
+        self.bits = (self.bits & ~(_FINISHED_MASK << shift)) | (count << shift)
+
+    def add_finished(self, player_idx: int) -> int:
+        self.set_finished(player_idx, self.finished(player_idx) + 1)
+        return self.finished(player_idx)
+
+    def clear_finished(self):
+        self.bits &= ~(((1 << (_FINISHED_BITS * MAX_PLAYERS)) - 1) << _FINISHED_SHIFT)
+
+    # ---- forfeits ----
+    def is_forfeited(self, player_idx: int) -> bool:
+        if not 0 <= player_idx < MAX_PLAYERS:
+            return False
+        return bool(self.bits >> (_FORFEIT_SHIFT + player_idx) & 1)
+
+    def set_forfeited(self, player_idx: int, forfeited: bool = True):
+        if not 0 <= player_idx < MAX_PLAYERS:
+            return
+        bit = 1 << (_FORFEIT_SHIFT + player_idx)
+        self.bits = (self.bits | bit) if forfeited else (self.bits & ~bit)
+
+    def clear_forfeits(self):
+        self.bits &= ~(((1 << MAX_PLAYERS) - 1) << _FORFEIT_SHIFT)
+
+    def active_players(self, num_players: int) -> List[int]:
+        return [idx for idx in range(num_players) if not self.is_forfeited(idx)]
@@ -0,0 +1,378 @@
+"""
+Stage-screen bootstrap: everything the stage needs, fetched at once.
+
+`fetch()` asks a composite `GET /users/me/bootstrap` first. It answers
+{"user": {...}, "stakes": [...]} in one round trip. If the backend doesn't
+have it (404/405/501), that is remembered for the rest of the process, and
+`/users/me`, `/game/stakes` and `POST /matches/abandon` are issued
+concurrently instead. `/users/me/profile` is only asked when `/users/me`
+came back without a description. All of it goes through one shared
+keep-alive session, so repeat visits reuse warm TLS connections.
+
+Identical bootstraps that overlap (a login prefetch and the stage entry, or
+a quick re-entry) share one in-flight fetch. A result younger than
+`max_age` is handed out again without touching the network.
+
+Login calls `prefetch()` as soon as the token arrives. The next `fetch()`
+for the same token takes that result over (or joins it while it is still
+running) instead of asking again. The result is published as soon as the
+user and stakes are in; a remote avatar is only started alongside. It is
+downloaded into the cache folder and handed out by `avatar_async()`, so the
+stage shows a local file when it lands and never waits for the picture or
+loads it on the UI thread.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.otp_utils import api_headers, read_json
+from utils.retry_policy import http_get, http_post
+
+COMPOSITE_PATH = "/users/me/bootstrap"
+UNSUPPORTED_STATUSES = frozenset({404, 405, 501})
+DESCRIPTION_KEYS = ("description", "player_description", "profile_description", "bio", "about")
+POOL_SIZE = 4
+HANDOFF_MAX_AGE = 30.0  # a login prefetch older than this is fetched again
+AVATAR_DIR = "avatars"
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_composite: Dict[str, bool] = {}  # backend -> whether the composite endpoint exists
+_inflight: Dict[tuple, Future] = {}
+_last: Dict[tuple, tuple] = {}  # (backend, token) -> (monotonic time, result)
+_handoff = set()  # keys prefetched for the next fetch() to take over
+_cache_dir: Optional[str] = None
+_avatars: Dict[str, Future] = {}  # url -> running download
+
+
+def set_cache_dir(folder: str):
+    """Keep downloaded avatars under `folder` (defaults to the temp dir)."""
+    global _cache_dir
+    _cache_dir = folder or None
+
+
+def session() -> requests.Session:
+    """Shared keep-alive session (a small connection pool per host)."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="bootstrap")
+        return _executor
+
+
+def extract_description(payload) -> str:
+    if not isinstance(payload, dict):
+        return ""
+    for key in DESCRIPTION_KEYS:
+        val = payload.get(key)
+        if isinstance(val, str) and val.strip():
+            return val.strip()
+    return ""
+
+
+def _get_json(url: str, token: Optional[str], timeout: float, deadline: float):
+    resp = http_get(
+        url,
+        headers=api_headers(token),
+        timeout=timeout,
+        deadline=deadline,
+        verify=False,
+        stream=True,
+        session=session(),
+    )
+    if resp.status_code != 200:
+        resp.close()
+        return resp.status_code, None
+    return 200, read_json(resp)
+
+
+def _abandon(backend: str, token: str, timeout: float) -> bool:
+    resp = http_post(
+        f"{backend}/matches/abandon",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=timeout,
+        verify=False,
+        session=session(),
+    )
+    print(f"[INFO] Auto-abandon response: {resp.status_code} {resp.text}")
+    return resp.status_code < 400
+
+
+def _avatar_path(url) -> Optional[str]:
+    if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+        return None
+    folder = os.path.join(_cache_dir or tempfile.gettempdir(), AVATAR_DIR)
+    ext = os.path.splitext(url.split("?", 1)[0])[1].lower()
+    if ext not in (".png", ".jpg", ".jpeg", ".webp", ".gif"):
+        ext = ".png"
+    return os.path.join(folder, hashlib.sha1(url.encode("utf-8")).hexdigest() + ext)
+
+
+def cached_avatar(url: Optional[str]) -> Optional[str]:
+    """Local copy of `url` when it was already downloaded; never touches the network."""
+    path = _avatar_path(url)
+    return path if path and os.path.exists(path) else None
+
+
+def fetch_avatar(url: Optional[str], timeout: float = 10) -> Optional[str]:
+    """Local copy of a remote avatar (downloaded once per URL); None for local or missing pictures."""
+    path = _avatar_path(url)
+    if path is None:
+        return None
+    if os.path.exists(path):
+        return path
+    folder = os.path.dirname(path)
+    resp = http_get(url, timeout=timeout, stream=True, verify=False, session=session())
+    try:
+        if resp.status_code != 200:
+            return None
+        os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            for chunk in resp.iter_content(64 * 1024):
+                fh.write(chunk)
+        os.replace(tmp, path)
+        return path
+    finally:
+        resp.close()
+
+
+def _avatar_future(url: str, timeout: float) -> Future:
+    """Start (or join) the download of `url` on the pool."""
+    with _lock:
+        fut = _avatars.get(url)
+        if fut is not None:
+            return fut
+    fut = _pool().submit(fetch_avatar, url, timeout)
+    with _lock:
+        fut = _avatars.setdefault(url, fut)
+
+    def forget(done: Future):
+        with _lock:
+            if _avatars.get(url) is done:
+                del _avatars[url]
+
+    fut.add_done_callback(forget)
+    return fut
+
+
+def avatar_async(url: Optional[str], on_done: Callable[[Optional[str]], None], timeout: float = 10):
+    """
+    `on_done(local path or None)` once `url` is on disk; joins a download the
+    bootstrap already started. Runs on a worker thread, or right away when the
+    file is cached or `url` isn't remote.
+    """
+    path = cached_avatar(url)
+    if path or _avatar_path(url) is None:
+        on_done(path)
+        return
+
+    def finished(fut: Future):
+        try:
+            local = fut.result()
+        except Exception as e:
+            print(f"[WARN] Avatar download failed: {e}")
+            local = None
+        on_done(local)
+
+    _avatar_future(url, timeout).add_done_callback(finished)
+
+
+def _try_composite(backend: str, token: str, timeout: float, deadline: float) -> Optional[Dict[str, Any]]:
+    if _composite.get(backend) is False:
+        return None
+    status, payload = _get_json(f"{backend}{COMPOSITE_PATH}", token, timeout, deadline)
+    if status in UNSUPPORTED_STATUSES:
+        _composite[backend] = False
+        return None
+    if status != 200 or not isinstance(payload, dict):
+        return None
+    _composite[backend] = True
+    return payload
+
+
+def _run(backend: str, token: Optional[str], abandon: bool, timeout: float, deadline: float) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result: Dict[str, Any] = {
+        "user": None,
+        "stakes": None,
+        "description": "",
+        "abandoned": False,
+        "avatar": None,
+        "composite": False,
+        "errors": {},
+    }
+    pool = _pool()
+    # the abandon call is a mutation and never part of the composite answer
+    abandon_f = pool.submit(_abandon, backend, token, timeout) if (abandon and token) else None
+
+    composite = None
+    if token:
+        try:
+            composite = _try_composite(backend, token, timeout, deadline)
+        except Exception as e:
+            result["errors"]["bootstrap"] = str(e)
+
+    if composite is not None:
+        result["composite"] = True
+        result["user"] = composite.get("user") if isinstance(composite.get("user"), dict) else None
+        result["stakes"] = composite.get("stakes") if isinstance(composite.get("stakes"), list) else None
+    else:
+        me_f = pool.submit(_get_json, f"{backend}/users/me", token, timeout, deadline) if token else None
+        stakes_f = pool.submit(_get_json, f"{backend}/game/stakes", token, timeout, deadline)
+        for name, fut in (("user", me_f), ("stakes", stakes_f)):
+            if fut is None:
+                continue
+            try:
+                status, payload = fut.result()
+                if status == 200:
+                    result[name] = payload
+                else:
+                    result["errors"][name] = f"HTTP {status}"
+            except Exception as e:
+                result["errors"][name] = str(e)
+
+    user = result["user"]
+    if isinstance(user, dict):
+        url = user.get("profile_image")
+        result["avatar"] = cached_avatar(url)
+        if result["avatar"] is None and _avatar_path(url):
+            _avatar_future(url, timeout)  # warm start; the result doesn't wait for it
+        desc = extract_description(user)
+        if not desc and token:
+            # only the profile endpoint is left to ask; /users/me was just fetched
+            try:
+                status, payload = _get_json(f"{backend}/users/me/profile", token, timeout, deadline)
+                desc = extract_description(payload) if status == 200 else ""
+            except Exception as e:
+                result["errors"]["profile"] = str(e)
+        if desc and not user.get("description"):
+            user["description"] = desc
+        result["description"] = desc
+
+    if abandon_f is not None:
+        try:
+            result["abandoned"] = abandon_f.result()
+        except Exception as e:
+            print(f"[WARN] Auto-abandon failed: {e}")
+            result["errors"]["abandon"] = str(e)
+
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def _begin(key: tuple, max_age: float):
+    """(cached result, None) or (future, whether the caller must run the fetch)."""
+    with _lock:
+        if key in _handoff:
+            _handoff.discard(key)
+            max_age = max(max_age, HANDOFF_MAX_AGE)
+        cached = _last.get(key)
+        if cached and max_age and time.monotonic() - cached[0] <= max_age:
+            return cached[1], None
+        fut = _inflight.get(key)
+        if fut is not None:
+            return fut, False
+        fut = _inflight[key] = Future()
+        return fut, True
+
+
+def _complete(key: tuple, fut: Future, abandon: bool, timeout: float, deadline: float) -> Dict[str, Any]:
+    try:
+        result = _run(key[0], key[1], abandon, timeout, deadline)
+    except Exception as e:
+        with _lock:
+            _inflight.pop(key, None)
+        fut.set_exception(e)
+        raise
+    with _lock:
+        _inflight.pop(key, None)
+        _last[key] = (time.monotonic(), result)
+    fut.set_result(result)
+    return result
+
+
+def fetch(
+        backend: str,
+        token: Optional[str],
+        *,
+        abandon: bool = True,
+        max_age: float = 0.0,
+        timeout: float = 10,
+        deadline: float = 12,
+) -> Dict[str, Any]:
+    """
+    Run (or join) the bootstrap for `backend` + `token` and return its result:
+    {"user", "stakes", "description", "avatar", "abandoned", "composite", "errors", "elapsed_ms"}.
+    "avatar" is only set when the picture was already cached; see `avatar_async()`.
+    """
+    key = (backend, token)
+    fut, owner = _begin(key, max_age)
+    if owner is None:
+        return fut
+    if not owner:
+        return fut.result()
+    return _complete(key, fut, abandon, timeout, deadline)
+
+
+def prefetch(backend: str, token: Optional[str], *, abandon: bool = True, timeout: float = 10, deadline: float = 12) -> Future:
+    """
+    Start the bootstrap now (on its own thread) for the next `fetch()` to take
+    over; returns a Future with the result.
+    """
+    key = (backend, token)
+    with _lock:
+        _handoff.discard(key)
+    fut, owner = _begin(key, 0.0)  # joins a running bootstrap, never reuses an old result
+    with _lock:
+        _handoff.add(key)
+    if owner:
+        def worker():
+            try:
+                _complete(key, fut, abandon, timeout, deadline)
+            except Exception as e:
+                print(f"[ERR] Bootstrap prefetch failed: {e}")
+
+        threading.Thread(target=worker, daemon=True).start()
+    return fut
+
+
+def fetch_async(backend: str, token: Optional[str], on_done: Callable[[Dict[str, Any]], None], **kwargs):
+    """`fetch()` on a worker thread; `on_done(result)` runs on that thread."""
+
+    def worker():
+        try:
+            result = fetch(backend, token, **kwargs)
+        except Exception as e:
+            print(f"[ERR] Bootstrap failed: {e}")
+            return
+        on_done(result)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def invalidate():
+    """Forget cached results (logout, account switch)."""
+    with _lock:
+        _last.clear()
+        _handoff.clear()
@@ -0,0 +1,76 @@
+"""
+Connection health estimate for the online match heartbeat.
+
+Keeps a smoothed round-trip time (RFC 6298 style SRTT/RTTVAR), a rolling loss
+ratio over the last few probes and the consecutive failure count, and derives
+the next probe interval and timeout from them: a quiet, healthy link is probed
+rarely, a lossy or slow one more often.
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+MIN_INTERVAL = 2.0
+BASE_INTERVAL = 5.0
+MAX_INTERVAL = 15.0
+MIN_TIMEOUT = 1.5
+MAX_TIMEOUT = 5.0
+
+
+class ConnectionHealth:
+    def __init__(self, window: int = 10):
+        self._outcomes = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self.failures = 0
+        self.last_success = 0.0
+        self._outcomes.clear()
+        self._interval = BASE_INTERVAL
+
+    def record_success(self, rtt: float):
+        rtt = max(0.0, float(rtt))
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2.0
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.failures = 0
+        self.last_success = time.monotonic()
+        self._outcomes.append(True)
+        # healthy: back off gradually
+        if self.loss == 0.0:
+            self._interval = min(MAX_INTERVAL, self._interval * 1.5)
+        else:
+            self._interval = BASE_INTERVAL
+
+    def record_failure(self):
+        self.failures += 1
+        self._outcomes.append(False)
+        # trouble: probe quickly so recovery kicks in early
+        self._interval = max(MIN_INTERVAL, self._interval / 2.0)
+
+    @property
+    def loss(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def latency_ms(self) -> Optional[int]:
+        return int(round(self.srtt * 1000)) if self.srtt is not None else None
+
+    def next_interval(self) -> float:
+        interval = self._interval
+        if self.srtt is not None and self.srtt > 1.0:
+            interval = min(interval, BASE_INTERVAL)
+        return max(MIN_INTERVAL, min(MAX_INTERVAL, interval))
+
+    def probe_timeout(self) -> float:
+        if self.srtt is None:
+            return MAX_TIMEOUT
+        return max(MIN_TIMEOUT, min(MAX_TIMEOUT, self.srtt + 4 * (self.rttvar or 0.0)))
@@ -0,0 +1,69 @@
+"""
+Deferred imports for heavy dependencies.
+
+`lazy("webbrowser")` or `lazy("kivy.core.clipboard", "Clipboard")` returns a
+stand-in that imports the target on first attribute access or call and then
+behaves like it. Module-level names stay the same, so call sites don't
+change, and the import cost moves from app start to first use.
+
+The proxy is not the real object: use `resolve()` where identity matters
+(isinstance checks, subclassing, passing it to C code).
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Any, Optional
+
+_import_lock = threading.RLock()
+
+
+class LazyImport:
+    __slots__ = ("_module", "_attr", "_target")
+
+    def __init__(self, module: str, attr: Optional[str] = None):
+        object.__setattr__(self, "_module", module)
+        object.__setattr__(self, "_attr", attr)
+        object.__setattr__(self, "_target", None)
+
+    def resolve(self) -> Any:
+        target = object.__getattribute__(self, "_target")
+        if target is None:
+            with _import_lock:
+                target = object.__getattribute__(self, "_target")
+                if target is None:
+                    target = importlib.import_module(self._module)
+                    if self._attr:
+                        target = getattr(target, self._attr)
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return object.__getattribute__(self, "_target") is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        name = f"{self._module}.{self._attr}" if self._attr else self._module
+        state = "loaded" if self.loaded else "deferred"
+        return f"<lazy {name} ({state})>"
+
+
+def lazy(module: str, attr: Optional[str] = None) -> LazyImport:
+    return LazyImport(module, attr)
+
+
+def available(module: str) -> bool:
+    """Whether `module` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,231 @@
+"""
+Leak detector for long sessions: cycle the real screens and watch what grows.
+
+    python -m utils.leak_check --cycles 20 --dwell 0.4 --json leaks.json
+
+Boots DiceApp, then drives welcome -> stage -> usermatch -> dicegame (offline
+bot match) -> stage N times with transitions off. After each cycle, once back
+on the stage screen, it samples:
+
+  widgets       live Widget instances (gc)
+  bindings      property observers across those widgets
+  canvas        canvas instructions (before/main/after, nested groups included)
+  clock_events  events pending on the Kivy Clock
+  animations    looping animations currently running (screens/looping_animations)
+  heap_kb       Python heap (tracemalloc)
+  gc_objects    all gc-tracked objects
+
+The first cycle is warm-up (lazy screens, textures, caches) and is not
+counted. A metric is reported as leaking when it grows in most of the later
+cycles and ends above `--tolerance` percent of its post-warm-up value. The
+exit status is 1 if anything leaks, so this can run in CI.
+
+Network calls are pointed at a closed local port so they fail fast. A window
+is still needed; use xvfb-run on a headless machine.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+METRICS = ("widgets", "bindings", "canvas", "clock_events", "animations", "heap_kb", "gc_objects")
+DEAD_BACKEND = "http://127.0.0.1:9"
+
+
+def _count_instructions(group) -> int:
+    children = getattr(group, "children", None) or []
+    return sum(1 + _count_instructions(child) for child in children)
+
+
+def sample() -> Dict[str, Optional[int]]:
+    """Collect every metric once (runs a full gc first)."""
+    from kivy.clock import Clock
+    from kivy.uix.widget import Widget
+    from screens.looping_animations import looping_animations
+
+    gc.collect()
+    objects = gc.get_objects()
+    widgets = [o for o in objects if isinstance(o, Widget)]
+
+    bindings = 0
+    canvas = 0
+    for w in widgets:
+        for name in w.properties():
+            try:
+                bindings += len(w.get_property_observers(name))
+            except Exception:
+                pass
+        c = w.canvas
+        if c is None:
+            continue
+        canvas += _count_instructions(c)
+        # touching .before/.after would create them, so check first
+        if getattr(c, "has_before", False):
+            canvas += _count_instructions(c.before)
+        if getattr(c, "has_after", False):
+            canvas += _count_instructions(c.after)
+
+    get_events = getattr(Clock, "get_events", None)
+    return {
+        "widgets": len(widgets),
+        "bindings": bindings,
+        "canvas": canvas,
+        "clock_events": len(get_events()) if get_events else None,
+        "animations": looping_animations.active_count(),
+        "heap_kb": tracemalloc.get_traced_memory()[0] // 1024 if tracemalloc.is_tracing() else None,
+        "gc_objects": len(objects),
+    }
+
+
+def analyze(samples: List[Dict[str, Optional[int]]], tolerance: float = 5.0) -> Dict[str, Any]:
+    """Growth per metric over the post-warm-up samples; flags steady growth above `tolerance` %."""
+    result = {}
+    steady = samples[1:]
+    for name in METRICS:
+        values = [s.get(name) for s in steady if s.get(name) is not None]
+        if len(values) < 2:
+            result[name] = {"leaking": False, "values": values}
+            continue
+        rises = sum(1 for a, b in zip(values, values[1:]) if b > a)
+        growth = values[-1] - values[0]
+        pct = 100.0 * growth / values[0] if values[0] else (100.0 if growth else 0.0)
+        result[name] = {
+            "start": values[0],
+            "end": values[-1],
+            "growth": growth,
+            "growth_pct": round(pct, 1),
+            "per_cycle": round(growth / (len(values) - 1), 1),
+            "leaking": rises * 2 > len(values) - 1 and pct > tolerance,
+        }
+    return result
+
+
+class ScreenCycler:
+    """Drives the app's ScreenManager through the cycle on the Kivy clock."""
+
+    def __init__(self, app, cycles: int, dwell: float, on_done):
+        self.app = app
+        self.cycles = cycles
+        self.dwell = dwell
+        self.on_done = on_done
+        self.samples: List[Dict[str, Optional[int]]] = []
+        self._step = 0
+
+    def start(self):
+        from kivy.clock import Clock
+        from kivy.uix.screenmanager import NoTransition
+
+        self.app.ensure_screens()
+        self.app.sm.transition = NoTransition()
+        Clock.schedule_once(self._next, self.dwell)
+
+    def _steps(self):
+        return (self._to_stage, self._to_usermatch, self._to_dicegame, self._to_stage_and_sample)
+
+    def _next(self, *_):
+        from kivy.clock import Clock
+
+        steps = self._steps()
+        cycle, idx = divmod(self._step, len(steps))
+        if cycle >= self.cycles:
+            self.on_done(self.samples)
+            return
+        steps[idx]()
+        self._step += 1
+        Clock.schedule_once(self._next, self.dwell)
+
+    def _to_stage(self):
+        self.app.sm.current = "stage"
+
+    def _to_usermatch(self):
+        if self.app.sm.has_screen("usermatch"):
+            self.app.sm.current = "usermatch"
+
+    def _to_dicegame(self):
+        from utils import storage
+
+        storage.set_current_match(None)
+        storage.set_stake_amount(0)
+        storage.set_num_players(2)
+        storage.set_player_names("You", "Bot")
+        game = self.app.sm.get_screen("dicegame")
+        game.set_stage_and_players(0, "You", "Bot")
+        self.app.sm.current = "dicegame"
+
+    def _to_stage_and_sample(self):
+        from kivy.clock import Clock
+
+        self.app.sm.current = "stage"
+        # let on_leave/on_enter side effects settle for a frame before measuring
+        Clock.schedule_once(lambda dt: self._record(), 0)
+
+    def _record(self):
+        snap = sample()
+        self.samples.append(snap)
+        print(f"[LEAK] cycle {len(self.samples)}: {snap}")
+
+
+def format_report(analysis: Dict[str, Any]) -> List[str]:
+    lines = []
+    for name in METRICS:
+        a = analysis.get(name, {})
+        if "start" not in a:
+            lines.append(f"[LEAK] {name:<13} n/a")
+            continue
+        flag = "LEAK" if a["leaking"] else "ok"
+        lines.append(
+            f"[LEAK] {name:<13} {a['start']:>9} -> {a['end']:>9}  "
+            f"{a['growth']:+} ({a['growth_pct']:+.1f}%, {a['per_cycle']:+}/cycle)  {flag}"
+        )
+    return lines
+
+
+def _main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Cycle the app's screens and report growth.")
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--dwell", type=float, default=0.4, help="seconds on each screen")
+    parser.add_argument("--tolerance", type=float, default=5.0, help="allowed growth in percent")
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    # a fixed tier keeps adaptive quality from changing animations mid-run
+    os.environ.setdefault("DICE_QUALITY", "medium")
+    tracemalloc.start()
+
+    # make the app importable when run from anywhere
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from kivy.app import App
+    from kivy.clock import Clock
+
+    import main
+    from utils import storage
+
+    storage.set_backend_url(DEAD_BACKEND)
+    outcome = {"status": 0}
+
+    def finish(samples):
+        analysis = analyze(samples, args.tolerance)
+        for line in format_report(analysis):
+            print(line)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as fh:
+                json.dump({"samples": samples, "analysis": analysis}, fh, indent=2)
+        outcome["status"] = 1 if any(a.get("leaking") for a in analysis.values()) else 0
+        App.get_running_app().stop()
+
+    class LeakCheckApp(main.DiceApp):
+        def on_start(self):
+            super().on_start()
+            Clock.schedule_once(lambda dt: ScreenCycler(self, max(2, args.cycles), args.dwell, finish).start(), 0.5)
+
+    LeakCheckApp().run()
+    return outcome["status"]
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,317 @@
+"""
+Match replay recording and playback.
+
+A recording is an append-only JSON-lines log; each line is a compact
+`[t_ms, kind, data]` triple where `t_ms` is milliseconds since the match
+started. The first entry is normally a `setup` describing the match so a
+replay can rebuild the same starting state.
+
+Recording is opt-in: set DICE_REPLAY_DIR to a writable folder and every
+match played on the dice screen is logged there.
+
+A recording plays back two ways. `ReplayPlayer` re-drives the dice screen
+through the Kivy Clock, animations included. `replay_headless()` feeds it to
+a `HeadlessMatch`, which only updates a BoardState and its diffs. No
+widgets, Clock or coin timelines are involved, so its timings measure event
+processing alone.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.board_state import (
+    COINS_PER_PLAYER,
+    MAX_PLAYERS,
+    NO_POSITION,
+    BoardState,
+    board_diff,
+    pack_positions,
+    state_signature,
+)
+
+REPLAY_DIR_ENV = "DICE_REPLAY_DIR"
+
+EVENT_SETUP = "setup"
+EVENT_SERVER = "srv"
+EVENT_ROLL = "roll"
+EVENT_PASS = "pass"
+
+# speed presets accepted by ReplayPlayer; None plays back-to-back
+SPEED_REALTIME = 1.0
+SPEED_FAST = 10.0
+SPEED_MAX = None
+
+Entry = Tuple[int, str, Any]
+
+# offline rules, as in screens/dice_game_screen.py
+FINAL_BOX_INDEX = 8
+DANGER_BOX = 3
+COINS_TO_WIN = 2
+
+
+def replay_dir() -> Optional[str]:
+    path = (os.getenv(REPLAY_DIR_ENV) or "").strip()
+    return path or None
+
+
+class MatchRecorder:
+    """Append-only event log for one match, written line by line."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: List[Entry] = []
+        self._fh = None
+        self._t0 = time.monotonic()
+
+    @classmethod
+    def for_match(cls, match_id=None) -> Optional["MatchRecorder"]:
+        """Recorder writing into DICE_REPLAY_DIR, or None when recording is disabled."""
+        folder = replay_dir()
+        if not folder:
+            return None
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except Exception as e:
+            print(f"[REPLAY][WARN] Cannot create {folder}: {e}")
+            return None
+        name = f"{match_id or 'offline'}_{int(time.time())}.jsonl"
+        return cls(os.path.join(folder, name))
+
+    def record(self, kind: str, data: Any = None):
+        entry = (int((time.monotonic() - self._t0) * 1000), kind, data)
+        self.entries.append(entry)
+        if not self.path:
+            return
+        try:
+            if self._fh is None:
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(json.dumps(entry, separators=(",", ":"), default=str))
+            self._fh.write("\n")
+        except Exception as e:
+            print(f"[REPLAY][WARN] Recording disabled: {e}")
+            self.path = None
+
+    def close(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+
+
+def load_replay(path: str) -> List[Entry]:
+    """Read a recording; malformed lines (e.g. a truncated tail) are skipped."""
+    entries: List[Entry] = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                t_ms, kind, data = json.loads(line)
+            except (ValueError, TypeError):
+                continue
+            entries.append((int(t_ms), kind, data))
+    return entries
+
+
+class HeadlessMatch:
+    """Board-only model of a recorded match: BoardState and board diffs, nothing drawn."""
+
+    def __init__(self):
+        self.board = BoardState()
+        self.num_players = 2
+        self.current_player = 0
+        self.winner: Optional[int] = None
+        self.changes = 0  # coin changes found by board_diff
+        self._last_sig = None
+
+    def dispatch(self, kind: str, data: Any):
+        if kind == EVENT_SETUP:
+            data = data or {}
+            self.board.reset()
+            self.num_players = 3 if data.get("num_players") == 3 else 2
+            current = data.get("current_player")
+            self.current_player = current if isinstance(current, int) else 0
+            self.winner = None
+            self._last_sig = None
+        elif kind == EVENT_SERVER and isinstance(data, dict):
+            self._server(data)
+        elif kind == EVENT_ROLL and isinstance(data, dict):
+            player = data.get("player")
+            self._roll(
+                int(data.get("roll") or 0),
+                data.get("coin"),
+                self.current_player if player is None else int(player),
+            )
+        elif kind == EVENT_PASS:
+            self._next_turn()
+
+    def _next_turn(self):
+        self.current_player = (self.current_player + 1) % self.num_players
+
+    def _apply(self, old_bits: int):
+        self.changes += len(board_diff(old_bits, self.board.bits))
+
+    def _server(self, payload: Dict[str, Any]):
+        if payload.get("finished") is True or payload.get("status") == "FINISHED":
+            winner = payload.get("winner")
+            self.winner = int(winner) if winner is not None else None
+            return
+        positions = payload.get("positions")
+        roll = payload.get("last_roll")
+        actor = payload.get("actor")
+        turn = payload.get("turn")
+        new_bits = pack_positions(positions) if positions else self.board.positions_bits
+        sig = state_signature(new_bits, roll, turn)
+        if sig == self._last_sig:
+            return
+        self._last_sig = sig
+
+        old_bits = self.board.bits
+        if payload.get("spawn", False) and actor is not None:
+            actor_idx = int(actor)
+            if 0 <= actor_idx < MAX_PLAYERS:
+                coin_idx = self.board.first_unspawned(actor_idx)
+                self.board.place(actor_idx, 0 if coin_idx is None else coin_idx, 0)
+            self.current_player = int(turn) if turn is not None else (actor_idx + 1) % self.num_players
+            self._apply(old_bits)
+            return
+
+        self.board.set_positions_bits(new_bits)
+        self._apply(old_bits)
+        forfeit_actor = payload.get("forfeit_actor")
+        if forfeit_actor is not None:
+            self.board.set_forfeited(int(forfeit_actor))
+        if turn is not None:
+            self.current_player = int(turn)
+
+    def _choose_coin(self, player_idx: int) -> Optional[int]:
+        unspawned = self.board.first_unspawned(player_idx)
+        if unspawned is not None:
+            return unspawned
+        for coin_idx in range(COINS_PER_PLAYER):
+            if self.board.position(player_idx, coin_idx) < FINAL_BOX_INDEX:
+                return coin_idx
+        return None
+
+    def _roll(self, roll: int, coin_idx: Optional[int], p: int):
+        board = self.board
+        old_bits = board.bits
+        if p >= MAX_PLAYERS or board.finished(p) >= COINS_TO_WIN:
+            self._next_turn()
+            return
+        if coin_idx is None:
+            coin_idx = self._choose_coin(p)
+        if coin_idx is None or coin_idx >= COINS_PER_PLAYER or board.position(p, coin_idx) == FINAL_BOX_INDEX:
+            self._next_turn()
+            return
+
+        if not board.is_spawned(p, coin_idx):
+            if roll == 1:
+                board.place(p, coin_idx, 0)
+        else:
+            new_pos = board.position(p, coin_idx) + roll
+            if new_pos == DANGER_BOX:
+                board.place(p, coin_idx, 0)
+            elif new_pos == FINAL_BOX_INDEX:
+                board.set_position(p, coin_idx, FINAL_BOX_INDEX)
+                if board.add_finished(p) >= COINS_TO_WIN:
+                    self.winner = p
+                    self._apply(old_bits)
+                    return
+            elif new_pos < FINAL_BOX_INDEX:
+                board.set_position(p, coin_idx, new_pos)
+                for idx in range(self.num_players):
+                    if idx == p:
+                        continue
+                    for cidx in range(COINS_PER_PLAYER):
+                        if board.is_spawned(idx, cidx) and board.position(idx, cidx) == new_pos:
+                            board.place(idx, cidx, NO_POSITION)  # captured
+        self._apply(old_bits)
+        self._next_turn()
+
+
+def replay_headless(entries: List[Entry], match: Optional[HeadlessMatch] = None) -> Dict[str, Any]:
+    """
+    Feed every entry to a HeadlessMatch synchronously, without a Clock or widgets.
+    Returns timing stats for benchmarking event processing, plus the final board.
+    """
+    match = match or HeadlessMatch()
+    start = time.perf_counter()
+    for _, kind, data in entries:
+        match.dispatch(kind, data)
+    elapsed = time.perf_counter() - start
+    count = len(entries)
+    return {
+        "events": count,
+        "elapsed": elapsed,
+        "per_event_ms": (elapsed * 1000 / count) if count else 0.0,
+        "changes": match.changes,
+        "positions": match.board.positions_list(),
+        "winner": match.winner,
+    }
+
+
+class ReplayPlayer:
+    """Re-drive a recording through the Kivy Clock at 1×, 10× or max speed."""
+
+    def __init__(
+            self,
+            entries: List[Entry],
+            dispatch: Callable[[str, Any], None],
+            *,
+            speed: Optional[float] = SPEED_REALTIME,
+            on_complete: Optional[Callable[[], None]] = None,
+    ):
+        self._entries = entries
+        self._dispatch = dispatch
+        self._speed = speed
+        self._on_complete = on_complete
+        self._index = 0
+        self._ev = None
+
+    @property
+    def running(self) -> bool:
+        return self._ev is not None
+
+    def start(self):
+        self.stop()
+        self._index = 0
+        self._schedule_next(0)
+
+    def stop(self):
+        if self._ev is not None:
+            try:
+                self._ev.cancel()
+            except Exception:
+                pass
+            self._ev = None
+
+    def _schedule_next(self, delay: float):
+        from kivy.clock import Clock
+
+        self._ev = Clock.schedule_once(self._step, delay)
+
+    def _step(self, *_):
+        self._ev = None
+        if self._index >= len(self._entries):
+            if self._on_complete:
+                self._on_complete()
+            return
+        t_ms, kind, data = self._entries[self._index]
+        self._index += 1
+        try:
+            self._dispatch(kind, data)
+        except Exception as e:
+            print(f"[REPLAY][ERR] {kind} @ {t_ms}ms: {e}")
+
+        if self._index >= len(self._entries):
+            self._schedule_next(0)
+            return
+        gap_ms = max(0, self._entries[self._index][0] - t_ms)
+        delay = 0 if not self._speed else gap_ms / 1000.0 / self._speed
+        self._schedule_next(delay)
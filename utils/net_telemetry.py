@@ -0,0 +1,226 @@
+"""
+Per-endpoint network telemetry.
+
+Every timed request records total latency, time to first byte (requests'
+`resp.elapsed`, which covers connect + TLS + server time), whether it was a
+retry (so an endpoint's count is its total retries) and an error class. Samples are kept in a bounded
+window per endpoint so p50/p95/p99 can be computed at any time, shown in the
+settings debug popup, or exported as a JSON snapshot.
+
+`requests` does not expose connect/TLS time separately; TTFB vs. total (the
+remainder being body transfer) is the closest split available. For
+`stream=True` calls the headers only mark TTFB. Their total is recorded when
+the body has been read (`body_done()`, called by `otp_utils.read_body`) or
+the response is closed, whichever comes first. A streamed response that is
+never read or closed adds no total.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+WINDOW = 256
+
+_lock = threading.Lock()
+_stats: Dict[str, "EndpointStats"] = {}
+_ID_SEGMENT = re.compile(r"/(\d+|[0-9a-f]{8,}(?:-[0-9a-f]{4,})*)(?=/|$)", re.IGNORECASE)
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    idx = min(len(sorted_vals) - 1, max(0, int(round(pct / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[idx]
+
+
+def normalize_endpoint(method: str, url: str) -> str:
+    """'GET https://host/matches/ws/42?x=1' -> 'GET /matches/ws/{id}'."""
+    path = urlparse(url).path or "/"
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def error_class(exc: Optional[BaseException] = None, status: Optional[int] = None) -> Optional[str]:
+    if exc is not None:
+        if isinstance(exc, requests.Timeout):
+            return "timeout"
+        if isinstance(exc, requests.ConnectionError):
+            return "connection"
+        return type(exc).__name__
+    if status is None:
+        return None
+    if status >= 500:
+        return "http_5xx"
+    if status >= 400:
+        return "http_4xx"
+    return None
+
+
+class EndpointStats:
+    __slots__ = ("count", "retries", "errors", "total_ms", "ttfb_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.retries = 0
+        self.errors = Counter()
+        self.total_ms = deque(maxlen=WINDOW)
+        self.ttfb_ms = deque(maxlen=WINDOW)
+
+    def summary(self) -> Dict[str, Any]:
+        total = sorted(self.total_ms)
+        ttfb = sorted(self.ttfb_ms)
+        return {
+            "count": self.count,
+            "retries": self.retries,
+            "errors": dict(self.errors),
+            "p50_ms": _percentile(total, 50),
+            "p95_ms": _percentile(total, 95),
+            "p99_ms": _percentile(total, 99),
+            "ttfb_p50_ms": _percentile(ttfb, 50),
+            "ttfb_p95_ms": _percentile(ttfb, 95),
+        }
+
+
+def record(
+        endpoint: str,
+        total: Optional[float],
+        *,
+        ttfb: Optional[float] = None,
+        attempt: int = 0,
+        error: Optional[str] = None,
+):
+    """
+    Record one attempt; `total`/`ttfb` in seconds (total is None when the attempt
+    never completed). `attempt` is the 0-based attempt index, so every attempt
+    after the first counts as exactly one retry.
+    """
+    with _lock:
+        stats = _stats.get(endpoint)
+        if stats is None:
+            stats = _stats[endpoint] = EndpointStats()
+        stats.count += 1
+        if attempt > 0:
+            stats.retries += 1
+        if error:
+            stats.errors[error] += 1
+        if total is not None:
+            stats.total_ms.append(round(total * 1000, 1))
+        if ttfb is not None:
+            stats.ttfb_ms.append(round(ttfb * 1000, 1))
+
+
+def record_total(endpoint: str, total: float):
+    """Add the total (seconds) of an attempt that `record()` already counted."""
+    with _lock:
+        stats = _stats.get(endpoint)
+        if stats is None:
+            stats = _stats[endpoint] = EndpointStats()
+        stats.total_ms.append(round(total * 1000, 1))
+
+
+def _time_body(resp: requests.Response, endpoint: str, started: float):
+    done = []
+    close = resp.close
+
+    def finish():
+        if not done:
+            done.append(True)
+            record_total(endpoint, time.perf_counter() - started)
+
+    def close_and_finish():
+        finish()
+        close()
+
+    resp._telemetry_finish = finish
+    resp.close = close_and_finish  # also covers `with resp:` and iter_json_items()
+
+
+def body_done(resp: requests.Response):
+    """Record the total of a streamed response once its body is fully read (no-op otherwise)."""
+    finish = getattr(resp, "_telemetry_finish", None)
+    if finish:
+        finish()
+
+
+def timed_request(
+        method: str,
+        url: str,
+        *,
+        attempt: int = 0,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+) -> requests.Response:
+    """
+    Drop-in for requests.request that records latency and outcome for the endpoint.
+    Pass a `session` to reuse its pooled keep-alive connections. With
+    `stream=True` the total waits for the body (see `body_done()`).
+    """
+    endpoint = normalize_endpoint(method, url)
+    started = time.perf_counter()
+    try:
+        resp = (session or requests).request(method, url, **kwargs)
+    except Exception as exc:
+        record(endpoint, None, attempt=attempt, error=error_class(exc))
+        raise
+    ttfb = resp.elapsed.total_seconds() if resp.elapsed else None
+    streamed = bool(kwargs.get("stream"))
+    record(
+        endpoint,
+        None if streamed else time.perf_counter() - started,
+        ttfb=ttfb,
+        attempt=attempt,
+        error=error_class(status=resp.status_code),
+    )
+    if streamed:
+        _time_body(resp, endpoint, started)
+    return resp
+
+
+def timed_get(url: str, **kwargs) -> requests.Response:
+    return timed_request("GET", url, **kwargs)
+
+
+def timed_post(url: str, **kwargs) -> requests.Response:
+    return timed_request("POST", url, **kwargs)
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        endpoints = {name: stats.summary() for name, stats in _stats.items()}
+    return {"generated_at": int(time.time()), "window": WINDOW, "endpoints": endpoints}
+
+
+def export_json(path: Optional[str] = None) -> str:
+    """Serialize the snapshot; also write it to `path` when given."""
+    data = json.dumps(snapshot(), indent=2, sort_keys=True)
+    if path:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(data)
+    return data
+
+
+def format_lines() -> List[str]:
+    """Human-readable one-liners for the debug popup, busiest endpoints first."""
+    rows = sorted(snapshot()["endpoints"].items(), key=lambda item: -item[1]["count"])
+    lines = []
+    for name, s in rows:
+        def fmt(v):
+            return "-" if v is None else f"{v:.0f}"
+
+        errors = ", ".join(f"{k}:{v}" for k, v in s["errors"].items()) or "none"
+        lines.append(
+            f"{name}\n  n={s['count']} p50={fmt(s['p50_ms'])} p95={fmt(s['p95_ms'])} "
+            f"p99={fmt(s['p99_ms'])} ms  ttfb50={fmt(s['ttfb_p50_ms'])} ms\n"
+            f"  retries={s['retries']} errors={errors}"
+        )
+    return lines
+
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -1,9 +1,30 @@
 # utils/otp_utils.py
+import json as jsonlib
 import os
-import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Sequence, Union
 import requests
 
+from utils import net_telemetry, profile_outbox
+from utils.retry_policy import http_request
+
+# Optional: brotli lets urllib3 decode "br" bodies; without it we only offer gzip/deflate
+try:
+    import brotli  # type: ignore  # noqa: F401
+    _BROTLI_OK = True
+except Exception:
+    try:
+        import brotlicffi  # type: ignore  # noqa: F401
+        _BROTLI_OK = True
+    except Exception:
+        _BROTLI_OK = False
+
+# Optional: ijson parses large JSON arrays item by item straight off the socket
+try:
+    import ijson  # type: ignore
+    from ijson.common import ObjectBuilder  # type: ignore
+except Exception:
+    ijson = None
+
 # === Backend base URL ===
 BACKEND_BASE = os.getenv("BACKEND_BASE", "https://spin-api-pba3.onrender.com").rstrip("/")
 
@@ -16,7 +37,16 @@ _LOGIN_OTP_ENDPOINT_AVAILABLE: Optional[bool] = None
 
 # Networking settings
 TIMEOUT = float(os.getenv("OTP_HTTP_TIMEOUT", "40"))
-RETRIES = int(os.getenv("OTP_HTTP_RETRIES", "2"))
+RETRIES = int(os.getenv("OTP_HTTP_RETRIES", "2"))  # default rule in utils.retry_policy
+ACCEPT_ENCODING = "gzip, deflate, br" if _BROTLI_OK else "gzip, deflate"
+# decompressed bytes we are willing to hold for one response body
+MAX_BODY_BYTES = int(os.getenv("OTP_HTTP_MAX_BODY", str(2 * 1024 * 1024)))
+ERROR_BODY_BYTES = 4096
+CHUNK_SIZE = 16 * 1024
+
+
+class ResponseTooLarge(RuntimeError):
+    pass
 
 
 def _url(path: str) -> str:
@@ -24,15 +54,143 @@ def _url(path: str) -> str:
 
 
 def _headers(token: Optional[str] = None) -> Dict[str, str]:
-    hdrs = {"Accept": "application/json"}
+    hdrs = {"Accept": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
     if token:
         hdrs["Authorization"] = f"Bearer {token}"
     return hdrs
 
 
+def api_headers(token: Optional[str] = None) -> Dict[str, str]:
+    """Shared request headers (JSON + compression + optional bearer) for direct `requests` calls."""
+    return _headers(token)
+
+
+def error_message(resp: requests.Response) -> str:
+    return _extract_error(resp)
+
+
+class _BoundedReader:
+    """File-like view over a streamed (and transparently decompressed) body that stops at `limit` bytes."""
+
+    def __init__(self, resp: requests.Response, limit: int):
+        resp.raw.decode_content = True
+        self._raw = resp.raw
+        self._limit = limit
+        self._read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = CHUNK_SIZE
+        chunk = self._raw.read(size) or b""
+        self._read += len(chunk)
+        if self._read > self._limit:
+            raise ResponseTooLarge(f"Response body exceeds {self._limit} bytes")
+        return chunk
+
+
+def read_body(resp: requests.Response, limit: int = MAX_BODY_BYTES) -> bytes:
+    """Read a streamed response chunk by chunk, decompressing on the fly; raises past `limit`."""
+    if resp.raw is None or getattr(resp, "_content_consumed", False):
+        body = resp.content or b""
+        if len(body) > limit:
+            raise ResponseTooLarge(f"Response body exceeds {limit} bytes")
+        return body
+    buf = bytearray()
+    for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+        buf.extend(chunk)
+        if len(buf) > limit:
+            resp.close()
+            raise ResponseTooLarge(f"Response body exceeds {limit} bytes")
+    net_telemetry.body_done(resp)
+    return bytes(buf)
+
+
+def read_json(resp: requests.Response, limit: int = MAX_BODY_BYTES) -> Any:
+    return jsonlib.loads(read_body(resp, limit) or b"null")
+
+
+def _resolve_prefix(data: Any, prefix: str):
+    node = data
+    for part in prefix.split(".")[:-1]:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+    return node if isinstance(node, list) else None
+
+
+def iter_json_items(
+    resp: requests.Response,
+    prefixes: Union[str, Sequence[str]] = "item",
+    *,
+    limit: int = MAX_BODY_BYTES,
+    max_items: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Yield array items from a streamed JSON body.
+    `prefixes` are ijson-style paths ("item" for a top-level list,
+    "transactions.item" for a list under a key); the first one present wins.
+    With ijson installed items are built as bytes arrive, otherwise the body is
+    read (bounded) and parsed in one go.
+    """
+    if isinstance(prefixes, str):
+        prefixes = (prefixes,)
+    count = 0
+    try:
+        if ijson is None:
+            data = read_json(resp, limit)
+            for prefix in prefixes:
+                items = _resolve_prefix(data, prefix)
+                if items is not None:
+                    for item in items:
+                        if max_items is not None and count >= max_items:
+                            return
+                        count += 1
+                        yield item
+                    return
+            return
+
+        builder = None
+        active = None
+        for prefix, event, value in ijson.parse(_BoundedReader(resp, limit)):
+            if builder is None:
+                if prefix not in prefixes or (active is not None and prefix != active):
+                    continue
+                if event in ("start_map", "start_array"):
+                    active = prefix
+                    builder = ObjectBuilder()
+                    builder.event(event, value)
+                elif event not in ("end_map", "end_array", "map_key"):
+                    active = prefix
+                    count += 1
+                    yield value
+                    if max_items is not None and count >= max_items:
+                        return
+                continue
+            builder.event(event, value)
+            if prefix == active and event in ("end_map", "end_array"):
+                item = builder.value
+                builder = None
+                count += 1
+                yield item
+                if max_items is not None and count >= max_items:
+                    return
+    finally:
+        resp.close()
+
+
 def _extract_error(resp: requests.Response) -> str:
     try:
-        data = resp.json()
+        raw = read_body(resp, ERROR_BODY_BYTES)
+    except ResponseTooLarge:
+        return f"HTTP {resp.status_code}"
+    except Exception:
+        raw = b""
+    # keep the (bounded) body on the response so callers can still use resp.json()/resp.text
+    resp._content = raw
+    resp._content_consumed = True
+    text = raw.decode("utf-8", errors="replace")
+    try:
+        data = jsonlib.loads(text)
         if isinstance(data, dict):
             if "detail" in data:
                 return str(data["detail"])
@@ -41,7 +199,7 @@ def _extract_error(resp: requests.Response) -> str:
             return str(data)
         return str(data)
     except Exception:
-        return resp.text or f"HTTP {resp.status_code}"
+        return text or f"HTTP {resp.status_code}"
 
 
 def _request(
@@ -51,54 +209,40 @@ def _request(
     params: Optional[dict] = None,
     token: Optional[str] = None,
     timeout: float = TIMEOUT,
+    deadline: Optional[float] = None,
 ) -> Dict[str, Any]:
 
     url = _url(path)
-    attempts = 1 + max(0, RETRIES)
-    last_exc: Optional[Exception] = None
-
-    for i in range(attempts):
-        try:
-            resp = requests.request(
-                method=method.upper(),
-                url=url,
-                json=json,
-                params=params,
-                headers=_headers(token),
-                timeout=timeout,
-                verify=VERIFY_SSL,
-            )
-
-            if not (200 <= resp.status_code < 300):
-                msg = _extract_error(resp)
-                raise requests.HTTPError(msg, response=resp)
-
-            try:
-                return resp.json()
-            except Exception:
-                return {"ok": False, "raw": resp.text}
-
-        except requests.ReadTimeout:
-            last_exc = f"Timeout after {timeout}s (attempt {i+1}/{attempts})"
-            if i < attempts - 1:
-                time.sleep(1.5)
-                continue
-            raise RuntimeError(f"Server too slow: {last_exc}")
-
-        except requests.HTTPError as err:
-            raise err
-
-        except Exception as e:
-            last_exc = e
-            if i < attempts - 1:
-                time.sleep(1.5)
-                continue
-            raise RuntimeError(f"Request failed after {attempts} attempts: {e}")
+    try:
+        # retries, backoff, deadline and circuit breaking come from the endpoint's rule
+        resp = http_request(
+            method,
+            url,
+            json=json,
+            params=params,
+            headers=_headers(token),
+            timeout=timeout,
+            deadline=deadline,
+            verify=VERIFY_SSL,
+            stream=True,
+        )
+    except requests.Timeout as err:
+        raise RuntimeError(f"Server too slow: {err}")
+    except Exception as e:
+        raise RuntimeError(f"Request failed: {e}")
 
-    if last_exc:
-        raise RuntimeError(str(last_exc))
+    try:
+        if not (200 <= resp.status_code < 300):
+            msg = _extract_error(resp)
+            raise requests.HTTPError(msg, response=resp)
 
-    raise RuntimeError("Unexpected request failure")
+        body = read_body(resp)
+    finally:
+        resp.close()
+    try:
+        return jsonlib.loads(body)
+    except Exception:
+        return {"ok": False, "raw": body[:ERROR_BODY_BYTES].decode("utf-8", errors="replace")}
 
 
 # ======================================================
@@ -176,7 +320,9 @@ def update_profile(token: str,
                    name: Optional[str] = None,
                    upi_id: Optional[str] = None) -> Dict[str, Any]:
     """
-    Backend expects PATCH /users/me with JSON body
+    Backend expects PATCH /users/me with JSON body.
+    When the server can't be reached the edit is queued in the profile outbox
+    and {"queued": True, ...fields} is returned instead of raising.
     """
     payload: Dict[str, Any] = {}
     if name is not None:
@@ -184,7 +330,12 @@ def update_profile(token: str,
     if upi_id is not None:
         payload["upi_id"] = upi_id.strip()
 
-    return _request("PATCH", "/users/me", json=payload, token=token)
+    try:
+        return _request("PATCH", "/users/me", json=payload, token=token, deadline=TIMEOUT)
+    except RuntimeError:
+        # transport failure (HTTP errors propagate as requests.HTTPError)
+        profile_outbox.enqueue("PATCH", _url("/users/me"), payload)
+        return {"queued": True, **payload}
 
 
 # ======================================================
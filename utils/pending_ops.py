@@ -0,0 +1,190 @@
+"""
+Idempotency keys and a pending-operation journal for server mutations.
+
+Rolls, forfeits and wallet requests are sent with an Idempotency-Key header
+and recorded here until the server gives a definite answer. If an attempt
+times out the outcome is unknown, so the operation stays in the journal and
+`reconcile()` re-sends it later with the same key: the backend either applies
+it once or returns the original result, never both.
+
+The journal lives in memory for the app session and is capped in size and age.
+
+An op can carry a `scope` (rolls use match id + turn). A scoped op is only
+re-sent while the check registered for its kind still accepts that scope;
+otherwise it is dropped unsent. With no check registered (the game screen is
+gone), scoped ops are never re-sent.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils.retry_policy import IDEMPOTENCY_HEADER, http_request
+
+MAX_OPS = 50
+MAX_AGE = 10 * 60  # seconds a key is worth re-sending
+
+OP_ROLL = "roll"
+OP_FORFEIT = "forfeit"
+OP_RECHARGE = "recharge"
+OP_WITHDRAW = "withdraw"
+WALLET_KINDS = (OP_RECHARGE, OP_WITHDRAW)
+STAGE_KINDS = (OP_FORFEIT,) + WALLET_KINDS  # everything that outlives a match turn
+
+_lock = threading.Lock()
+_ops: "OrderedDict[str, PendingOp]" = OrderedDict()
+_listeners: Dict[str, List[Callable]] = {}
+_scope_checks: Dict[str, Callable] = {}
+_reconciling = threading.Event()
+
+
+class PendingOp:
+    __slots__ = ("key", "kind", "method", "url", "body", "headers", "created", "attempts", "scope")
+
+    def __init__(self, kind: str, method: str, url: str, body=None, headers: Optional[dict] = None, scope=None):
+        self.key = uuid.uuid4().hex
+        self.kind = kind
+        self.method = method.upper()
+        self.url = url
+        self.body = body
+        self.headers = dict(headers or {})
+        self.headers[IDEMPOTENCY_HEADER] = self.key
+        self.created = time.time()
+        self.attempts = 0
+        self.scope = scope
+
+    def __repr__(self) -> str:
+        return f"PendingOp({self.kind}, {self.method} {self.url}, key={self.key[:8]}, attempts={self.attempts})"
+
+
+def _prune():
+    cutoff = time.time() - MAX_AGE
+    for key in [k for k, op in _ops.items() if op.created < cutoff]:
+        _ops.pop(key, None)
+    while len(_ops) > MAX_OPS:
+        _ops.popitem(last=False)
+
+
+def begin(kind: str, method: str, url: str, body=None, headers: Optional[dict] = None, scope=None) -> PendingOp:
+    """Create and journal a keyed operation; send it with `send()`."""
+    op = PendingOp(kind, method, url, body, headers, scope)
+    with _lock:
+        _ops[op.key] = op
+        _prune()
+    return op
+
+
+def resolve(key: str):
+    with _lock:
+        _ops.pop(key, None)
+
+
+def discard(kind: str) -> int:
+    """Drop every journaled op of `kind` without sending it; returns how many were dropped."""
+    with _lock:
+        keys = [k for k, op in _ops.items() if op.kind == kind]
+        for key in keys:
+            _ops.pop(key, None)
+    return len(keys)
+
+
+def set_scope_check(kind: str, check: Optional[Callable]):
+    """`check(scope) -> bool` decides whether a scoped op of `kind` may still be re-sent."""
+    if check is None:
+        _scope_checks.pop(kind, None)
+    else:
+        _scope_checks[kind] = check
+
+
+def _in_scope(op: PendingOp) -> bool:
+    if op.scope is None:
+        return True
+    check = _scope_checks.get(op.kind)
+    try:
+        return bool(check and check(op.scope))
+    except Exception as e:
+        print(f"[PENDING][ERR] scope check for {op.kind}: {e}")
+        return False
+
+
+def pending(kind: Optional[str] = None) -> List[PendingOp]:
+    with _lock:
+        _prune()
+        return [op for op in _ops.values() if kind is None or op.kind == kind]
+
+
+def send(op: PendingOp, *, timeout: float = 5, deadline: Optional[float] = None, **kwargs):
+    """
+    Send (or re-send) `op` with its idempotency key. Any HTTP answer below 500
+    is definite and resolves the op; transport errors and 5xx keep it journaled.
+    """
+    op.attempts += 1
+    resp = http_request(
+        op.method,
+        op.url,
+        json=op.body,
+        headers=op.headers,
+        timeout=timeout,
+        deadline=deadline,
+        **kwargs,
+    )
+    if resp.status_code < 500:
+        resolve(op.key)
+    return resp
+
+
+def add_listener(kind: str, callback: Callable):
+    """callback(op, resp) runs on the reconcile thread when a journaled op gets its answer."""
+    _listeners.setdefault(kind, [])
+    if callback not in _listeners[kind]:
+        _listeners[kind].append(callback)
+
+
+def remove_listener(kind: str, callback: Callable):
+    if callback in _listeners.get(kind, []):
+        _listeners[kind].remove(callback)
+
+
+def reconcile(timeout: float = 6, kinds: Optional[Iterable[str]] = None, **kwargs) -> int:
+    """Re-send every journaled op (of `kinds`, default all) once; returns how many were settled."""
+    settled = 0
+    kinds = set(kinds) if kinds is not None else None
+    for op in pending():
+        if kinds is not None and op.kind not in kinds:
+            continue
+        if not _in_scope(op):
+            print(f"[PENDING] dropping {op!r}: out of scope")
+            resolve(op.key)
+            continue
+        try:
+            resp = send(op, timeout=timeout, deadline=timeout * 2, **kwargs)
+        except Exception as e:
+            print(f"[PENDING][WARN] {op!r} still unresolved: {e}")
+            continue
+        if resp.status_code >= 500:
+            continue
+        settled += 1
+        for callback in list(_listeners.get(op.kind, [])):
+            try:
+                callback(op, resp)
+            except Exception as e:
+                print(f"[PENDING][ERR] listener for {op.kind}: {e}")
+    return settled
+
+
+def reconcile_async(kinds: Optional[Iterable[str]] = None, **kwargs):
+    """Run `reconcile()` on a worker thread unless one is already running or nothing is pending."""
+    kinds = tuple(kinds) if kinds is not None else None
+    if _reconciling.is_set() or not any(kinds is None or op.kind in kinds for op in pending()):
+        return
+
+    def worker():
+        try:
+            reconcile(kinds=kinds, **kwargs)
+        finally:
+            _reconciling.clear()
+
+    _reconciling.set()
+    threading.Thread(target=worker, daemon=True).start()
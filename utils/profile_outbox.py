@@ -0,0 +1,277 @@
+"""
+Durable outbox for profile and settings updates.
+
+Edits to the user's profile are queued here first and sent afterwards, so a
+flaky network never loses them. The queue is written to a JSON file (the app
+points it at `user_data_dir` on start, or set PROFILE_OUTBOX_PATH) and survives
+restarts. Repeated edits to the same endpoint merge field by field into the
+queued entry, so only the latest value of each field is sent.
+
+`flush()` sends entries oldest first and stops at the first transport error or
+5xx, keeping the rest for the next attempt. A 4xx answer is definite: the entry
+is dropped and listeners are told why. Auth tokens are never written to disk;
+the current session token is used at flush time.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.retry_policy import http_request
+
+try:
+    from utils import storage
+except Exception:
+    storage = None
+
+OUTBOX_PATH_ENV = "PROFILE_OUTBOX_PATH"
+OUTBOX_FILE = "profile_outbox.json"
+
+_lock = threading.RLock()
+_flushing = threading.Event()
+_flush_lock = threading.Lock()  # one flush at a time, whoever starts it
+_flush_waiters: List[Callable] = []
+_entries: List[Dict[str, Any]] = []
+_loaded = False
+_path: Optional[str] = (os.getenv(OUTBOX_PATH_ENV) or "").strip() or None
+_last_error: Optional[str] = None
+_listeners: List[Callable] = []
+_status_listeners: List[Callable] = []
+
+
+def set_directory(folder: str):
+    """Keep the outbox file in `folder` (unless PROFILE_OUTBOX_PATH overrides it)."""
+    global _path, _loaded
+    if os.getenv(OUTBOX_PATH_ENV) or not folder:
+        return
+    with _lock:
+        _path = os.path.join(folder, OUTBOX_FILE)
+        _loaded = False
+        _load()
+
+
+def _load():
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not _path or not os.path.exists(_path):
+        return
+    try:
+        with open(_path, "r", encoding="utf-8") as fh:
+            stored = json.load(fh)
+    except Exception as e:
+        print(f"[OUTBOX][WARN] Ignoring unreadable {_path}: {e}")
+        return
+    known = {(e["method"], e["url"]) for e in _entries}
+    for entry in stored if isinstance(stored, list) else []:
+        if not isinstance(entry, dict) or not entry.get("url") or not isinstance(entry.get("fields"), dict):
+            continue
+        entry["sending"] = False
+        if (entry.get("method"), entry["url"]) not in known:
+            _entries.append(entry)
+
+
+def _save():
+    if not _path:
+        return
+    tmp = f"{_path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump([{k: v for k, v in e.items() if k != "sending"} for e in _entries], fh)
+        os.replace(tmp, _path)
+    except Exception as e:
+        print(f"[OUTBOX][WARN] Could not persist outbox: {e}")
+
+
+def _notify_status():
+    snap = status()
+    for callback in list(_status_listeners):
+        try:
+            callback(snap)
+        except Exception as e:
+            print(f"[OUTBOX][ERR] status listener: {e}")
+
+
+def enqueue(method: str, url: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Queue `fields` for `method url`. Fields merge into an entry for the same
+    endpoint that has not started sending yet; otherwise a new entry is added.
+    """
+    method = method.upper()
+    with _lock:
+        _load()
+        target = None
+        for entry in reversed(_entries):
+            if entry["method"] == method and entry["url"] == url and not entry.get("sending"):
+                target = entry
+                break
+        if target is None:
+            target = {"method": method, "url": url, "fields": {}, "created": time.time(), "attempts": 0}
+            _entries.append(target)
+        target["fields"].update(fields)
+        target["updated"] = time.time()
+        _save()
+    _notify_status()
+    return target
+
+
+def pending() -> List[Dict[str, Any]]:
+    with _lock:
+        _load()
+        return [dict(e, fields=dict(e["fields"])) for e in _entries]
+
+
+def pending_fields(url: Optional[str] = None) -> Dict[str, Any]:
+    """Queued values merged oldest to newest, so the UI can show unsynced edits."""
+    merged: Dict[str, Any] = {}
+    for entry in pending():
+        if url is None or entry["url"] == url:
+            merged.update(entry["fields"])
+    return merged
+
+
+def status() -> Dict[str, Any]:
+    with _lock:
+        _load()
+        count = len(_entries)
+    return {"pending": count, "flushing": _flushing.is_set(), "last_error": _last_error}
+
+
+def status_text() -> str:
+    snap = status()
+    if not snap["pending"]:
+        return "All changes synced"
+    noun = "change" if snap["pending"] == 1 else "changes"
+    if snap["flushing"]:
+        return f"Syncing {snap['pending']} {noun}..."
+    if snap["last_error"]:
+        return f"Offline: {snap['pending']} {noun} waiting"
+    return f"{snap['pending']} {noun} waiting to sync"
+
+
+def add_listener(callback: Callable):
+    """callback(entry, resp) runs on the flush thread when an entry gets a definite answer."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback: Callable):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def add_status_listener(callback: Callable):
+    """callback(status_dict) runs whenever the queue or its sync state changes (any thread)."""
+    if callback not in _status_listeners:
+        _status_listeners.append(callback)
+
+
+def remove_status_listener(callback: Callable):
+    if callback in _status_listeners:
+        _status_listeners.remove(callback)
+
+
+def flush(token: Optional[str] = None, *, timeout: float = 5, deadline: float = 8, **kwargs) -> int:
+    """
+    Send queued entries in order; returns how many got a definite answer.
+    Single-flight: while another flush runs this returns 0 at once (the
+    running flush keeps going until the queue is empty, new entries included).
+    """
+    token = token or (storage.get_token() if storage else None)
+    if not token:
+        return 0
+    if not _flush_lock.acquire(blocking=False):
+        return 0
+    try:
+        return _flush_locked(token, timeout, deadline, **kwargs)
+    finally:
+        _flush_lock.release()
+
+
+def _flush_locked(token: str, timeout: float, deadline: float, **kwargs) -> int:
+    global _last_error
+    done = 0
+    while True:
+        with _lock:
+            _load()
+            entry = next((e for e in _entries if not e.get("sending")), None)
+            if entry is None:
+                break
+            entry["sending"] = True
+            entry["attempts"] = entry.get("attempts", 0) + 1
+            fields = dict(entry["fields"])
+        try:
+            resp = http_request(
+                entry["method"],
+                entry["url"],
+                json=fields,
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=timeout,
+                deadline=deadline,
+                **kwargs,
+            )
+        except Exception as e:
+            resp = None
+            _last_error = str(e)
+        with _lock:
+            entry["sending"] = False
+            if resp is None or resp.status_code >= 500:
+                if resp is not None:
+                    _last_error = f"HTTP {resp.status_code}"
+                _save()
+                break
+            if entry in _entries:
+                _entries.remove(entry)
+            _save()
+        _last_error = None
+        done += 1
+        for callback in list(_listeners):
+            try:
+                callback(entry, resp)
+            except Exception as e:
+                print(f"[OUTBOX][ERR] listener: {e}")
+    return done
+
+
+def flush_async(on_done: Optional[Callable[[], None]] = None, **kwargs):
+    """
+    Run `flush()` on a worker thread unless one is running or nothing is queued.
+    `on_done()` runs (on that thread) once the running or new flush has finished.
+    """
+    with _lock:
+        if on_done is not None:
+            _flush_waiters.append(on_done)
+        if _flushing.is_set():
+            return
+        _load()
+        if not _entries:
+            waiters = _flush_waiters[:]
+            del _flush_waiters[:]
+        else:
+            waiters = None
+            _flushing.set()
+    if waiters is not None:
+        for callback in waiters:
+            callback()
+        return
+
+    def worker():
+        try:
+            flush(**kwargs)
+        finally:
+            with _lock:
+                _flushing.clear()
+                waiters = _flush_waiters[:]
+                del _flush_waiters[:]
+            _notify_status()
+            for callback in waiters:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"[OUTBOX][ERR] flush callback: {e}")
+
+    _notify_status()
+    threading.Thread(target=worker, daemon=True).start()
@@ -0,0 +1,360 @@
+"""
+Adaptive rendering quality.
+
+The app starts on the tier saved by the last launch. A short CPU benchmark
+sets the ceiling. It runs on a worker thread once the app has settled and
+keeps the fastest of a few runs. Its result is saved and measured again
+when it gets old, or when the app runs smoothly at the ceiling. A frame-time
+monitor keeps checking the tier while the app runs. When too many frames
+miss ~50 fps the tier steps down. After a long stretch of smooth frames it steps
+back up, but never above what the benchmark allowed. Screens read settings
+with `setting(name)` at the moment they build an animation, so a change
+applies to the next roll, hop or transition and never to one already running.
+
+    transition       "fade" or "none" for the ScreenManager
+    hop_keyframes    keyframes per coin hop: 2 = arc, 1 = straight slide
+    max_hops         longest coin path animated box by box (longer paths are thinned)
+    pulses           repeating turn / "Searching" pulses on or off
+    spin_zoom_steps  scale keyframes in PolygonDice.animate_spin (0 = no zoom)
+    texture_scale    1.0 uses the normal images; below that, `asset()` prefers
+                     the pre-scaled copy under assets/low/ when it is packaged
+
+DICE_QUALITY=low|medium|high pins the tier and turns adaptation off. The
+chosen tier is kept in render_quality.json (in `user_data_dir`) so the next
+launch starts where this one ended.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+QUALITY_ENV = "DICE_QUALITY"
+QUALITY_FILE = "render_quality.json"
+TIERS = ("low", "medium", "high")
+
+SETTINGS: Dict[str, Dict[str, Any]] = {
+    "low": {
+        "transition": "none",
+        "hop_keyframes": 1,
+        "max_hops": 4,
+        "pulses": False,
+        "spin_zoom_steps": 0,
+        "texture_scale": 0.5,
+    },
+    "medium": {
+        "transition": "none",
+        "hop_keyframes": 2,
+        "max_hops": 8,
+        "pulses": True,
+        "spin_zoom_steps": 1,
+        "texture_scale": 1.0,
+    },
+    "high": {
+        "transition": "fade",
+        "hop_keyframes": 2,
+        "max_hops": 0,  # no limit
+        "pulses": True,
+        "spin_zoom_steps": 3,
+        "texture_scale": 1.0,
+    },
+}
+
+# benchmark: milliseconds for BENCH_LOOPS iterations, fastest of BENCH_RUNS
+BENCH_LOOPS = 60000
+BENCH_RUNS = 5
+BENCH_GAP_S = 0.05  # pause between runs, so a busy UI thread isn't timed into every one
+BENCH_MAX_AGE_S = 7 * 24 * 3600.0  # a saved benchmark older than this is measured again
+BENCH_HIGH_MS = 25.0
+BENCH_MEDIUM_MS = 60.0
+FIRST_RUN_TIER = "medium"  # until the first benchmark is in
+
+SLOW_FRAME_S = 1 / 50.0
+STALL_S = 0.5  # longer gaps are loads/GC/screen builds, not rendering
+WINDOW_FRAMES = 120
+DOWNGRADE_SLOW_SHARE = 0.25  # share of slow frames in a window that counts as janky
+DOWNGRADE_WINDOWS = 2  # consecutive janky windows before stepping down
+UPGRADE_WINDOWS = 30  # consecutive clean windows before stepping up
+UPGRADE_COOLDOWN_S = 120.0  # no step up this soon after a step down
+
+_lock = threading.RLock()
+_tier: Optional[str] = None
+_ceiling = "high"
+_pinned = False
+_bench_ms: Optional[float] = None
+_bench_at = 0.0  # wall-clock time of the saved benchmark
+_calibrating = False
+_recalibrated = False  # smooth play at the ceiling already asked for a re-measure
+_saved_start = False  # the starting tier came from a previous launch
+_path: Optional[str] = None
+_listeners: List[Callable[[str], None]] = []
+
+_frames: deque = deque(maxlen=WINDOW_FRAMES)
+_counted = 0
+_janky_windows = 0
+_clean_windows = 0
+_last_downgrade = 0.0
+_monitor_ev = None
+_asset_cache: Dict[str, str] = {}
+
+
+def benchmark() -> float:
+    """Time a fixed chunk of interpreter work (float math, dict and list churn) in ms."""
+    started = time.perf_counter()
+    acc = 0.0
+    scratch: Dict[int, float] = {}
+    for i in range(BENCH_LOOPS):
+        acc += (i % 7) * 0.5 - (i % 3)
+        scratch[i & 255] = acc
+    _ = [v * 2 for v in scratch.values()]
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _tier_for_benchmark(ms: float) -> str:
+    cores = os.cpu_count() or 1
+    if ms <= BENCH_HIGH_MS and cores >= 4:
+        return "high"
+    if ms <= BENCH_MEDIUM_MS and cores >= 2:
+        return "medium"
+    return "low"
+
+
+def _read_saved() -> Dict[str, Any]:
+    if not _path or not os.path.exists(_path):
+        return {}
+    try:
+        with open(_path, "r", encoding="utf-8") as fh:
+            saved = json.load(fh)
+    except Exception as e:
+        print(f"[QUALITY][WARN] Ignoring unreadable {_path}: {e}")
+        return {}
+    if not isinstance(saved, dict):
+        return {}
+    if saved.get("tier") not in TIERS:
+        saved["tier"] = None
+    if not isinstance(saved.get("bench_ms"), (int, float)):
+        saved["bench_ms"] = None
+    if not isinstance(saved.get("bench_at"), (int, float)):
+        saved["bench_at"] = 0.0
+    return saved
+
+
+def _save():
+    if not _path:
+        return
+    tmp = f"{_path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"tier": _tier, "bench_ms": _bench_ms, "bench_at": _bench_at, "saved": time.time()}, fh)
+        os.replace(tmp, _path)
+    except Exception as e:
+        print(f"[QUALITY][WARN] Could not persist tier: {e}")
+
+
+def init(folder: Optional[str] = None) -> str:
+    """Pick the starting tier from the saved one (no benchmark here); `folder` is where it is remembered."""
+    global _ceiling, _pinned, _bench_ms, _bench_at, _path, _saved_start
+    with _lock:
+        if folder:
+            _path = os.path.join(folder, QUALITY_FILE)
+        forced = (os.getenv(QUALITY_ENV) or "").strip().lower()
+        if forced in TIERS:
+            _pinned = True
+            _ceiling = forced
+            _set_tier(forced, "pinned by " + QUALITY_ENV)
+            return forced
+
+        saved = _read_saved()
+        _bench_ms = saved.get("bench_ms")
+        _bench_at = saved.get("bench_at") or 0.0
+        if _bench_ms is not None:
+            _ceiling = _tier_for_benchmark(_bench_ms)
+        _saved_start = bool(saved.get("tier"))
+        start = saved.get("tier") or FIRST_RUN_TIER
+        if TIERS.index(start) > TIERS.index(_ceiling):
+            start = _ceiling
+        _set_tier(start, "saved" if _saved_start else "first run")
+        return start
+
+
+def calibrate_async(force: bool = False):
+    """
+    Run the benchmark on a worker thread when there is no saved one, it is older
+    than BENCH_MAX_AGE_S, or `force` is set (never when the tier is pinned).
+    The new ceiling is applied on the Kivy thread. It caps the tier, and on a
+    first run it also becomes the tier.
+    """
+    global _calibrating
+    with _lock:
+        fresh = _bench_ms is not None and time.time() - _bench_at < BENCH_MAX_AGE_S
+        if _pinned or _calibrating or (fresh and not force):
+            return
+        _calibrating = True
+
+    def worker():
+        global _calibrating
+        try:
+            runs = []
+            for _ in range(BENCH_RUNS):
+                runs.append(benchmark())
+                time.sleep(BENCH_GAP_S)
+            ms = min(runs)  # contention only ever makes a run slower
+        finally:
+            with _lock:
+                _calibrating = False
+        from kivy.clock import Clock
+
+        Clock.schedule_once(lambda dt: _apply_benchmark(ms, keep_best=force), 0)
+
+    threading.Thread(target=worker, daemon=True, name="quality-bench").start()
+
+
+def _apply_benchmark(ms: float, keep_best: bool = False):
+    global _ceiling, _bench_ms, _bench_at
+    with _lock:
+        if keep_best and _bench_ms is not None:
+            ms = min(ms, _bench_ms)  # a re-measure only ever raises the ceiling
+        _bench_ms = ms
+        _bench_at = time.time()
+        _ceiling = _tier_for_benchmark(ms)
+        current = tier()
+        start = current
+        if TIERS.index(current) > TIERS.index(_ceiling):
+            start = _ceiling
+        elif not _saved_start and current == FIRST_RUN_TIER:
+            start = _ceiling  # first run and the monitor hasn't moved it yet
+        reason = f"benchmark {ms} ms, ceiling {_ceiling}"
+        if start == current:
+            _save()  # keep the benchmark for the next launch
+            print(f"[QUALITY] {reason}")
+            return
+    _set_tier(start, reason)
+
+
+def tier() -> str:
+    with _lock:
+        return _tier or "high"
+
+
+def setting(name: str) -> Any:
+    return SETTINGS[tier()][name]
+
+
+def add_listener(callback: Callable[[str], None]):
+    """`callback(tier)` runs (on the Kivy thread) whenever the tier changes."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback: Callable[[str], None]):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def _set_tier(new_tier: str, reason: str):
+    global _tier
+    with _lock:
+        if new_tier == _tier:
+            return
+        old, _tier = _tier, new_tier
+        _asset_cache.clear()
+        _save()
+    print(f"[QUALITY] {old or '-'} -> {new_tier} ({reason})")
+    for callback in list(_listeners):
+        try:
+            callback(new_tier)
+        except Exception as e:
+            print(f"[QUALITY][ERR] listener: {e}")
+
+
+def asset(path: str) -> str:
+    """`path`, or its assets/low/ copy on tiers with texture_scale < 1 when that file exists."""
+    if setting("texture_scale") >= 1.0 or not path.startswith("assets/"):
+        return path
+    cached = _asset_cache.get(path)
+    if cached is None:
+        low = "assets/low/" + path[len("assets/"):]
+        cached = low if os.path.exists(low) else path
+        _asset_cache[path] = cached
+    return cached
+
+
+# ---------- frame-time monitor ----------
+def record_frame(dt: float):
+    """Feed one frame interval (seconds); steps the tier when a full window says so."""
+    global _counted, _janky_windows, _clean_windows, _last_downgrade, _recalibrated
+    if _pinned or dt <= 0 or dt >= STALL_S:
+        return
+    _frames.append(dt)
+    _counted += 1
+    if _counted < WINDOW_FRAMES:
+        return
+    _counted = 0
+    slow = sum(1 for f in _frames if f > SLOW_FRAME_S)
+    share = slow / float(len(_frames))
+    current = TIERS.index(tier())
+    if share >= DOWNGRADE_SLOW_SHARE:
+        _janky_windows += 1
+        _clean_windows = 0
+        if _janky_windows >= DOWNGRADE_WINDOWS and current > 0:
+            _janky_windows = 0
+            _last_downgrade = time.monotonic()
+            _set_tier(TIERS[current - 1], f"{share:.0%} of frames over {SLOW_FRAME_S * 1000:.0f} ms")
+        return
+    _janky_windows = 0
+    if slow:
+        _clean_windows = 0
+        return
+    _clean_windows += 1
+    if (
+            _clean_windows >= UPGRADE_WINDOWS
+            and current < TIERS.index(_ceiling)
+            and time.monotonic() - _last_downgrade >= UPGRADE_COOLDOWN_S
+    ):
+        _clean_windows = 0
+        _set_tier(TIERS[current + 1], f"{UPGRADE_WINDOWS} smooth windows")
+    elif _clean_windows >= UPGRADE_WINDOWS and current == TIERS.index(_ceiling) < len(TIERS) - 1 and not _recalibrated:
+        # smooth at the ceiling: the benchmark may have been taken on a busy start
+        _recalibrated = True
+        calibrate_async(force=True)
+
+
+def start_monitor():
+    """Sample every frame interval from the Kivy clock (no-op when pinned or already running)."""
+    global _monitor_ev
+    if _pinned or _monitor_ev is not None:
+        return
+    from kivy.clock import Clock
+
+    _reset_window()
+    _monitor_ev = Clock.schedule_interval(lambda dt: record_frame(dt), 0)
+
+
+def stop_monitor():
+    global _monitor_ev
+    if _monitor_ev is not None:
+        _monitor_ev.cancel()
+        _monitor_ev = None
+
+
+def _reset_window():
+    global _counted, _janky_windows, _clean_windows
+    _frames.clear()
+    _counted = 0
+    _janky_windows = 0
+    _clean_windows = 0
+
+
+def stats() -> Dict[str, Any]:
+    frames = list(_frames)
+    return {
+        "tier": tier(),
+        "ceiling": _ceiling,
+        "pinned": _pinned,
+        "bench_ms": _bench_ms,
+        "monitoring": _monitor_ev is not None,
+        "avg_frame_ms": round(sum(frames) / len(frames) * 1000, 1) if frames else None,
+        "slow_frames": sum(1 for f in frames if f > SLOW_FRAME_S),
+    }
@@ -0,0 +1,220 @@
+"""
+Retry policy engine shared by every HTTP call site.
+
+Rules are matched per endpoint (method + path prefix, first match wins) and
+decide how many times a request may be retried and with what backoff.
+Non-idempotent methods are only retried when the request carries an
+Idempotency-Key header, so a roll, forfeit or wallet mutation can never be
+sent twice by accident. Each call may carry a deadline that bounds the total
+time spent across attempts (attempt timeouts shrink to fit), and a per-host
+circuit breaker fails fast after repeated transport failures.
+
+Sleeping between attempts happens on the calling thread, which for this app
+is always a background worker.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from utils.net_telemetry import timed_request
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("HTTP_BREAKER_COOLDOWN", "10"))
+MIN_ATTEMPT_TIMEOUT = 0.5
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's breaker is open."""
+
+
+class RetryRule:
+    __slots__ = ("retries", "base_delay", "max_delay", "retry_unsafe")
+
+    def __init__(self, retries: int = 2, base_delay: float = 0.3, max_delay: float = 3.0, retry_unsafe: bool = False):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # retry non-idempotent methods even without an idempotency key (never for money or dice)
+        self.retry_unsafe = retry_unsafe
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given (0-based) retry."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, cap)
+
+
+DEFAULT_RULE = RetryRule(retries=int(os.getenv("OTP_HTTP_RETRIES", "2")))
+NO_RETRY = RetryRule(retries=0)
+
+# (method or "*", path prefix, rule); first match wins
+RULES: List[Tuple[str, str, RetryRule]] = [
+    ("POST", "/matches/roll", RetryRule(retries=2, base_delay=0.2, max_delay=1.0)),
+    ("POST", "/matches/forfeit", RetryRule(retries=2, base_delay=0.3, max_delay=1.5)),
+    ("POST", "/wallet/", RetryRule(retries=2, base_delay=0.5, max_delay=2.0)),
+    ("POST", "/auth/send-otp", NO_RETRY),
+    ("POST", "/auth/login/request-otp", NO_RETRY),
+    # credential checks have no side effects, so they may be retried without a key
+    ("POST", "/auth/login/password-check", RetryRule(retries=2, retry_unsafe=True)),
+    ("GET", "/matches/check", RetryRule(retries=2, base_delay=0.15, max_delay=1.0)),
+    ("GET", "/health", NO_RETRY),
+    ("GET", "/matches/ping", NO_RETRY),
+    ("*", "/", DEFAULT_RULE),
+]
+
+
+def rule_for(method: str, url: str) -> RetryRule:
+    path = urlparse(url).path or "/"
+    method = method.upper()
+    for rule_method, prefix, rule in RULES:
+        if rule_method in ("*", method) and path.startswith(prefix):
+            return rule
+    return DEFAULT_RULE
+
+
+class _Breaker:
+    __slots__ = ("failures", "opened_at", "probing")
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+
+_breakers: Dict[str, _Breaker] = {}
+_breaker_lock = threading.Lock()
+
+
+def _breaker_allows(host: str) -> bool:
+    with _breaker_lock:
+        br = _breakers.get(host)
+        if br is None or br.failures < BREAKER_THRESHOLD:
+            return True
+        if time.monotonic() - br.opened_at < BREAKER_COOLDOWN:
+            return False
+        # half-open: let a single trial request through
+        if br.probing:
+            return False
+        br.probing = True
+        return True
+
+
+def _breaker_end_probe(host: str):
+    """Let the next trial through when a probe ended without a verdict (e.g. SSLError, InvalidURL)."""
+    with _breaker_lock:
+        br = _breakers.get(host)
+        if br is not None:
+            br.probing = False
+
+
+def _breaker_record(host: str, ok: bool):
+    with _breaker_lock:
+        br = _breakers.setdefault(host, _Breaker())
+        br.probing = False
+        if ok:
+            br.failures = 0
+            return
+        br.failures += 1
+        if br.failures >= BREAKER_THRESHOLD:
+            br.opened_at = time.monotonic()
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retry_safe(method: str, headers: Optional[dict], rule: RetryRule) -> bool:
+    if method.upper() in IDEMPOTENT_METHODS or rule.retry_unsafe:
+        return True
+    return bool(headers and headers.get(IDEMPOTENCY_HEADER))
+
+
+def http_request(
+        method: str,
+        url: str,
+        *,
+        deadline: Optional[float] = None,
+        rule: Optional[RetryRule] = None,
+        **kwargs,
+) -> requests.Response:
+    """
+    requests.request with the endpoint's retry rule applied.
+    `deadline` is a budget in seconds for all attempts together.
+    Returns the last response (which may be an error status); raises the last
+    transport error when every attempt failed.
+    """
+    method = method.upper()
+    rule = rule or rule_for(method, url)
+    retries = rule.retries if is_retry_safe(method, kwargs.get("headers"), rule) else 0
+    host = urlparse(url).netloc
+    timeout = kwargs.pop("timeout", None)
+    ends_at = time.monotonic() + deadline if deadline else None
+
+    attempt = 0
+    while True:
+        attempt_timeout = timeout
+        if ends_at is not None:
+            remaining = ends_at - time.monotonic()
+            if remaining < MIN_ATTEMPT_TIMEOUT:
+                raise requests.Timeout(f"Deadline exceeded for {method} {url}")
+            attempt_timeout = min(timeout, remaining) if timeout else remaining
+
+        # checked last: a half-open breaker hands out its single probe here
+        if not _breaker_allows(host):
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        resp = None
+        delay = None
+        recorded = False
+        try:
+            resp = timed_request(method, url, attempt=attempt, timeout=attempt_timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            _breaker_record(host, ok=False)
+            recorded = True
+            if attempt >= retries:
+                raise
+        else:
+            _breaker_record(host, ok=resp.status_code < 500)
+            recorded = True
+            if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+                return resp
+            delay = _retry_after(resp)
+        finally:
+            if not recorded:
+                _breaker_end_probe(host)
+
+        if delay is None:
+            delay = rule.backoff(attempt)
+        if ends_at is not None and ends_at - time.monotonic() - delay < MIN_ATTEMPT_TIMEOUT:
+            # no room for another attempt inside the deadline
+            if resp is not None:
+                return resp
+            raise requests.Timeout(f"Deadline exceeded for {method} {url}")
+        if resp is not None:
+            resp.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    return http_request("POST", url, **kwargs)
+
+
+def http_patch(url: str, **kwargs) -> requests.Response:
+    return http_request("PATCH", url, **kwargs)
@@ -1,17 +1,25 @@
 import requests
 
+from utils import profile_outbox
+from utils.retry_policy import http_post
+
 BACKEND_URL = "https://spin-api-pba3.onrender.com"
 
 def save_user_settings(phone, name, description, upi_id):
+    """True when the server saved it; offline edits go to the profile outbox and return False."""
+    payload = {
+        "phone": phone,
+        "name": name,
+        "description": description,
+        "upi_id": upi_id,
+    }
     try:
-        payload = {
-            "phone": phone,
-            "name": name,
-            "description": description,
-            "upi_id": upi_id,
-        }
-        response = requests.post(f"{BACKEND_URL}/save-settings/", json=payload, timeout=5)
+        response = http_post(f"{BACKEND_URL}/save-settings/", json=payload, timeout=5)
         return response.status_code == 200
+    except requests.RequestException as e:
+        print(f"[WARN] Settings queued until online: {e}")
+        profile_outbox.enqueue("POST", f"{BACKEND_URL}/save-settings/", payload)
+        return False
     except Exception as e:
         print(f"[ERROR] Failed to save settings: {e}")
         return False
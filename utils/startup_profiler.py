@@ -0,0 +1,187 @@
+"""
+Cold-start profiling: time to first frame and a per-module import breakdown.
+
+main.py calls `install()` before importing anything heavy. The clock starts
+there, and with DICE_STARTUP_PROFILE=1 every first-time import on the main
+thread is timed (self time excludes nested imports, total includes them).
+`watch_first_frame()` stops the clock on the window's first flip, prints the
+report and checks it against STARTUP_BUDGET_MS (default 2500 ms on Android,
+no budget elsewhere).
+
+CI / desktop check, no window needed:
+
+    python -m utils.startup_profiler main --budget 800
+
+imports `main` with the hook installed, prints the breakdown and exits 1 when
+the import phase alone goes over budget.
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+PROFILE_ENV = "DICE_STARTUP_PROFILE"
+BUDGET_ENV = "STARTUP_BUDGET_MS"
+ANDROID_BUDGET_MS = 2500.0
+
+_t0 = time.perf_counter()
+_real_import = None
+_stack: List[float] = []
+_imports: Dict[str, List[float]] = {}  # name -> [self_s, total_s]
+_outermost_s = 0.0  # time spent in imports not nested inside another timed import
+_marks: List[tuple] = []
+_first_frame_ms: Optional[float] = None
+
+
+def enabled() -> bool:
+    return os.getenv(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def default_budget_ms() -> Optional[float]:
+    raw = os.getenv(BUDGET_ENV)
+    if raw:
+        try:
+            return float(raw)
+        except ValueError:
+            return None
+    # python-for-android sets ANDROID_ARGUMENT for the app process
+    return ANDROID_BUDGET_MS if "ANDROID_ARGUMENT" in os.environ else None
+
+
+def _elapsed_ms() -> float:
+    return round((time.perf_counter() - _t0) * 1000, 1)
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    global _outermost_s
+    if level == 0 and name in sys.modules:
+        return _real_import(name, globals, locals, fromlist, level)
+    if threading.current_thread() is not threading.main_thread():
+        return _real_import(name, globals, locals, fromlist, level)
+
+    key = name if level == 0 else "." * level + name
+    started = time.perf_counter()
+    _stack.append(0.0)
+    try:
+        return _real_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        else:
+            _outermost_s += elapsed
+        rec = _imports.setdefault(key, [0.0, 0.0])
+        rec[0] += elapsed - children
+        rec[1] += elapsed
+
+
+def install(force: bool = False):
+    """Start the startup clock; time imports when DICE_STARTUP_PROFILE is set (or `force`)."""
+    global _real_import
+    mark("profiler_installed")
+    if _real_import is not None or not (force or enabled()):
+        return
+    _real_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def uninstall():
+    global _real_import
+    if _real_import is not None:
+        builtins.__import__ = _real_import
+        _real_import = None
+
+
+def mark(label: str):
+    """Record a named phase at the current offset from process start."""
+    _marks.append((label, _elapsed_ms()))
+
+
+def watch_first_frame(on_done=None):
+    """Stop the clock on the first window flip, then report and check the budget."""
+    from kivy.core.window import Window
+
+    def on_flip(*_):
+        global _first_frame_ms
+        Window.unbind(on_flip=on_flip)
+        _first_frame_ms = _elapsed_ms()
+        mark("first_frame")
+        uninstall()
+        for line in format_report():
+            print(line)
+        check_budget()
+        if on_done:
+            on_done(report())
+
+    Window.bind(on_flip=on_flip)
+
+
+def report(top: int = 20) -> Dict[str, Any]:
+    rows = sorted(_imports.items(), key=lambda item: -item[1][0])
+    return {
+        "first_frame_ms": _first_frame_ms,
+        "import_ms": round(_outermost_s * 1000, 1) if _imports else None,
+        "marks": [{"label": label, "ms": ms} for label, ms in _marks],
+        "modules": [
+            {"module": name, "self_ms": round(s * 1000, 1), "total_ms": round(t * 1000, 1)}
+            for name, (s, t) in rows[:top]
+        ],
+    }
+
+
+def format_report(top: int = 20) -> List[str]:
+    data = report(top)
+    lines = [f"[STARTUP] first frame: {data['first_frame_ms'] or '-'} ms, imports: {data['import_ms'] or '-'} ms"]
+    for m in data["marks"]:
+        lines.append(f"[STARTUP]   {m['ms']:>8.1f} ms  {m['label']}")
+    for row in data["modules"]:
+        lines.append(f"[STARTUP]   {row['self_ms']:>8.1f} self {row['total_ms']:>8.1f} total  {row['module']}")
+    return lines
+
+
+def write_report(path: str):
+    try:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report(top=100), fh, indent=2)
+    except Exception as e:
+        print(f"[STARTUP][WARN] Could not write {path}: {e}")
+
+
+def check_budget(budget_ms: Optional[float] = None, measured_ms: Optional[float] = None) -> bool:
+    """True when within budget (or no budget applies); prints a warning otherwise."""
+    budget_ms = default_budget_ms() if budget_ms is None else budget_ms
+    measured_ms = _first_frame_ms if measured_ms is None else measured_ms
+    if budget_ms is None or measured_ms is None or measured_ms <= budget_ms:
+        return True
+    print(f"[STARTUP][BUDGET] {measured_ms:.0f} ms exceeds the {budget_ms:.0f} ms cold-start budget")
+    return False
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Measure import time of the app entry module.")
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--budget", type=float, default=None, help="import budget in ms")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args(argv)
+
+    install(force=True)
+    importlib.import_module(args.module)
+    uninstall()
+    for line in format_report(args.top):
+        print(line)
+    if args.json_path:
+        write_report(args.json_path)
+    return 0 if check_budget(args.budget, report()["import_ms"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
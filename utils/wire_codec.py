@@ -0,0 +1,148 @@
+"""
+Wire formats for match traffic.
+
+All decoding of /matches/* responses and match websocket frames goes through
+this module. When msgpack or cbor2 is installed the client advertises them in
+the Accept header / websocket subprotocols and decodes whatever the backend
+picks; JSON stays the fallback for servers (or frames) that do not negotiate.
+A socket whose subprotocol offer is refused reconnects without one.
+
+DICE_WIRE_FORMAT=json forces plain JSON, e.g. to compare formats on a device.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import msgpack  # type: ignore
+except Exception:
+    msgpack = None
+
+try:
+    import cbor2  # type: ignore
+except Exception:
+    cbor2 = None
+
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+FORMAT_CBOR = "cbor"
+
+_MIME = {
+    FORMAT_MSGPACK: "application/msgpack",
+    FORMAT_CBOR: "application/cbor",
+    FORMAT_JSON: "application/json",
+}
+_MIME_ALIASES = {
+    "application/x-msgpack": FORMAT_MSGPACK,
+    "application/vnd.msgpack": FORMAT_MSGPACK,
+}
+
+
+def _json_decode(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _json_encode(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# name -> (encode, decode); only formats whose library is importable are registered
+CODECS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[Any], Any]]] = {
+    FORMAT_JSON: (_json_encode, _json_decode),
+}
+if msgpack is not None:
+    CODECS[FORMAT_MSGPACK] = (
+        lambda obj: msgpack.packb(obj, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False),
+    )
+if cbor2 is not None:
+    CODECS[FORMAT_CBOR] = (cbor2.dumps, cbor2.loads)
+
+
+def preferred_formats() -> List[str]:
+    """Formats to offer the backend, most compact first."""
+    forced = (os.getenv("DICE_WIRE_FORMAT") or "").strip().lower()
+    if forced in CODECS:
+        return [forced] if forced == FORMAT_JSON else [forced, FORMAT_JSON]
+    return [fmt for fmt in (FORMAT_MSGPACK, FORMAT_CBOR, FORMAT_JSON) if fmt in CODECS]
+
+
+def accept_header() -> str:
+    formats = preferred_formats()
+    parts = []
+    for idx, fmt in enumerate(formats):
+        q = "" if idx == 0 else f";q={max(0.1, 1.0 - idx * 0.2):.1f}"
+        parts.append(_MIME[fmt] + q)
+    return ", ".join(parts)
+
+
+def match_headers(token: Optional[str] = None) -> Dict[str, str]:
+    """Headers for /matches/* calls: auth plus format negotiation."""
+    hdrs = {"Accept": accept_header()}
+    if token:
+        hdrs["Authorization"] = f"Bearer {token}"
+    return hdrs
+
+
+def ws_subprotocols() -> Optional[List[str]]:
+    """
+    Binary subprotocols to offer on the match socket, or None for a plain
+    socket. "json" is never offered: websocket-client rejects the handshake
+    when a server that doesn't negotiate leaves Sec-WebSocket-Protocol out,
+    and an un-negotiated socket is JSON anyway.
+    """
+    binary = [fmt for fmt in preferred_formats() if fmt != FORMAT_JSON]
+    return binary or None
+
+
+def format_for_content_type(content_type: Optional[str]) -> str:
+    mime = (content_type or "").split(";", 1)[0].strip().lower()
+    if mime in _MIME_ALIASES:
+        return _MIME_ALIASES[mime]
+    for fmt, known in _MIME.items():
+        if mime == known:
+            return fmt
+    return FORMAT_JSON
+
+
+def decode(data, fmt: str = FORMAT_JSON):
+    codec = CODECS.get(fmt)
+    if codec is None:
+        raise ValueError(f"Wire format '{fmt}' is not available")
+    return codec[1](data)
+
+
+def decode_response(resp):
+    """Decode a requests.Response according to its Content-Type (JSON otherwise)."""
+    fmt = format_for_content_type(resp.headers.get("Content-Type"))
+    if fmt == FORMAT_JSON or fmt not in CODECS:
+        return resp.json()
+    return decode(resp.content, fmt)
+
+
+def decode_message(message, subprotocol: Optional[str] = None):
+    """
+    Decode a websocket frame. Text frames are always JSON; binary frames use the
+    negotiated subprotocol, falling back to JSON if none was agreed.
+    """
+    if isinstance(message, str):
+        return json.loads(message)
+    fmt = subprotocol if subprotocol in CODECS else FORMAT_JSON
+    return decode(message, fmt)
+
+
+def benchmark(payload: Any, rounds: int = 1000) -> Dict[str, Dict[str, float]]:
+    """Encoded size and mean decode time per available format, for a sample payload."""
+    results = {}
+    for fmt, (encode, decoder) in CODECS.items():
+        blob = encode(payload)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            decoder(blob)
+        elapsed = time.perf_counter() - start
+        results[fmt] = {"bytes": len(blob), "decode_us": elapsed * 1e6 / max(1, rounds)}
+    return results